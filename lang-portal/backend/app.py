@@ -7,6 +7,12 @@ from routes.study_sessions import router as study_sessions_router
 from routes.dashboard import router as dashboard_router
 from routes.reset import router as reset_router
 from routes.settings import router as settings_router
+from routes.word_groups import router as word_groups_router
+from routes.health import router as health_router
+from routes.export import router as export_router
+from routes.debug import router as debug_router
+from lib.profiling import SQLProfilingMiddleware
+from lib.tenancy import TenancyMiddleware
 
 app = FastAPI(
     title="Language Portal API",
@@ -23,10 +29,20 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Server-Timing headers and /api/_debug/metrics when ENABLE_SQL_PROFILING is set
+app.add_middleware(SQLProfilingMiddleware)
+
+# Per-learner databases for requests carrying X-Learner-Id when ENABLE_TENANCY is set
+app.add_middleware(TenancyMiddleware)
+
 app.include_router(words_router, prefix="/api")
 app.include_router(groups_router, prefix="/api")
 app.include_router(study_activities_router, prefix="/api")
 app.include_router(study_sessions_router, prefix="/api")
 app.include_router(dashboard_router, prefix="/api")
 app.include_router(reset_router, prefix="/api")
-app.include_router(settings_router, prefix="/api") 
\ No newline at end of file
+app.include_router(settings_router, prefix="/api")
+app.include_router(word_groups_router, prefix="/api")
+app.include_router(health_router, prefix="/api")
+app.include_router(export_router, prefix="/api")
+app.include_router(debug_router, prefix="/api") 
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Compare a synchronous route (blocking an AnyIO worker per request) with the
+async route from routes/words.py, both serving the same words page.
+
+    python benchmarks/async_db.py [--clients 200] [--requests 4000]
+
+Requests go through httpx's in-process ASGI transport, so the numbers
+measure the application and database layer rather than the network.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lib.db import get_db_connection
+from routes.words import router as words_router
+from utils import fetch_page
+
+WORDS_QUERY = """
+SELECT w.id, w.jamaican_patois, w.english, w.parts,
+       COALESCE(ws.correct_count, 0) AS correct_count,
+       COALESCE(ws.wrong_count, 0) AS wrong_count
+FROM words w
+LEFT JOIN word_stats ws ON ws.word_id = w.id
+WHERE {keyset}
+"""
+
+def build_app():
+    app = FastAPI()
+    app.include_router(words_router, prefix="/api")
+
+    @app.get("/sync/words")
+    def get_words_sync(page: int = 1, page_size: int = 10):
+        # The pre-async handler shape: a plain def run on the AnyIO threadpool
+        with get_db_connection() as conn:
+            rows, next_cursor = fetch_page(
+                conn, WORDS_QUERY, (), ("w.id",), lambda row: (row[0],), page, page_size
+            )
+            total_items = conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+        return {"items": [list(row) for row in rows], "total_items": total_items,
+                "next_cursor": next_cursor}
+
+    return app
+
+async def run(client, path, clients, total):
+    latencies = []
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return total / elapsed, p99 * 1000
+
+async def main(clients, total):
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, path in (("sync def", "/sync/words"), ("async def", "/api/words")):
+            await run(client, path, clients, min(total, clients))  # warm up
+            rps, p99 = await run(client, path, clients, total)
+            print(f"{label:<10} {rps:9.1f} req/s   p99 {p99:8.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    args = parser.parse_args()
+    if not os.path.exists("words.db"):
+        sys.exit("words.db not found; run `python init_db.py` first")
+    print(f"{args.clients} concurrent clients, {args.requests} requests each run")
+    asyncio.run(main(args.clients, args.requests))
@@ -0,0 +1,220 @@
+"""
+Build a synthetic lang-portal database at a chosen scale.
+
+    python benchmarks/generate_data.py bench.db [--scale medium] [--reviews 1000000] [--seed 42]
+
+The schema comes from sql/setup plus the migrations, and rows go through
+the normal triggers, so word_stats, daily_activity, word_schedule and
+words_fts are as the API would have built them. The data is skewed the way
+real usage is:
+
+- A few popular groups hold most words and get most sessions.
+- Within a session, a few words get most reviews.
+- Sessions cluster in recent days and in the evening.
+- Each word has its own difficulty, and answers improve as it is reviewed.
+
+The same seed always produces the same database.
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+import string
+import sys
+import time
+from datetime import datetime, timedelta
+from glob import glob
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(BACKEND_DIR)
+
+from lib.db import get_db_connection, remove_database
+from migrate import apply_migrations
+
+# words, groups, sessions, reviews
+SCALES = {
+    "small": (2000, 20, 2000, 50000),
+    "medium": (20000, 200, 20000, 1000000),
+    "large": (100000, 1000, 100000, 10000000),
+}
+
+ACTIVITIES = [
+    "Vocabulary Review", "Pronunciation Practice", "Grammar Exercise",
+    "Listening Comprehension", "Typing Tutor",
+]
+PARTS = ["noun", "verb", "adjective", "adverb", "phrase", "pronoun"]
+
+# Rows per executemany call while streaming sessions and reviews
+BATCH_SIZE = 10000
+
+def zipf_cum_weights(count, exponent=1.1):
+    """Cumulative weights for rng.choices: rank ``i`` is drawn with weight 1 / (i + 1) ** exponent."""
+    return list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+def random_word(rng):
+    syllables = ("ba", "da", "di", "fi", "ga", "ja", "ka", "mi", "nyam", "pi", "ri", "su", "ta", "wa", "yu")
+    return "".join(rng.choice(syllables) for _ in range(rng.randint(1, 4)))
+
+def create_schema(db_name):
+    with get_db_connection(db_name) as conn:
+        for path in sorted(glob(os.path.join(BACKEND_DIR, "sql/setup/*.sql"))):
+            with open(path, "r") as sql_file:
+                conn.executescript(sql_file.read())
+    with contextlib.redirect_stdout(io.StringIO()):
+        apply_migrations(db_name)
+
+def insert_words_and_groups(conn, rng, word_count, group_count):
+    """Returns each group's word ids, most popular group first."""
+    conn.execute("""
+        INSERT OR IGNORE INTO user_settings (
+            id, words_per_session, review_interval,
+            show_phonetics, show_usage_examples, dark_mode
+        ) VALUES (1, 10, 24, 1, 1, 1)
+    """)
+    conn.executemany(
+        "INSERT INTO words (id, jamaican_patois, english, parts) VALUES (?, ?, ?, ?)",
+        (
+            (word_id, random_word(rng),
+             " ".join(rng.choice(string.ascii_lowercase) * rng.randint(2, 5) for _ in range(rng.randint(1, 3))),
+             json.dumps({"type": rng.choice(PARTS)}))
+            for word_id in range(1, word_count + 1)
+        )
+    )
+    conn.executemany(
+        "INSERT INTO groups (id, name) VALUES (?, ?)",
+        ((group_id, f"Group {group_id}") for group_id in range(1, group_count + 1))
+    )
+
+    # Every group gets one word, then group sizes follow a Zipf distribution;
+    # one word in five also joins a second group
+    group_cum = zipf_cum_weights(group_count)
+    members = [[] for _ in range(group_count)]
+    for word_id in range(1, word_count + 1):
+        if word_id <= group_count:
+            groups = {word_id - 1}
+        else:
+            groups = set(rng.choices(range(group_count), cum_weights=group_cum, k=2 if rng.random() < 0.2 else 1))
+        for group in groups:
+            members[group].append(word_id)
+    conn.executemany(
+        "INSERT INTO word_groups (word_id, group_id) VALUES (?, ?)",
+        ((word_id, group + 1) for group, word_ids in enumerate(members) for word_id in word_ids)
+    )
+    return members
+
+def session_times(rng, count, days, now):
+    """Session start times, weighted towards recent days and evenings, oldest first."""
+    times = []
+    for _ in range(count):
+        day = now.date() - timedelta(days=int(days * rng.random() ** 2))
+        hour = min(23, int(rng.triangular(6, 24, 20)))
+        started = datetime(day.year, day.month, day.day, hour, rng.randrange(60), rng.randrange(60))
+        times.append(min(started, now))
+    times.sort()
+    return times
+
+def insert_history(conn, rng, members, session_count, review_count, days, now):
+    """Insert sessions (one activity each) and their reviews in time order."""
+    group_cum = zipf_cum_weights(len(members))
+    member_cum = {}
+    difficulty = {}
+    seen = {}
+
+    # Session lengths are exponential around the mean, rescaled to the total
+    lengths = [rng.expovariate(1.0) for _ in range(session_count)]
+    scale = review_count / sum(lengths)
+
+    sessions, activities, reviews, items = [], [], [], []
+    inserted = 0
+
+    def flush():
+        conn.executemany(
+            "INSERT INTO study_activities (id, name, study_session_id, group_id, created_at) VALUES (?, ?, ?, ?, ?)",
+            activities
+        )
+        conn.executemany(
+            "INSERT INTO study_sessions (id, group_id, created_at, study_activity_id) VALUES (?, ?, ?, ?)",
+            sessions
+        )
+        conn.executemany(
+            "INSERT INTO word_review_items (word_id, study_session_id, created_at) VALUES (?, ?, ?)",
+            items
+        )
+        conn.executemany(
+            "INSERT INTO word_reviews (word_id, study_session_id, correct, created_at) VALUES (?, ?, ?, ?)",
+            reviews
+        )
+        for rows in (sessions, activities, reviews, items):
+            rows.clear()
+
+    for session_id, started in enumerate(session_times(rng, session_count, days, now), start=1):
+        group = rng.choices(range(len(members)), cum_weights=group_cum)[0]
+        word_ids = members[group]
+        if group not in member_cum:
+            member_cum[group] = zipf_cum_weights(len(word_ids))
+        created_at = started.isoformat()
+        activities.append((session_id, rng.choice(ACTIVITIES), session_id, group + 1, created_at))
+        sessions.append((session_id, group + 1, created_at, session_id))
+
+        answered = started
+        reviewed = set()
+        length = min(round(lengths[session_id - 1] * scale), review_count - inserted)
+        for word_id in rng.choices(word_ids, cum_weights=member_cum[group], k=length):
+            answered += timedelta(seconds=rng.randint(3, 15))
+            if word_id not in difficulty:
+                difficulty[word_id] = rng.betavariate(2, 5)
+            # Wrong answers get rarer as a word is practised
+            prior = seen.get(word_id, 0)
+            seen[word_id] = prior + 1
+            correct = rng.random() >= difficulty[word_id] * 0.9 ** (prior / 5)
+            reviews.append((word_id, session_id, correct, answered.isoformat()))
+            if word_id not in reviewed:
+                reviewed.add(word_id)
+                items.append((word_id, session_id, created_at))
+        inserted += length
+
+        if len(reviews) >= BATCH_SIZE or len(sessions) >= BATCH_SIZE:
+            flush()
+    flush()
+    return inserted
+
+def generate(db_name, words, groups, sessions, reviews, days=365, seed=42, now=None):
+    """Create ``db_name`` from scratch; returns the row count of each table."""
+    rng = random.Random(seed)
+    now = now or datetime.now().replace(microsecond=0)
+    remove_database(db_name)
+    create_schema(db_name)
+    with get_db_connection(db_name) as conn:
+        members = insert_words_and_groups(conn, rng, words, groups)
+        insert_history(conn, rng, members, sessions, reviews, days, now)
+    with get_db_connection(db_name) as conn:
+        tables = ("words", "groups", "word_groups", "study_sessions", "study_activities",
+                  "word_review_items", "word_reviews")
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("db_name")
+    parser.add_argument("--scale", choices=SCALES, default="medium")
+    parser.add_argument("--words", type=int)
+    parser.add_argument("--groups", type=int)
+    parser.add_argument("--sessions", type=int)
+    parser.add_argument("--reviews", type=int)
+    parser.add_argument("--days", type=int, default=365, help="days of history to spread sessions over")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    words, groups, sessions, reviews = (
+        override if override is not None else default
+        for override, default in zip((args.words, args.groups, args.sessions, args.reviews), SCALES[args.scale])
+    )
+    if min(words, groups, sessions) < 1 or reviews < 0 or groups > words:
+        sys.exit("words, groups and sessions must be positive, with no more groups than words")
+    started = time.perf_counter()
+    counts = generate(args.db_name, words, groups, sessions, reviews, args.days, args.seed)
+    print(f"built {args.db_name} in {time.perf_counter() - started:.1f}s")
+    for table, count in counts.items():
+        print(f"  {table:<18} {count:>10}")
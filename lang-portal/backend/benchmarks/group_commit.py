@@ -0,0 +1,90 @@
+"""
+Compare review writes committed one transaction per request with the
+group-commit writer (lib/writer.py).
+
+    python benchmarks/group_commit.py [--clients 64] [--requests 4000] [--synchronous FULL]
+
+Each run posts ``--requests`` reviews to
+POST /api/study_sessions/{id}/words/{word_id}/review with ``--clients`` in
+flight at once, against a fresh clone of the seeded template. Requests go
+through httpx's in-process ASGI transport. ``--synchronous FULL`` syncs the
+WAL on every commit, which is where committing in groups pays off most.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Must be set before lib.db is imported
+BENCH_DB = os.path.join(tempfile.gettempdir(), f"group-commit-bench-{os.getpid()}.db")
+os.environ["SQLITE_DB_PATH"] = BENCH_DB
+
+import httpx
+
+from app import app
+from lib import writer
+from lib.db import close_pool, get_db_connection, remove_database, set_pool_defaults
+from template_db import clone_database
+
+async def run(client, targets, clients, total):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+    rng = random.Random(0)
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            session_id, word_id = rng.choice(targets)
+            started = time.perf_counter()
+            response = await client.post(f"/api/study_sessions/{session_id}/words/{word_id}/review",
+                                         json={"correct": rng.random() < 0.8})
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return total / elapsed, p99 * 1000, errors
+
+async def main(clients, total, synchronous):
+    set_pool_defaults(BENCH_DB, setup=lambda conn: conn.execute(f"PRAGMA synchronous={synchronous}"))
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, enabled in (("per request", False), ("group commit", True)):
+                close_pool(BENCH_DB)
+                clone_database(BENCH_DB)
+                with get_db_connection() as conn:
+                    sessions = [row[0] for row in conn.execute("SELECT id FROM study_sessions")]
+                    words = [row[0] for row in conn.execute("SELECT id FROM words")]
+                targets = [(session_id, word_id) for session_id in sessions for word_id in words]
+
+                writer.ENABLE_GROUP_COMMIT = enabled
+                await run(client, targets, clients, min(total, clients))  # warm up
+                rps, p99, errors = await run(client, targets, clients, total)
+                line = f"{label:<13} {rps:9.1f} req/s   p99 {p99:8.1f} ms   errors {errors}"
+                if enabled:
+                    stats = writer.get_writer(BENCH_DB).stats()
+                    line += (f"   avg batch {stats['avg_batch_size']}   max batch {stats['max_batch_size']}"
+                             f"   max queue {stats['max_queue_depth']}")
+                print(line)
+                writer.close_writers()
+    finally:
+        remove_database(BENCH_DB)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--synchronous", default="NORMAL", choices=["OFF", "NORMAL", "FULL"],
+                        help="durability of each commit")
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.requests, args.synchronous))
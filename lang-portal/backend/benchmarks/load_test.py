@@ -0,0 +1,284 @@
+"""
+Drive every API router at a fixed concurrency and report per-endpoint latency.
+
+    python benchmarks/load_test.py bench.db [--clients 50] [--requests 500]
+        [--output results.json] [--compare baseline.json] [--threshold 0.2]
+
+Each endpoint is hammered in turn by ``--clients`` concurrent clients until
+``--requests`` responses have come back, with path ids and search terms
+sampled from the database. Results are throughput and p50/p95/p99 latency
+per endpoint. ``--output`` writes them as JSON. ``--compare`` checks them
+against an earlier run and exits non-zero when an endpoint has more errors,
+or its p95 or throughput is more than ``--threshold`` worse.
+
+By default requests go in-process through httpx's ASGI transport. ``--url``
+targets a running server instead, which must be serving the same database.
+Write endpoints add rows to the database, and ``--read-only`` skips them.
+The reset endpoints are never called.
+
+Build a database with benchmarks/generate_data.py first.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(BACKEND_DIR)
+
+# Ids drawn per table for path parameters
+SAMPLE_SIZE = 1000
+
+def sample_fixtures(db_name, rng):
+    """Ids, search terms and review days to build request paths from."""
+    conn = sqlite3.connect(db_name)
+    try:
+        def ids(table):
+            return [row[0] for row in conn.execute(
+                f"SELECT id FROM {table} ORDER BY random() LIMIT {SAMPLE_SIZE}"
+            )]
+
+        fixtures = {
+            "words": ids("words"),
+            "groups": ids("groups"),
+            "sessions": ids("study_sessions"),
+            "activities": ids("study_activities"),
+            "days": [row[0] for row in conn.execute(
+                f"SELECT day FROM daily_activity ORDER BY random() LIMIT {SAMPLE_SIZE}"
+            )],
+            "word_groups": conn.execute(
+                f"SELECT word_id, group_id FROM word_groups ORDER BY random() LIMIT {SAMPLE_SIZE}"
+            ).fetchall(),
+        }
+        terms = []
+        for (text,) in conn.execute(
+            f"SELECT jamaican_patois FROM words ORDER BY random() LIMIT {SAMPLE_SIZE}"
+        ):
+            start = rng.randint(0, max(0, len(text) - 4))
+            terms.append(text[start:start + 4])
+        fixtures["terms"] = terms
+    finally:
+        conn.close()
+    missing = [name for name, values in fixtures.items() if not values]
+    if missing:
+        sys.exit(f"{db_name} has no rows for: {', '.join(missing)}")
+    return fixtures
+
+# (name, method, build(rng, fixtures) -> (path, params, json body), writes)
+ENDPOINTS = [
+    ("GET /api/words", "GET", lambda r, f: ("/api/words", {"page": r.randint(1, 50)}, None), False),
+    ("GET /api/words/search", "GET", lambda r, f: ("/api/words/search", {"q": r.choice(f["terms"])}, None), False),
+    ("GET /api/words/{id}", "GET", lambda r, f: (f"/api/words/{r.choice(f['words'])}", None, None), False),
+    ("GET /api/words/{id}/groups", "GET", lambda r, f: (f"/api/words/{r.choice(f['words'])}/groups", None, None), False),
+    ("GET /api/groups", "GET", lambda r, f: ("/api/groups", {"page": r.randint(1, 5)}, None), False),
+    ("GET /api/groups/{id}", "GET", lambda r, f: (f"/api/groups/{r.choice(f['groups'])}", None, None), False),
+    ("GET /api/groups/{id}/words", "GET", lambda r, f: (f"/api/groups/{r.choice(f['groups'])}/words", None, None), False),
+    ("GET /api/groups/{id}/study_sessions", "GET",
+     lambda r, f: (f"/api/groups/{r.choice(f['groups'])}/study_sessions", None, None), False),
+    ("GET /api/study_activities", "GET", lambda r, f: ("/api/study_activities", {"page": r.randint(1, 50)}, None), False),
+    ("GET /api/study_activities/{id}", "GET",
+     lambda r, f: (f"/api/study_activities/{r.choice(f['activities'])}", None, None), False),
+    ("GET /api/study_activities/{id}/study_sessions", "GET",
+     lambda r, f: (f"/api/study_activities/{r.choice(f['activities'])}/study_sessions", None, None), False),
+    ("GET /api/study_activities/{id}/words", "GET",
+     lambda r, f: (f"/api/study_activities/{r.choice(f['activities'])}/words", None, None), False),
+    ("GET /api/study_sessions", "GET", lambda r, f: ("/api/study_sessions", {"page": r.randint(1, 50)}, None), False),
+    ("GET /api/study_sessions/{id}", "GET", lambda r, f: (f"/api/study_sessions/{r.choice(f['sessions'])}", None, None), False),
+    ("GET /api/study_sessions/{id}/words", "GET",
+     lambda r, f: (f"/api/study_sessions/{r.choice(f['sessions'])}/words", None, None), False),
+    ("GET /api/study_sessions/{id}/next_words", "GET",
+     lambda r, f: (f"/api/study_sessions/{r.choice(f['sessions'])}/next_words", None, None), False),
+    ("GET /api/dashboard/last_study_session", "GET", lambda r, f: ("/api/dashboard/last_study_session", None, None), False),
+    ("GET /api/dashboard/study_progress", "GET", lambda r, f: ("/api/dashboard/study_progress", None, None), False),
+    ("GET /api/dashboard/quick-stats", "GET", lambda r, f: ("/api/dashboard/quick-stats", None, None), False),
+    ("GET /api/dashboard/daily_activity", "GET", lambda r, f: ("/api/dashboard/daily_activity", None, None), False),
+    ("GET /api/settings", "GET", lambda r, f: ("/api/settings", None, None), False),
+    ("GET /api/health", "GET", lambda r, f: ("/api/health", None, None), False),
+    ("GET /api/export/reviews", "GET", lambda r, f: _one_day("/api/export/reviews", r, f), False),
+    ("GET /api/export/study_sessions", "GET", lambda r, f: _one_day("/api/export/study_sessions", r, f), False),
+    ("POST /api/study_activities", "POST",
+     lambda r, f: ("/api/study_activities", None, {"name": "Load Test", "group_id": r.choice(f["groups"])}), True),
+    ("POST /api/study_sessions/{id}/words/{word_id}/review", "POST",
+     lambda r, f: (f"/api/study_sessions/{r.choice(f['sessions'])}/words/{r.choice(f['words'])}/review",
+                   None, {"correct": r.random() < 0.8}), True),
+    ("POST /api/study_sessions/{id}/reviews", "POST",
+     lambda r, f: (f"/api/study_sessions/{r.choice(f['sessions'])}/reviews", None,
+                   [{"word_id": r.choice(f["words"]), "correct": r.random() < 0.8} for _ in range(10)]), True),
+    ("POST /api/words/sync", "POST",
+     lambda r, f: ("/api/words/sync", None,
+                   {"words": [{"jamaican_patois": f"load-{uuid.uuid4().hex[:12]}", "english": "load test"}
+                              for _ in range(10)]}), True),
+    ("POST /api/word-groups/sync", "POST",
+     lambda r, f: ("/api/word-groups/sync", None,
+                   {"word_groups": [{"word_id": w, "group_id": g} for w, g in r.sample(f["word_groups"], 1)]}), True),
+]
+
+def _one_day(path, rng, fixtures):
+    day = rng.choice(fixtures["days"])
+    return path, {"start": day, "end": day}, None
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+async def drive(client, method, build, fixtures, clients, total, seed):
+    rng = random.Random(seed)
+    requests = [build(rng, fixtures) for _ in range(total)]
+    pending = iter(requests)
+    latencies = []
+    statuses = {}
+    failures = 0
+
+    async def worker():
+        nonlocal failures
+        for path, params, body in pending:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+            except httpx.HTTPError:
+                failures += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = [value * 1000 for value in latencies] or [0.0]
+    return {
+        "requests": total,
+        "errors": failures + sum(count for status, count in statuses.items() if status >= 500),
+        "non_2xx": sum(count for status, count in statuses.items() if not 200 <= status < 300),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "throughput": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(ms, 0.50), 3),
+        "p95_ms": round(percentile(ms, 0.95), 3),
+        "p99_ms": round(percentile(ms, 0.99), 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+def table_counts(db_name):
+    conn = sqlite3.connect(db_name)
+    try:
+        tables = ("words", "groups", "word_groups", "study_sessions", "word_reviews")
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+    finally:
+        conn.close()
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def run(args):
+    rng = random.Random(args.seed)
+    fixtures = sample_fixtures(args.db_name, rng)
+    endpoints = [
+        endpoint for endpoint in ENDPOINTS
+        if not (args.read_only and endpoint[3]) and (not args.only or any(part in endpoint[0] for part in args.only))
+    ]
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60,
+                                   limits=httpx.Limits(max_connections=args.clients))
+    else:
+        from app import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://bench", timeout=60)
+
+    results = {}
+    async with client:
+        for index, (name, method, build, _) in enumerate(endpoints):
+            if args.warmup:
+                await drive(client, method, build, fixtures, args.clients, args.warmup, args.seed + index)
+            result = await drive(client, method, build, fixtures, args.clients, args.requests, args.seed + index)
+            results[name] = result
+            print(f"{name:<55} {result['throughput']:9.1f} req/s  p50 {result['p50_ms']:8.2f}  "
+                  f"p95 {result['p95_ms']:8.2f}  p99 {result['p99_ms']:8.2f} ms"
+                  + (f"  {result['errors']} errors" if result["errors"] else ""))
+    return results
+
+def compare(results, baseline, threshold):
+    """Endpoints with more errors, or whose p95 or throughput regressed by more than ``threshold``."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            continue
+        # Fast failures flatter latency, so more errors is a regression on its own
+        if result["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {result['errors']}")
+        if result["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms")
+        if result["throughput"] < before["throughput"] * (1 - threshold):
+            regressions.append(f"{name}: {before['throughput']:.1f} -> {result['throughput']:.1f} req/s")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("db_name")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per endpoint")
+    parser.add_argument("--url", help="base URL of a running server; in-process when omitted")
+    parser.add_argument("--read-only", action="store_true", help="skip the write endpoints")
+    parser.add_argument("--only", action="append", help="only endpoints whose name contains this (repeatable)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to check against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db_name):
+        sys.exit(f"{args.db_name} not found; build one with benchmarks/generate_data.py")
+    # Must be set before the app (and lib.db) is imported
+    os.environ["SQLITE_DB_PATH"] = os.path.abspath(args.db_name)
+
+    counts = table_counts(args.db_name)
+    print(f"{args.clients} concurrent clients, {args.requests} requests per endpoint, "
+          + ", ".join(f"{count} {table}" for table, count in counts.items()))
+    results = asyncio.run(run(args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "target": args.url or "in-process",
+            "clients": args.clients,
+            "requests": args.requests,
+            "counts": counts,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+        },
+        "endpoints": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+        print(f"results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%} against {args.compare}")
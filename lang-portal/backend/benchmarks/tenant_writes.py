@@ -0,0 +1,98 @@
+"""
+Compare review-write throughput with every learner in one database against
+one shard per learner (lib/tenancy.py), for a growing number of learners.
+
+    python benchmarks/tenant_writes.py [--learners 1,2,4,8] [--writes 500] [--synchronous NORMAL]
+
+Each learner is a thread recording reviews as fast as it can, one
+transaction per review, like POST /api/study_sessions/{id}/words/{word_id}/review.
+In the single-database run all of them queue for the one write lock; with
+shards each learner only takes its own.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lib.db import close_pools, get_db_connection
+from lib.tenancy import ShardRouter
+from template_db import clone_database
+
+REVIEW_SQL = (
+    "INSERT INTO word_review_items (study_session_id, word_id) SELECT ?1, ?2 WHERE NOT EXISTS "
+    "(SELECT 1 FROM word_review_items WHERE study_session_id = ?1 AND word_id = ?2)",
+    "INSERT INTO word_reviews (word_id, study_session_id, correct, created_at) VALUES (?, ?, ?, ?)",
+)
+
+def start_session(db_name):
+    with get_db_connection(db_name) as conn:
+        group_id, = conn.execute("SELECT id FROM groups ORDER BY id LIMIT 1").fetchone()
+        word_ids = [row[0] for row in conn.execute("SELECT id FROM words")]
+        now = datetime.now().isoformat()
+        activity_id = conn.execute(
+            "INSERT INTO study_activities (name, group_id, created_at) VALUES ('Benchmark', ?, ?)",
+            (group_id, now)
+        ).lastrowid
+        session_id = conn.execute(
+            "INSERT INTO study_sessions (group_id, study_activity_id, created_at) VALUES (?, ?, ?)",
+            (group_id, activity_id, now)
+        ).lastrowid
+    return session_id, word_ids
+
+def record_reviews(db_name, session_id, word_ids, writes, synchronous, seed):
+    rng = random.Random(seed)
+    for _ in range(writes):
+        word_id = rng.choice(word_ids)
+        with get_db_connection(db_name) as conn:
+            conn.execute(f"PRAGMA synchronous={synchronous}")
+            conn.execute(REVIEW_SQL[0], (session_id, word_id))
+            conn.execute(REVIEW_SQL[1], (word_id, session_id, rng.random() < 0.8, datetime.now().isoformat()))
+
+def run(databases, writes, synchronous):
+    """Reviews per second with one writer thread per entry of ``databases``."""
+    sessions = [start_session(db_name) for db_name in databases]
+    threads = [
+        threading.Thread(target=record_reviews, args=(db_name, session_id, word_ids, writes, synchronous, index))
+        for index, (db_name, (session_id, word_ids)) in enumerate(zip(databases, sessions))
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(databases) * writes / (time.perf_counter() - started)
+
+def main(learner_counts, writes, synchronous):
+    directory = tempfile.mkdtemp(prefix="tenant-writes-")
+    try:
+        shared = os.path.join(directory, "shared.db")
+        clone_database(shared)
+        print(f"{'learners':>8}  {'one database':>16}  {'per-learner shards':>20}")
+        for learners in learner_counts:
+            single = os.path.join(directory, f"single-{learners}.db")
+            clone_database(single)
+            together = run([single] * learners, writes, synchronous)
+
+            router = ShardRouter(os.path.join(directory, f"shards-{learners}"), shared, max_open=learners)
+            sharded = run([router.db_name(f"learner-{n}") for n in range(learners)], writes, synchronous)
+            router.close()
+            print(f"{learners:>8}  {together:>10,.0f} rev/s  {sharded:>14,.0f} rev/s")
+    finally:
+        close_pools()
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--learners", default="1,2,4,8", help="comma-separated learner counts")
+    parser.add_argument("--writes", type=int, default=500, help="reviews per learner")
+    parser.add_argument("--synchronous", default="NORMAL", choices=["OFF", "NORMAL", "FULL"],
+                        help="durability of each commit; FULL syncs the WAL every transaction")
+    args = parser.parse_args()
+    main([int(n) for n in args.learners.split(",")], args.writes, args.synchronous)
@@ -0,0 +1,143 @@
+"""
+Time /api/words/search lookups against a generated vocabulary.
+
+    python benchmarks/word_search.py [--words 500000] [--lookups 2000]
+
+Builds a throwaway database from sql/setup plus the migrations, fills it
+with random words, then runs the endpoint's search query (first page,
+ranked and highlighted) for terms sampled from the table.
+
+    python benchmarks/word_search.py --broad 100000
+
+also adds that many words sharing one term and times its first and a
+deep page, plus the capped count. Only the first SEARCH_MAX_CANDIDATES
+matches are ranked, so this is the cost of a term that matches a large
+part of the vocabulary.
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+from glob import glob
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(BACKEND_DIR)
+
+from lib.db import get_db_connection, remove_database
+from migrate import apply_migrations
+from routes.words import SEARCH_MAX_CANDIDATES, _fts_query, _like_prefix
+from utils import build_page_query
+
+SEARCH_QUERY = """
+SELECT id, jamaican_patois, english, prefix_rank, score, patois_highlight, english_highlight
+FROM (
+    SELECT w.id, w.jamaican_patois, w.english,
+           CASE WHEN w.jamaican_patois LIKE ? ESCAPE '\\'
+                  OR w.english LIKE ? ESCAPE '\\' THEN 0 ELSE 1 END AS prefix_rank,
+           f.score, f.patois_highlight, f.english_highlight
+    FROM (
+        SELECT rowid,
+               bm25(words_fts, 2.0, 1.0) AS score,
+               highlight(words_fts, 0, '<mark>', '</mark>') AS patois_highlight,
+               highlight(words_fts, 1, '<mark>', '</mark>') AS english_highlight
+        FROM words_fts
+        WHERE words_fts MATCH ?
+        LIMIT ?
+    ) f
+    JOIN words w ON w.id = f.rowid
+)
+WHERE {keyset}
+"""
+
+def random_word(rng):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+
+def build_database(db_name, count, rng):
+    with get_db_connection(db_name) as conn:
+        for path in sorted(glob(os.path.join(BACKEND_DIR, "sql/setup/*.sql"))):
+            with open(path, "r") as sql_file:
+                conn.executescript(sql_file.read())
+    with contextlib.redirect_stdout(io.StringIO()):
+        apply_migrations(db_name)
+    with get_db_connection(db_name) as conn:
+        conn.executemany(
+            "INSERT INTO words (jamaican_patois, english) VALUES (?, ?)",
+            ((random_word(rng), f"{random_word(rng)} {random_word(rng)}") for _ in range(count))
+        )
+
+def time_broad_term(db_name, broad, rng, runs=5):
+    """Add ``broad`` words sharing one term, then time its first page and page 100."""
+    term = "qzx"
+    with get_db_connection(db_name) as conn:
+        conn.executemany(
+            "INSERT INTO words (jamaican_patois, english) VALUES (?, ?)",
+            ((random_word(rng), f"{random_word(rng)}{term} {random_word(rng)}") for _ in range(broad))
+        )
+    prefix = _like_prefix(term)
+    params = (prefix, prefix, _fts_query(term, False), SEARCH_MAX_CANDIDATES)
+    with get_db_connection(db_name) as conn:
+        for page in (1, 100):
+            sql, page_params = build_page_query(SEARCH_QUERY, ("prefix_rank", "score", "id"),
+                                                page=page, page_size=10)
+            started = time.perf_counter()
+            for _ in range(runs):
+                conn.execute(sql, (*params, *page_params)).fetchall()
+            elapsed = (time.perf_counter() - started) / runs * 1000
+            print(f"term matching {broad} words, page {page}: {elapsed:.1f} ms")
+        started = time.perf_counter()
+        for _ in range(runs):
+            conn.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM words_fts WHERE words_fts MATCH ? LIMIT ?)",
+                params[2:]
+            ).fetchone()
+        elapsed = (time.perf_counter() - started) / runs * 1000
+        print(f"term matching {broad} words, count: {elapsed:.1f} ms")
+
+def main(count, lookups, fuzzy, broad):
+    rng = random.Random(42)
+    db_name = os.path.join(tempfile.mkdtemp(), "search.db")
+    started = time.perf_counter()
+    build_database(db_name, count, rng)
+    print(f"built {count} words in {time.perf_counter() - started:.1f}s")
+    if broad:
+        time_broad_term(db_name, broad, rng)
+
+    sql, page_params = build_page_query(SEARCH_QUERY, ("prefix_rank", "score", "id"), page_size=10)
+    with get_db_connection(db_name) as conn:
+        max_id = conn.execute("SELECT MAX(id) FROM words").fetchone()[0]
+        terms = []
+        while len(terms) < lookups:
+            row = conn.execute(
+                "SELECT jamaican_patois FROM words WHERE id = ?", (rng.randint(1, max_id),)
+            ).fetchone()
+            start = rng.randint(0, max(0, len(row[0]) - 5))
+            terms.append(row[0][start:start + 5])
+
+        timings = []
+        for term in terms:
+            prefix = _like_prefix(term)
+            started = time.perf_counter()
+            conn.execute(sql, (prefix, prefix, _fts_query(term, fuzzy), SEARCH_MAX_CANDIDATES,
+                                *page_params)).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+    remove_database(db_name)
+
+    timings.sort()
+    print(f"{lookups} lookups ({'fuzzy' if fuzzy else 'substring'}): "
+          f"median {statistics.median(timings):.3f} ms, "
+          f"p99 {timings[int(len(timings) * 0.99)]:.3f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=500000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--fuzzy", action="store_true")
+    parser.add_argument("--broad", type=int, default=0, help="also time a term matching this many words")
+    args = parser.parse_args()
+    main(args.words, args.lookups, args.fuzzy, args.broad)
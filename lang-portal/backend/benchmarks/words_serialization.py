@@ -0,0 +1,95 @@
+"""
+Compare the pre-built JSON path of /api/words with the previous
+model-validated path on 100-row pages.
+
+    python benchmarks/words_serialization.py [--requests 2000] [--page-size 100]
+
+The "validated" route reproduces the old handler: a Word model per row,
+model_dump(), then FastAPI re-validating the page against PaginatedWords
+and encoding it. Both share the query and the in-process ASGI transport.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, Query
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lib.db import get_async_db_connection
+from models import PaginatedWords, Word
+from routes.words import router as words_router
+from utils import fetch_page
+
+WORDS_QUERY = """
+SELECT w.id, w.jamaican_patois, w.english, w.parts,
+       COALESCE(ws.correct_count, 0) AS correct_count,
+       COALESCE(ws.wrong_count, 0) AS wrong_count
+FROM words w
+LEFT JOIN word_stats ws ON ws.word_id = w.id
+WHERE {keyset}
+"""
+
+def build_app():
+    app = FastAPI()
+    app.include_router(words_router, prefix="/api")
+
+    @app.get("/validated/words", response_model=PaginatedWords)
+    async def get_words_validated(page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100)):
+        async with get_async_db_connection() as conn:
+            rows, next_cursor = await conn.run(
+                fetch_page, WORDS_QUERY, (), ("w.id",), lambda row: (row[0],), page, page_size
+            )
+            total_items = (await conn.fetchone("SELECT COUNT(*) FROM words"))[0]
+        words = [
+            Word(
+                id=row[0], jamaican_patois=row[1], english=row[2],
+                parts=json.loads(row[3]) if row[3] else None,
+                correct_count=row[4], wrong_count=row[5]
+            ).model_dump() for row in rows
+        ]
+        return {
+            "words": words,
+            "pagination": {
+                "current_page": page,
+                "total_pages": (total_items + page_size - 1) // page_size,
+                "total_items": total_items,
+                "items_per_page": page_size,
+                "next_cursor": next_cursor
+            }
+        }
+
+    return app
+
+async def run(client, path, total):
+    latencies = []
+    for _ in range(total):
+        started = time.perf_counter()
+        response = await client.get(path)
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    latencies.sort()
+    return statistics.mean(latencies), latencies[int(len(latencies) * 0.99)]
+
+async def main(total, page_size):
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, path in (("validated", "/validated/words"), ("pre-built", "/api/words")):
+            url = f"{path}?page_size={page_size}"
+            await run(client, url, 50)  # warm up
+            mean, p99 = await run(client, url, total)
+            print(f"{label:<10} mean {mean:6.3f} ms   p99 {p99:6.3f} ms   ({1000 / mean:7.1f} req/s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+    if not os.path.exists("words.db"):
+        sys.exit("words.db not found; run `python init_db.py` first")
+    asyncio.run(main(args.requests, args.page_size))
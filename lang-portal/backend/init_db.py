@@ -1,6 +1,64 @@
-import os
 import json
-from lib.db import get_db_connection
+import os
+import re
+import time
+from lib.db import get_db_connection, remove_database
+from migrate import apply_migrations
+
+SEED_DIR = "seed"
+
+# Seeded in this order so foreign keys point at rows that already exist
+SEED_TABLES = [
+    "words",
+    "groups",
+    "word_groups",
+    "study_sessions",
+    "study_activities",
+    "word_review_items",
+]
+
+# Rows per executemany call in bulk mode
+SEED_BATCH_SIZE = 5000
+
+# Per-row AFTER INSERT triggers on the seeded tables that bulk mode suspends,
+# each with the set-based statement that catches its table up after the load.
+# Triggers not listed here keep firing.
+BULK_DEFERRED_TRIGGERS = {
+    "words_fts_after_insert": "INSERT INTO words_fts (words_fts) VALUES ('rebuild')",
+    "daily_activity_after_session_insert": """
+        INSERT INTO daily_activity (day, sessions)
+        SELECT date(created_at) AS day, COUNT(*) FROM study_sessions
+        WHERE day IS NOT NULL
+        GROUP BY day
+        ON CONFLICT (day) DO UPDATE SET sessions = excluded.sessions
+    """,
+    "groups_word_count_after_word_group_insert": """
+        UPDATE groups SET word_count = (
+            SELECT COUNT(*) FROM word_groups wg WHERE wg.group_id = groups.id
+        )
+    """,
+    "study_sessions_review_items_count_after_item_insert": """
+        UPDATE study_sessions SET review_items_count = (
+            SELECT COUNT(*) FROM word_review_items wri WHERE wri.study_session_id = study_sessions.id
+        )
+    """,
+    **{
+        f"table_versions_after_{table}_insert":
+            f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}'"
+        for table in SEED_TABLES
+    },
+}
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+DEFAULT_SETTINGS_SQL = """
+    INSERT OR IGNORE INTO user_settings (
+        id, words_per_session, review_interval,
+        show_phonetics, show_usage_examples, dark_mode
+    ) VALUES (
+        1, 10, 24, 1, 1, 1
+    )
+"""
 
 def init_db():
     from glob import glob
@@ -12,28 +70,13 @@ def init_db():
                 conn.executescript(sql_script.read())
     print("Database tables created successfully.")
 
-def seed_data():
-    seed_files = {
-        "words": "seed/words.json",
-        "groups": "seed/groups.json",
-        "word_groups": "seed/word_groups.json",
-        "study_sessions": "seed/study_sessions.json",
-        "study_activities": "seed/study_activities.json",
-        "word_review_items": "seed/word_review_items.json"
-    }
-
-    with get_db_connection() as conn:
+def seed_data(db_name="words.db", seed_dir=SEED_DIR):
+    with get_db_connection(db_name) as conn:
         # First seed the default settings if not exists
-        conn.execute("""
-            INSERT OR IGNORE INTO user_settings (
-                id, words_per_session, review_interval,
-                show_phonetics, show_usage_examples, dark_mode
-            ) VALUES (
-                1, 10, 24, 1, 1, 1
-            )
-        """)
-
-        for table, file_path in seed_files.items():
+        conn.execute(DEFAULT_SETTINGS_SQL)
+
+        for table in SEED_TABLES:
+            file_path = os.path.join(seed_dir, f"{table}.json")
             print(f"Seeding data for {table} from {file_path}...")
             with open(file_path, "r") as json_file:
                 data = json.load(json_file)
@@ -46,9 +89,161 @@ def seed_data():
                     conn.execute(sql, tuple(entry.values()))
     print("Database seeded successfully.")
 
+def iter_json_array(path, chunk_size=1 << 16):
+    """
+    Yield the items of the JSON array in ``path`` one at a time, reading the
+    file in ``chunk_size`` pieces instead of loading it whole.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r") as json_file:
+        buffer = json_file.read(chunk_size)
+        eof = not buffer
+        position = 0
+        expect = "["
+        while True:
+            # Skip whitespace and the separator before the next item
+            while True:
+                position = _WHITESPACE.match(buffer, position).end()
+                if position < len(buffer) or eof:
+                    break
+                buffer, position = json_file.read(chunk_size), 0
+                eof = not buffer
+
+            if position >= len(buffer):
+                raise ValueError(f"{path}: unexpected end of file")
+            char = buffer[position]
+            if char == "]" and expect != "[":
+                return
+            if expect in ("[", ",") and char == expect:
+                position += 1
+                expect = "item"
+                continue
+            if expect == ",":
+                raise ValueError(f"{path}: expected ',' or ']' at offset {position}")
+            if expect == "[":
+                raise ValueError(f"{path}: expected a JSON array")
+
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The item runs past the buffer; keep its start and read more
+                chunk = json_file.read(chunk_size)
+                buffer, position = buffer[position:] + chunk, 0
+                eof = not chunk
+                continue
+            yield item
+            position = end
+            expect = ","
+            if position > chunk_size:
+                buffer, position = buffer[position:], 0
+
+def _seed_rows(conn, table, path, batch_size):
+    """Insert the rows of one seed file, batched per column set. Returns the row count."""
+    pending = {}
+    count = 0
+
+    def flush(columns):
+        rows = pending.pop(columns)
+        placeholders = ", ".join("?" * len(columns))
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+        )
+
+    for entry in iter_json_array(path):
+        columns = tuple(entry)
+        rows = pending.setdefault(columns, [])
+        rows.append(tuple(
+            json.dumps(value) if isinstance(value, (dict, list)) else value
+            for value in entry.values()
+        ))
+        count += 1
+        if len(rows) >= batch_size:
+            flush(columns)
+    for columns in list(pending):
+        flush(columns)
+    return count
+
+def bulk_seed_data(db_name="words.db", seed_dir=SEED_DIR, batch_size=SEED_BATCH_SIZE):
+    """
+    Load the seed files much faster than seed_data, for large fixture sets.
+
+    Files are streamed item by item, and rows sharing a column set go through
+    executemany in batches. Secondary indexes on the seeded tables are dropped
+    for the load and rebuilt once at the end. The per-row triggers in
+    BULK_DEFERRED_TRIGGERS are suspended too, and their tables are caught up
+    with one statement each. The load runs in a single transaction with
+    ``synchronous=OFF`` and ``journal_mode=MEMORY``; both are restored
+    afterwards. A crash mid-load can therefore corrupt the database, so only
+    use this on a database you can rebuild.
+
+    Returns ``{table: rows}``.
+    """
+    with get_db_connection(db_name) as conn:
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        try:
+            indexes = conn.execute(f"""
+                SELECT name, sql FROM sqlite_master
+                WHERE type = 'index' AND sql IS NOT NULL
+                  AND sql NOT LIKE 'CREATE UNIQUE%'
+                  AND tbl_name IN ({', '.join('?' * len(SEED_TABLES))})
+            """, SEED_TABLES).fetchall()
+
+            triggers = conn.execute(f"""
+                SELECT name, sql FROM sqlite_master
+                WHERE type = 'trigger' AND name IN ({', '.join('?' * len(BULK_DEFERRED_TRIGGERS))})
+            """, list(BULK_DEFERRED_TRIGGERS)).fetchall()
+
+            counts = {}
+            started = time.perf_counter()
+            conn.execute("BEGIN")
+            conn.execute(DEFAULT_SETTINGS_SQL)
+            for name, _ in indexes:
+                conn.execute(f'DROP INDEX "{name}"')
+            for name, _ in triggers:
+                conn.execute(f'DROP TRIGGER "{name}"')
+            for table in SEED_TABLES:
+                table_started = time.perf_counter()
+                counts[table] = _seed_rows(conn, table, os.path.join(seed_dir, f"{table}.json"), batch_size)
+                elapsed = time.perf_counter() - table_started
+                print(f"Seeded {counts[table]} {table} rows in {elapsed:.2f}s "
+                      f"({counts[table] / elapsed if elapsed else 0:,.0f} rows/s)")
+            rebuild_started = time.perf_counter()
+            for _, sql in indexes:
+                conn.execute(sql)
+            for name, sql in triggers:
+                conn.execute(sql)
+                conn.execute(BULK_DEFERRED_TRIGGERS[name])
+            conn.commit()
+            print(f"Rebuilt {len(indexes)} indexes and caught up {len(triggers)} triggers "
+                  f"in {time.perf_counter() - rebuild_started:.2f}s")
+
+            total = sum(counts.values())
+            elapsed = time.perf_counter() - started
+            print(f"Seeded {total} rows in {elapsed:.2f}s ({total / elapsed if elapsed else 0:,.0f} rows/s)")
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.execute(f"PRAGMA journal_mode={journal_mode}")
+            conn.execute(f"PRAGMA synchronous={int(synchronous)}")
+    return counts
+
 if __name__ == "__main__":
-    if os.path.exists("words.db"):
-        os.remove("words.db")
+    import argparse
+    parser = argparse.ArgumentParser(description="Create words.db and seed it.")
+    parser.add_argument("--bulk", action="store_true", help="fast bulk load, for large seed sets")
+    parser.add_argument("--seed-dir", default=SEED_DIR, help="directory holding the <table>.json seed files")
+    args = parser.parse_args()
+
+    remove_database("words.db")
     init_db()
-    seed_data()
-    print("Database initialized and seeded successfully.") 
\ No newline at end of file
+    apply_migrations("words.db")
+    if args.bulk:
+        bulk_seed_data("words.db", args.seed_dir)
+    else:
+        seed_data("words.db", args.seed_dir)
+    print("Database initialized and seeded successfully.")
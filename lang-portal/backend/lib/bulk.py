@@ -0,0 +1,260 @@
+import json
+import os
+import zlib
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+# Largest accepted sync body after decompression
+SYNC_MAX_BODY_BYTES = int(os.getenv("SYNC_MAX_BODY_BYTES", str(128 * 1024 * 1024)))
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def _decompress(body):
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = decompressor.decompress(body, SYNC_MAX_BODY_BYTES)
+    except zlib.error:
+        raise HTTPException(status_code=400, detail="Invalid gzip body")
+    if decompressor.unconsumed_tail:
+        raise HTTPException(status_code=413, detail="Decompressed body is too large")
+    return data
+
+
+async def read_sync_items(request, key):
+    """
+    Read the items of a sync request body.
+
+    Accepts ``{"<key>": [...]}`` or a bare JSON array, or NDJSON with one
+    item per line when the Content-Type is ``application/x-ndjson``. Either
+    form may be gzip-compressed (``Content-Encoding: gzip``).
+    """
+    body = await request.body()
+    if "gzip" in request.headers.get("content-encoding", "") or body[:2] == GZIP_MAGIC:
+        body = _decompress(body)
+    elif len(body) > SYNC_MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail="Body is too large")
+
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith(NDJSON_TYPES):
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        payload = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Malformed JSON body")
+
+    if isinstance(payload, dict):
+        payload = payload.get(key)
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail=f"Expected a list of {key}")
+    return payload
+
+
+def validate_items(model, items):
+    """Validate raw items against ``model``; any invalid item rejects the whole batch."""
+    validated = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            validated.append(model.model_validate(item))
+        except ValidationError as e:
+            errors.extend(
+                {"index": index, "loc": list(err["loc"]), "msg": err["msg"]}
+                for err in e.errors()
+            )
+            if len(errors) >= 20:
+                break
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    return validated
+
+
+def _sync_counts(received, inserted, updated):
+    return {
+        "received": received,
+        "inserted": inserted,
+        "updated": updated,
+        "skipped": received - inserted - updated,
+    }
+
+
+def _begin_write(conn):
+    """
+    Take the write lock before staging. The staging statements read main
+    tables, and a transaction that reads first cannot later upgrade to a
+    writer once another connection has committed; SQLite then fails with
+    "database is locked" at once instead of waiting out the busy timeout.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
+def upsert_words(conn, words):
+    """
+    Upsert ``words`` (WordSync items) in the caller's transaction.
+
+    Items carrying an ``id`` target that row; the rest match an existing word
+    on (jamaican_patois, english). Rows are staged in a temp table and applied
+    with one UPDATE ... FROM and one INSERT ... SELECT, so the cost does not
+    grow with per-row round trips. When the batch names the same word twice,
+    the last occurrence wins and the others count as skipped. New rows with
+    an explicit id are inserted first so generated ids cannot collide with them.
+    """
+    _begin_write(conn)
+    conn.execute("DROP TABLE IF EXISTS temp.sync_words")
+    conn.execute("""
+        CREATE TEMP TABLE sync_words (
+            position INTEGER PRIMARY KEY,
+            id INTEGER,
+            jamaican_patois TEXT NOT NULL,
+            english TEXT NOT NULL,
+            parts TEXT,
+            target_id INTEGER,
+            identity TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO temp.sync_words (id, jamaican_patois, english, parts) VALUES (?, ?, ?, ?)",
+        [
+            (word.id, word.jamaican_patois, word.english,
+             json.dumps(word.parts) if word.parts is not None else None)
+            for word in words
+        ]
+    )
+    conn.execute("""
+        UPDATE temp.sync_words
+        SET target_id = CASE
+            WHEN id IS NOT NULL THEN (SELECT w.id FROM main.words w WHERE w.id = sync_words.id)
+            ELSE (
+                SELECT MIN(w.id) FROM main.words w
+                WHERE w.jamaican_patois = sync_words.jamaican_patois
+                  AND w.english = sync_words.english
+            )
+        END
+    """)
+    conn.execute("""
+        UPDATE temp.sync_words
+        SET identity = CASE
+            WHEN target_id IS NOT NULL THEN 't' || target_id
+            WHEN id IS NOT NULL THEN 'i' || id
+            ELSE 'n' || json_array(jamaican_patois, english)
+        END
+    """)
+    conn.execute("""
+        DELETE FROM temp.sync_words
+        WHERE position NOT IN (SELECT MAX(position) FROM temp.sync_words GROUP BY identity)
+    """)
+    updated = conn.execute("""
+        UPDATE main.words
+        SET jamaican_patois = s.jamaican_patois, english = s.english, parts = s.parts
+        FROM temp.sync_words s
+        WHERE words.id = s.target_id
+          AND (words.jamaican_patois IS NOT s.jamaican_patois
+               OR words.english IS NOT s.english
+               OR words.parts IS NOT s.parts)
+    """).rowcount
+    inserted = conn.execute("""
+        INSERT INTO main.words (id, jamaican_patois, english, parts)
+        SELECT id, jamaican_patois, english, parts
+        FROM temp.sync_words
+        WHERE target_id IS NULL
+        ORDER BY id IS NULL, position
+    """).rowcount
+    conn.execute("DROP TABLE temp.sync_words")
+    return _sync_counts(len(words), inserted, updated)
+
+
+def upsert_groups(conn, groups):
+    """
+    Upsert ``groups`` (GroupSync items) in the caller's transaction.
+
+    Items carrying an ``id`` target that row (renaming it if needed); the rest
+    match an existing group by name. Same staging approach as upsert_words.
+    """
+    _begin_write(conn)
+    conn.execute("DROP TABLE IF EXISTS temp.sync_groups")
+    conn.execute("""
+        CREATE TEMP TABLE sync_groups (
+            position INTEGER PRIMARY KEY,
+            id INTEGER,
+            name TEXT NOT NULL,
+            target_id INTEGER,
+            identity TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO temp.sync_groups (id, name) VALUES (?, ?)",
+        [(group.id, group.name) for group in groups]
+    )
+    conn.execute("""
+        UPDATE temp.sync_groups
+        SET target_id = CASE
+            WHEN id IS NOT NULL THEN (SELECT g.id FROM main.groups g WHERE g.id = sync_groups.id)
+            ELSE (SELECT MIN(g.id) FROM main.groups g WHERE g.name = sync_groups.name)
+        END
+    """)
+    conn.execute("""
+        UPDATE temp.sync_groups
+        SET identity = CASE
+            WHEN target_id IS NOT NULL THEN 't' || target_id
+            WHEN id IS NOT NULL THEN 'i' || id
+            ELSE 'n' || name
+        END
+    """)
+    conn.execute("""
+        DELETE FROM temp.sync_groups
+        WHERE position NOT IN (SELECT MAX(position) FROM temp.sync_groups GROUP BY identity)
+    """)
+    updated = conn.execute("""
+        UPDATE main.groups
+        SET name = s.name
+        FROM temp.sync_groups s
+        WHERE groups.id = s.target_id AND groups.name IS NOT s.name
+    """).rowcount
+    inserted = conn.execute("""
+        INSERT INTO main.groups (id, name)
+        SELECT id, name
+        FROM temp.sync_groups
+        WHERE target_id IS NULL
+        ORDER BY id IS NULL, position
+    """).rowcount
+    conn.execute("DROP TABLE temp.sync_groups")
+    return _sync_counts(len(groups), inserted, updated)
+
+
+def insert_word_groups(conn, word_groups):
+    """
+    Add missing (word_id, group_id) associations in the caller's transaction.
+
+    Pairs that already exist, repeat within the batch, or reference an
+    unknown word or group are skipped; associations have nothing to update.
+    """
+    _begin_write(conn)
+    conn.execute("DROP TABLE IF EXISTS temp.sync_word_groups")
+    conn.execute("""
+        CREATE TEMP TABLE sync_word_groups (
+            word_id INTEGER NOT NULL,
+            group_id INTEGER NOT NULL,
+            PRIMARY KEY (word_id, group_id)
+        ) WITHOUT ROWID
+    """)
+    conn.executemany(
+        "INSERT OR IGNORE INTO temp.sync_word_groups (word_id, group_id) VALUES (?, ?)",
+        [(link.word_id, link.group_id) for link in word_groups]
+    )
+    inserted = conn.execute("""
+        INSERT INTO main.word_groups (word_id, group_id)
+        SELECT s.word_id, s.group_id
+        FROM temp.sync_word_groups s
+        WHERE EXISTS (SELECT 1 FROM main.words w WHERE w.id = s.word_id)
+          AND EXISTS (SELECT 1 FROM main.groups g WHERE g.id = s.group_id)
+          AND NOT EXISTS (
+              SELECT 1 FROM main.word_groups wg
+              WHERE wg.word_id = s.word_id AND wg.group_id = s.group_id
+          )
+    """).rowcount
+    conn.execute("DROP TABLE temp.sync_word_groups")
+    return _sync_counts(len(word_groups), inserted, 0)
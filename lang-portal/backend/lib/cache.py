@@ -0,0 +1,168 @@
+import asyncio
+import functools
+import inspect
+import os
+import threading
+import time
+
+from lib.db import current_db
+
+# Upper bound on entry age, so time-dependent values (e.g. streaks) and writes
+# made outside this process are eventually picked up
+AGGREGATE_CACHE_TTL = float(os.getenv("AGGREGATE_CACHE_TTL", "60"))
+# Distinct listings (query and parameters) whose row count paginate keeps
+PAGE_TOTAL_CACHE_SIZE = int(os.getenv("PAGE_TOTAL_CACHE_SIZE", "1024"))
+
+_version_lock = threading.Lock()
+_data_version = 0
+
+
+def data_version():
+    return _data_version
+
+
+def bump_data_version():
+    """
+    Mark cached aggregates as stale. Write endpoints call this after their
+    transaction has committed, so a reader can never cache pre-commit data
+    under the new version.
+    """
+    global _data_version
+    with _version_lock:
+        _data_version += 1
+        return _data_version
+
+
+class AggregateCache:
+    """
+    In-process cache of computed aggregates keyed by name and data version.
+
+    An aggregate computed from an immutable snapshot is keyed by the
+    snapshot instead: writes do not change it, so it stays valid until the
+    reader moves to another snapshot (or the TTL runs out).
+
+    With ``max_entries`` set, storing a new key past that many evicts the
+    oldest one.
+    """
+
+    def __init__(self, ttl=AGGREGATE_CACHE_TTL, max_entries=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+        # (key, version) -> future of the computation in progress
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+
+    def _lookup(self, key, snapshot=None):
+        """Return (found, value, version, now) for ``key`` and count the hit or miss."""
+        version = data_version() if snapshot is None else snapshot
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and now - entry[1] < self.ttl:
+                self.hits += 1
+                return True, entry[2], version, now
+            self.misses += 1
+            return False, None, version, now
+
+    def _store(self, key, version, now, value):
+        with self._lock:
+            if self.max_entries and key not in self._entries and len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (version, now, value)
+
+    def get_or_compute(self, key, compute, snapshot=None):
+        found, value, version, now = self._lookup(key, snapshot)
+        if not found:
+            value = compute()
+            self._store(key, version, now, value)
+        return value
+
+    async def get_or_compute_async(self, key, compute, snapshot=None):
+        """
+        Like get_or_compute, for a coroutine function ``compute``. Concurrent
+        misses for the same key and version wait for one computation instead
+        of each running the aggregate queries.
+        """
+        found, value, version, now = self._lookup(key, snapshot)
+        if found:
+            return value
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = self._inflight.get((key, version))
+            if future is not None and future.get_loop() is loop:
+                self.joined += 1
+            else:
+                future = None
+                leader = self._inflight[(key, version)] = loop.create_future()
+        if future is not None:
+            # Only raises if this request itself is cancelled
+            await asyncio.wait({future})
+            if not future.cancelled():
+                return future.result()
+            # The computation failed or was abandoned; run our own
+            value = await compute()
+            self._store(key, version, now, value)
+            return value
+
+        try:
+            value = await compute()
+        except BaseException:
+            leader.cancel()
+            raise
+        else:
+            self._store(key, version, now, value)
+            leader.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                if self._inflight.get((key, version)) is leader:
+                    del self._inflight[(key, version)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "data_version": data_version(),
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "joined": self.joined,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+aggregate_cache = AggregateCache()
+# Row counts of paginated listings, keyed by the versions of the tables they count
+page_totals = AggregateCache(max_entries=PAGE_TOTAL_CACHE_SIZE)
+
+
+def cached_aggregate(key, snapshot=None):
+    """
+    Serve a no-argument route handler (sync or async) from aggregate_cache.
+    ``snapshot``, if given, returns the snapshot the handler will read from,
+    or None when it reads the live database. Entries are kept per database,
+    so each learner's shard has its own.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper():
+                return await aggregate_cache.get_or_compute_async(
+                    (current_db(), key), func, snapshot and snapshot()
+                )
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper():
+            return aggregate_cache.get_or_compute((current_db(), key), func, snapshot and snapshot())
+        return wrapper
+    return decorator
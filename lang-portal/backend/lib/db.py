@@ -0,0 +1,418 @@
+import asyncio
+import contextvars
+import functools
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+
+from lib.profiling import profiled
+
+# Database the API serves; benchmarks point this at a generated database
+DEFAULT_DB_NAME = os.getenv("SQLITE_DB_PATH", "words.db")
+
+# Connection tuning, overridable from the environment
+POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "16"))
+POOL_TIMEOUT = float(os.getenv("SQLITE_POOL_TIMEOUT", "30"))
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+CACHE_SIZE_KIB = int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(64 * 1024)))
+STATEMENT_CACHE_SIZE = int(os.getenv("SQLITE_STATEMENT_CACHE_SIZE", "256"))
+DB_EXECUTOR_THREADS = int(os.getenv("SQLITE_EXECUTOR_THREADS", str(POOL_SIZE)))
+
+
+_current_db = contextvars.ContextVar("current_db", default=None)
+
+
+def current_db():
+    """The database this request works on: DEFAULT_DB_NAME unless using_database chose another."""
+    return _current_db.get() or DEFAULT_DB_NAME
+
+
+@contextmanager
+def using_database(db_name):
+    """Make ``db_name`` the default database for connections borrowed inside the block."""
+    token = _current_db.set(db_name)
+    try:
+        yield db_name
+    finally:
+        _current_db.reset(token)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    A bounded pool of tuned SQLite connections for a single database file.
+
+    Connections are handed out LIFO with per-thread affinity, so a worker
+    thread normally gets back the connection it used last (warm page cache,
+    warm statement cache). ``:memory:`` databases are pinned to a single
+    shared connection so every caller sees the same data. ``db_name`` may be
+    a ``file:`` URI; one opened with ``mode=ro`` or ``immutable=1`` skips the
+    journal settings, which only apply to a writable database.
+
+    ``setup(conn)``, if given, runs on every new connection after the
+    pragmas, e.g. to attach another database.
+    """
+
+    def __init__(self, db_name, max_size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 busy_timeout_ms=BUSY_TIMEOUT_MS, mmap_size=MMAP_SIZE,
+                 cache_size_kib=CACHE_SIZE_KIB, statement_cache_size=STATEMENT_CACHE_SIZE,
+                 setup=None):
+        self.db_name = db_name
+        self.in_memory = db_name == ":memory:"
+        self.uri = db_name.startswith("file:")
+        self.read_only = self.uri and ("mode=ro" in db_name or "immutable=1" in db_name)
+        self.max_size = 1 if self.in_memory else max(1, max_size)
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self.mmap_size = mmap_size
+        self.cache_size_kib = cache_size_kib
+        self.statement_cache_size = statement_cache_size
+        self.setup = setup
+
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._idle = []
+        self._all = []
+        self._closed = False
+        self._gates = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.waits = 0
+        self.opens = 0
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.db_name,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.statement_cache_size,
+            uri=self.uri,
+        )
+        if not self.in_memory:
+            if not self.read_only:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size={-int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if self.setup is not None:
+            self.setup(conn)
+        return conn
+
+    def acquire(self):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Connection pool for {self.db_name} is closed")
+
+            preferred = getattr(self._local, "conn", None)
+            if preferred is not None and preferred in self._idle:
+                self._idle.remove(preferred)
+                self.hits += 1
+                return preferred
+            if self._idle:
+                conn = self._idle.pop()
+                self.hits += 1
+            elif len(self._all) < self.max_size:
+                conn = self._open()
+                self._all.append(conn)
+                self.opens += 1
+            else:
+                self.waits += 1
+                deadline = time.monotonic() + self.timeout
+                while not self._idle:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        if not self._idle:
+                            raise PoolTimeout(
+                                f"Timed out waiting for a connection to {self.db_name}"
+                            )
+                conn = self._idle.pop()
+
+            self._local.conn = conn
+            return conn
+
+    def release(self, conn):
+        # Undo per-request customisations (e.g. routes/settings.py sets a row_factory)
+        conn.row_factory = None
+        with self._cond:
+            if self._closed:
+                conn.close()
+                return
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def async_gate(self):
+        """
+        Per-event-loop semaphore bounding async borrowers to the pool size, so
+        executor threads never block in acquire() while the connections they
+        wait for can only be released by other executor tasks.
+        """
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            gate = self._gates.get(loop)
+            if gate is None:
+                gate = asyncio.Semaphore(self.max_size)
+                self._gates[loop] = gate
+            return gate
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+            self._all = [c for c in self._all if c not in self._idle]
+            self._idle = []
+
+    def stats(self):
+        with self._cond:
+            return {
+                "db_name": self.db_name,
+                "size": len(self._all),
+                "max_size": self.max_size,
+                "idle": len(self._idle),
+                "in_use": len(self._all) - len(self._idle),
+                "hits": self.hits,
+                "waits": self.waits,
+                "opens": self.opens,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+# (db_name prefix, options) for pools of databases that are opened on demand
+_pool_defaults = []
+
+
+def set_pool_defaults(prefix, **options):
+    """
+    Configure every pool later created for a database whose name starts
+    with ``prefix``, however it is first borrowed. Options passed to
+    get_pool take precedence.
+    """
+    with _pools_lock:
+        _pool_defaults[:] = [entry for entry in _pool_defaults if entry[0] != prefix]
+        _pool_defaults.append((prefix, options))
+
+
+def get_pool(db_name=DEFAULT_DB_NAME, **options):
+    """The pool for ``db_name``; ``options`` configure it if it is created here."""
+    with _pools_lock:
+        pool = _pools.get(db_name)
+        if pool is None:
+            for prefix, defaults in _pool_defaults:
+                if db_name.startswith(prefix):
+                    options = {**defaults, **options}
+                    break
+            pool = ConnectionPool(db_name, **options)
+            _pools[db_name] = pool
+        return pool
+
+
+def close_pool(db_name=DEFAULT_DB_NAME):
+    """Close and forget the pool for ``db_name``; the next borrow opens a fresh one."""
+    with _pools_lock:
+        pool = _pools.pop(db_name, None)
+    if pool is not None:
+        pool.close()
+
+
+def close_pools():
+    """Close every pooled connection, e.g. before deleting the database file."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def pool_stats():
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools]
+
+
+@contextmanager
+def get_db_connection(db_name=None):
+    """
+    Borrow a pooled connection to ``db_name``, by default current_db().
+
+    The transaction is committed when the block exits normally and rolled
+    back if it raises; the connection then goes back to the pool.
+    """
+    db_name = db_name or current_db()
+    pool = get_pool(db_name)
+    conn = pool.acquire()
+    try:
+        yield profiled(conn, db_name)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        pool.release(conn)
+
+
+def remove_database(db_name=DEFAULT_DB_NAME):
+    """Delete a database file together with its WAL and shared-memory files."""
+    close_pools()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_name + suffix):
+            os.remove(db_name + suffix)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor():
+    """Dedicated threads for SQLite work, separate from the AnyIO threadpool."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DB_EXECUTOR_THREADS, thread_name_prefix="sqlite"
+            )
+        return _executor
+
+
+class AsyncResult:
+    """Rows of an executed statement, fetched on the DB executor."""
+
+    def __init__(self, cursor):
+        self.rows = cursor.fetchall()
+        self.description = cursor.description
+        self.lastrowid = cursor.lastrowid
+        self.rowcount = cursor.rowcount
+        self._position = 0
+
+    def fetchone(self):
+        if self._position >= len(self.rows):
+            return None
+        row = self.rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchmany(self, size=1):
+        rows = self.rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self.rows[self._position:]
+        self._position = len(self.rows)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+
+class AsyncConnection:
+    """
+    Async facade over a pooled sqlite3 connection.
+
+    Every call runs on the DB executor, so route handlers can be ``async def``
+    without blocking the event loop or holding an AnyIO worker thread.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    @property
+    def row_factory(self):
+        return self._conn.row_factory
+
+    @row_factory.setter
+    def row_factory(self, factory):
+        self._conn.row_factory = factory
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run ``func(conn, *args, **kwargs)`` on the executor with the raw
+        connection, in a copy of the caller's context (so e.g. current_db()
+        is the same there).
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, self._conn, *args, **kwargs)
+        return await loop.run_in_executor(get_db_executor(), call)
+
+    async def execute(self, sql, params=()):
+        return await self.run(lambda conn: AsyncResult(conn.execute(sql, params)))
+
+    async def executemany(self, sql, seq_of_params):
+        return await self.run(lambda conn: AsyncResult(conn.executemany(sql, seq_of_params)))
+
+    async def executescript(self, script):
+        await self.run(lambda conn: conn.executescript(script))
+
+    async def fetchone(self, sql, params=()):
+        return await self.run(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def fetchall(self, sql, params=()):
+        return await self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def iterate(self, sql, params=(), batch_size=1000):
+        """
+        Yield the rows of ``sql`` in lists of up to ``batch_size``, keeping
+        only one batch in memory. The statement reads a single snapshot
+        until it is exhausted or the caller stops iterating.
+        """
+        cursor = await self.run(lambda conn: conn.execute(sql, params))
+        try:
+            while True:
+                rows = await self.run(lambda conn: cursor.fetchmany(batch_size))
+                if not rows:
+                    break
+                yield rows
+        finally:
+            # Synchronous: an abandoned stream must not leave the read snapshot
+            # open on a pooled connection, and awaiting here may be cancelled
+            cursor.close()
+
+
+@asynccontextmanager
+async def get_async_db_connection(db_name=None):
+    """
+    Async counterpart of get_db_connection: borrow a pooled connection to
+    ``db_name`` (by default current_db()), commit on a clean exit, roll
+    back on error.
+    """
+    db_name = db_name or current_db()
+    pool = get_pool(db_name)
+    loop = asyncio.get_running_loop()
+    async with pool.async_gate():
+        acquiring = loop.run_in_executor(get_db_executor(), pool.acquire)
+        try:
+            conn = await acquiring
+        except asyncio.CancelledError:
+            # Hand the connection back once the in-flight acquire finishes
+            acquiring.add_done_callback(
+                lambda f: None if f.cancelled() or f.exception() else pool.release(f.result())
+            )
+            raise
+        release = True
+        try:
+            yield AsyncConnection(profiled(conn, db_name))
+            # Read-only blocks have nothing to commit; skip the executor hop
+            if conn.in_transaction:
+                await loop.run_in_executor(get_db_executor(), conn.commit)
+        except BaseException:
+            # A rollback may wait on the database lock; keep it off the loop
+            rolling_back = loop.run_in_executor(get_db_executor(), conn.rollback)
+            try:
+                await rolling_back
+            except asyncio.CancelledError:
+                # Hand the connection back once the in-flight rollback finishes
+                rolling_back.add_done_callback(lambda f: pool.release(conn))
+                release = False
+            raise
+        finally:
+            if release:
+                pool.release(conn)
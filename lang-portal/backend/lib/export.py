@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+import os
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export is optional
+    pyarrow = None
+
+from lib.db import get_async_db_connection
+
+# Rows fetched from SQLite per chunk; also the Parquet row group size
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _convert(columns, rows):
+    """Turn SQLite's 0/1 booleans back into bools for ``bool`` columns."""
+    flags = [i for i, (_, kind) in enumerate(columns) if kind == "bool"]
+    if not flags:
+        return rows
+    converted = []
+    for row in rows:
+        row = list(row)
+        for i in flags:
+            if row[i] is not None:
+                row[i] = bool(row[i])
+        converted.append(row)
+    return converted
+
+
+class NdjsonEncoder:
+    def __init__(self, columns):
+        self.names = [name for name, _ in columns]
+
+    def header(self):
+        return b""
+
+    def encode(self, rows):
+        names = self.names
+        return "".join(
+            json.dumps(dict(zip(names, row)), separators=(",", ":")) + "\n" for row in rows
+        ).encode()
+
+    def finish(self):
+        return b""
+
+
+class CsvEncoder:
+    def __init__(self, columns):
+        self.names = [name for name, _ in columns]
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    def _drain(self):
+        data = self.buffer.getvalue().encode()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+    def header(self):
+        self.writer.writerow(self.names)
+        return self._drain()
+
+    def encode(self, rows):
+        self.writer.writerows(rows)
+        return self._drain()
+
+    def finish(self):
+        return b""
+
+
+class ParquetEncoder:
+    """
+    Writes one row group per batch and hands back the bytes written so far,
+    so the file is streamed rather than assembled in memory. Arrow tracks the
+    write position itself, which lets the buffer be emptied between batches.
+    """
+
+    TYPES = {"int": "int64", "str": "string", "bool": "bool_"}
+
+    def __init__(self, columns):
+        self.names = [name for name, _ in columns]
+        self.schema = pyarrow.schema(
+            [(name, getattr(pyarrow, self.TYPES[kind])()) for name, kind in columns]
+        )
+        self.buffer = io.BytesIO()
+        self.writer = pyarrow.parquet.ParquetWriter(self.buffer, self.schema)
+
+    def _drain(self):
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+    def header(self):
+        return self._drain()
+
+    def encode(self, rows):
+        arrays = [list(column) for column in zip(*rows)]
+        self.writer.write_table(pyarrow.table(arrays, schema=self.schema))
+        return self._drain()
+
+    def finish(self):
+        self.writer.close()
+        return self._drain()
+
+
+ENCODERS = {"ndjson": NdjsonEncoder, "csv": CsvEncoder, "parquet": ParquetEncoder}
+
+
+def parquet_available():
+    return pyarrow is not None
+
+
+async def stream_export(sql, params, columns, fmt, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yield ``sql``'s rows encoded as ``fmt``, one chunk per fetched batch.
+
+    ``columns`` lists ``(name, kind)`` pairs matching the selected columns,
+    with kind one of ``int``, ``str`` or ``bool``. Memory use is bounded by
+    ``batch_size`` however many rows the query returns, provided the query's
+    ORDER BY is satisfied by an index (a sort would buffer every row first).
+    """
+    encoder = ENCODERS[fmt](columns)
+    header = encoder.header()
+    if header:
+        yield header
+    async with get_async_db_connection() as conn:
+        async for rows in conn.iterate(sql, params, batch_size):
+            yield encoder.encode(_convert(columns, rows))
+    tail = encoder.finish()
+    if tail:
+        yield tail
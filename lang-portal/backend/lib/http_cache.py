@@ -0,0 +1,62 @@
+import hashlib
+import os
+from datetime import date
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from lib.db import current_db, get_async_db_connection
+
+# Default Cache-Control for read endpoints: clients may store responses but
+# must revalidate, which costs one table_versions lookup when unchanged
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+
+def _etag_matches(header, etag):
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class CachePolicy:
+    """
+    Conditional GET support for one router.
+
+    ``Cache-Control`` defaults to ``default`` and can be overridden with the
+    ``CACHE_CONTROL_<NAME>`` environment variable. ``depends_on(*tables)``
+    returns a route dependency that derives a strong ETag from the request
+    and the versions of ``tables`` in ``table_versions`` (bumped by triggers
+    on every write), and answers a matching ``If-None-Match`` with 304 before
+    the handler runs its queries. ``db``, if given, returns the name of the
+    database the router reads, so the versions come from the same data.
+    """
+
+    def __init__(self, name, default=DEFAULT_CACHE_CONTROL, db=None):
+        self.name = name
+        self.cache_control = os.getenv(f"CACHE_CONTROL_{name.upper()}", default)
+        self.db = db
+
+    def depends_on(self, *tables, daily=False):
+        """``daily`` also varies the ETag by date, for responses that depend on today."""
+        placeholders = ", ".join("?" * len(tables))
+        query = f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})"
+
+        async def conditional_get(request: Request, response: Response):
+            db_name = self.db() if self.db else current_db()
+            async with get_async_db_connection(db_name) as conn:
+                versions = sorted(await conn.fetchall(query, tables))
+            # The database is part of it: two learners' shards can be at the same versions
+            fingerprint = [request.url.path, sorted(request.query_params.multi_items()), versions, current_db()]
+            if daily:
+                fingerprint.append(date.today().isoformat())
+            digest = hashlib.blake2b(repr(fingerprint).encode(), digest_size=16).hexdigest()
+            etag = f'"{digest}"'
+
+            headers = {"ETag": etag, "Cache-Control": self.cache_control}
+            if_none_match = request.headers.get("if-none-match")
+            if if_none_match and _etag_matches(if_none_match, etag):
+                raise HTTPException(status_code=304, headers=headers)
+            response.headers.update(headers)
+
+        return Depends(conditional_get)
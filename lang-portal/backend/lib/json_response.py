@@ -0,0 +1,66 @@
+import json
+from json.encoder import encode_basestring as _quote
+
+from starlette.responses import Response
+
+
+class PrebuiltJSONResponse(Response):
+    """
+    A JSON response whose body is already encoded.
+
+    Returning one from a route bypasses FastAPI's response_model validation
+    and jsonable_encoder, so list endpoints pay for serialisation once.
+    """
+    media_type = "application/json"
+
+
+def encode_words(rows):
+    """
+    Encode word rows ``(id, jamaican_patois, english, parts, correct_count,
+    wrong_count)`` as a JSON array.
+
+    ``parts`` is spliced in verbatim, so the query must only return valid
+    JSON object text or NULL for it (see ``json_type`` in the word list queries).
+    """
+    return "[" + ",".join(
+        f'{{"id":{row[0]},"jamaican_patois":{_quote(row[1])},"english":{_quote(row[2])},'
+        f'"parts":{"null" if row[3] is None else row[3]},'
+        f'"correct_count":{row[4]},"wrong_count":{row[5]}}}'
+        for row in rows
+    ) + "]"
+
+
+def encode_object(columns, row, raw=("parts",)):
+    """
+    Encode ``row`` as a JSON object keyed by ``columns``.
+
+    Values of the ``raw`` columns are spliced in verbatim like ``parts`` in
+    encode_words, so they must be valid JSON text or NULL; the rest go
+    through json.dumps.
+    """
+    return "{" + ",".join(
+        _quote(column) + ":" + (
+            ("null" if value is None else value) if column in raw
+            else json.dumps(value, separators=(",", ":"))
+        )
+        for column, value in zip(columns, row)
+    ) + "}"
+
+
+def encode_objects(columns, rows, raw=("parts",)):
+    """Encode ``rows`` as a JSON array of objects; see encode_object."""
+    return "[" + ",".join(encode_object(columns, row, raw) for row in rows) + "]"
+
+
+def page_response(key, items, pagination, headers=None):
+    """Build a ``{key: [...], "pagination": {...}}`` body around the encoded ``items`` array."""
+    body = (
+        "{" + _quote(key) + ":" + items
+        + ',"pagination":' + json.dumps(pagination, separators=(",", ":")) + "}"
+    )
+    return PrebuiltJSONResponse(body.encode(), headers=headers)
+
+
+def words_page_response(rows, pagination, headers=None):
+    """Build a PaginatedWords body straight from query rows."""
+    return page_response("words", encode_words(rows), pagination, headers)
@@ -0,0 +1,324 @@
+import asyncio
+import contextvars
+import os
+import re
+import threading
+import time
+
+from starlette.datastructures import MutableHeaders
+
+# Development/debugging aid: profile the SQL behind every request
+ENABLE_SQL_PROFILING = os.getenv("ENABLE_SQL_PROFILING", "false").lower() == "true"
+# Also run EXPLAIN QUERY PLAN for each request's slowest statement
+SQL_PROFILING_EXPLAIN = os.getenv("SQL_PROFILING_EXPLAIN", "false").lower() == "true"
+
+# Distinct statements kept in the aggregate; further ones are counted per route only
+MAX_TRACKED_STATEMENTS = 500
+# Length of the SQL text in Server-Timing descriptions
+HEADER_SQL_LENGTH = 100
+
+_current_profile = contextvars.ContextVar("sql_profile", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(sql):
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class StatementRecord:
+    __slots__ = ("sql", "params", "db_name", "seconds", "rows")
+
+    def __init__(self, sql, params, db_name):
+        self.sql = sql
+        self.params = params
+        self.db_name = db_name
+        self.seconds = 0.0
+        self.rows = 0
+
+
+class RequestProfile:
+    """SQL statements run on behalf of one request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements = []
+
+    def start(self, sql, params, db_name):
+        record = StatementRecord(sql, params, db_name)
+        with self._lock:
+            self.statements.append(record)
+        return record
+
+    def summary(self):
+        with self._lock:
+            statements = list(self.statements)
+        slowest = max(statements, key=lambda record: record.seconds, default=None)
+        return {
+            "statements": len(statements),
+            "sql_ms": sum(record.seconds for record in statements) * 1000,
+            "rows": sum(record.rows for record in statements),
+            "slowest": slowest,
+        }
+
+
+class ProfiledCursor:
+    """Times a cursor's execute and fetch calls and counts the rows it returns."""
+
+    def __init__(self, cursor, record):
+        self._cursor = cursor
+        self._record = record
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _fetch(self, fetch, *args):
+        started = time.perf_counter()
+        result = fetch(*args)
+        self._record.seconds += time.perf_counter() - started
+        return result
+
+    def fetchone(self):
+        row = self._fetch(self._cursor.fetchone)
+        if row is not None:
+            self._record.rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._fetch(self._cursor.fetchmany, *args)
+        self._record.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(self._cursor.fetchall)
+        self._record.rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+
+class ProfiledConnection:
+    """
+    Wraps a sqlite3 connection so every statement is recorded in ``profile``.
+
+    Only execute, executemany and executescript are intercepted; everything
+    else (commit, in_transaction, row_factory, ...) goes to the connection.
+    """
+
+    def __init__(self, conn, profile, db_name):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_profile", profile)
+        object.__setattr__(self, "_db_name", db_name)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def _run(self, method, sql, params, args):
+        record = self._profile.start(sql, params, self._db_name)
+        started = time.perf_counter()
+        try:
+            cursor = method(sql, *args)
+        finally:
+            record.seconds += time.perf_counter() - started
+        return ProfiledCursor(cursor, record)
+
+    def execute(self, sql, params=()):
+        return self._run(self._conn.execute, sql, params, (params,))
+
+    def executemany(self, sql, seq_of_params):
+        return self._run(self._conn.executemany, sql, None, (seq_of_params,))
+
+    def executescript(self, script):
+        return self._run(self._conn.executescript, script, None, ())
+
+
+def profiled(conn, db_name):
+    """Wrap ``conn`` when the current request is being profiled, else return it as is."""
+    profile = _current_profile.get()
+    if profile is None:
+        return conn
+    return ProfiledConnection(conn, profile, db_name)
+
+
+def explain(record):
+    """EXPLAIN QUERY PLAN lines for a recorded statement, or None if it cannot be explained."""
+    from lib.db import get_db_connection
+
+    if record.params is None or not record.sql.lstrip().upper().startswith(("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")):
+        return None
+    try:
+        with get_db_connection(record.db_name) as conn:
+            return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {record.sql}", record.params)]
+    except Exception:
+        return None
+
+
+class RouteMetrics:
+    """SQL totals per route and per statement, across requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes = {}
+        self.statements = {}
+
+    def record(self, route, elapsed_ms, summary, records, plan):
+        slowest = summary["slowest"]
+        with self._lock:
+            entry = self.routes.get(route)
+            if entry is None:
+                entry = self.routes[route] = {
+                    "requests": 0, "total_ms": 0.0, "max_ms": 0.0, "statements": 0,
+                    "max_statements": 0, "sql_ms": 0.0, "rows": 0, "slowest": None,
+                }
+            entry["requests"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["statements"] += summary["statements"]
+            entry["max_statements"] = max(entry["max_statements"], summary["statements"])
+            entry["sql_ms"] += summary["sql_ms"]
+            entry["rows"] += summary["rows"]
+            if slowest is not None and (entry["slowest"] is None or slowest.seconds * 1000 > entry["slowest"]["ms"]):
+                entry["slowest"] = {"sql": _normalize(slowest.sql), "ms": slowest.seconds * 1000, "plan": plan}
+
+            for record in records:
+                sql = _normalize(record.sql)
+                stats = self.statements.get(sql)
+                if stats is None:
+                    if len(self.statements) >= MAX_TRACKED_STATEMENTS:
+                        continue
+                    stats = self.statements[sql] = {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+                stats["calls"] += 1
+                stats["total_ms"] += record.seconds * 1000
+                stats["max_ms"] = max(stats["max_ms"], record.seconds * 1000)
+                stats["rows"] += record.rows
+
+    def snapshot(self, top=20):
+        with self._lock:
+            routes = {}
+            for route, entry in sorted(self.routes.items()):
+                requests = entry["requests"]
+                routes[route] = {
+                    "requests": requests,
+                    "avg_ms": round(entry["total_ms"] / requests, 3),
+                    "max_ms": round(entry["max_ms"], 3),
+                    "avg_statements": round(entry["statements"] / requests, 2),
+                    "max_statements": entry["max_statements"],
+                    "avg_sql_ms": round(entry["sql_ms"] / requests, 3),
+                    "avg_rows": round(entry["rows"] / requests, 2),
+                    "slowest_statement": entry["slowest"] and {
+                        **entry["slowest"], "ms": round(entry["slowest"]["ms"], 3)
+                    },
+                }
+            statements = sorted(self.statements.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+            return {
+                "routes": routes,
+                "top_statements": [
+                    {"sql": sql, "calls": stats["calls"], "total_ms": round(stats["total_ms"], 3),
+                     "avg_ms": round(stats["total_ms"] / stats["calls"], 3),
+                     "max_ms": round(stats["max_ms"], 3), "rows": stats["rows"]}
+                    for sql, stats in statements[:top]
+                ],
+            }
+
+    def clear(self):
+        with self._lock:
+            self.routes.clear()
+            self.statements.clear()
+
+
+route_metrics = RouteMetrics()
+
+
+def _quote(text):
+    text = _normalize(text)[:HEADER_SQL_LENGTH]
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def server_timing(summary):
+    """``Server-Timing`` value for a request's SQL so far."""
+    value = (f'sql;dur={summary["sql_ms"]:.3f};'
+             f'desc="{summary["statements"]} statements, {summary["rows"]} rows"')
+    slowest = summary["slowest"]
+    if slowest is not None:
+        value += f", sql-slowest;dur={slowest.seconds * 1000:.3f};desc={_quote(slowest.sql)}"
+    return value
+
+
+class SQLProfilingMiddleware:
+    """
+    ASGI middleware that profiles the SQL run for each request while
+    ENABLE_SQL_PROFILING is on, adds it as ``Server-Timing`` headers and
+    aggregates it per route for ``/api/_debug/metrics``.
+
+    Headers are sent before a streaming body is produced, so they only cover
+    the SQL run up to that point; the per-route aggregates cover all of it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENABLE_SQL_PROFILING:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(profile.summary()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except BaseException:
+            self._finish(scope, profile, (time.perf_counter() - started) * 1000, None)
+            raise
+        finally:
+            _current_profile.reset(token)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        plan = None
+        slowest = profile.summary()["slowest"]
+        if SQL_PROFILING_EXPLAIN and slowest is not None:
+            from lib.db import get_db_executor
+            loop = asyncio.get_running_loop()
+            plan = await loop.run_in_executor(get_db_executor(), explain, slowest)
+        self._finish(scope, profile, elapsed_ms, plan)
+
+    @staticmethod
+    def _finish(scope, profile, elapsed_ms, plan):
+        name = f'{scope["method"]} {_route_template(scope)}'
+        route_metrics.record(name, elapsed_ms, profile.summary(), profile.statements, plan)
+
+
+_PATH_PARAM = re.compile(r"\{(\w+)(?::\w+)?\}")
+
+
+def _route_template(scope):
+    """
+    The matched route's path template, e.g. ``/api/words/{word_id}``.
+
+    An included router's route may only know its path below the router
+    prefix; the prefix is recovered from the end of the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "(unmatched)"
+    params = scope.get("path_params", {})
+    rendered = _PATH_PARAM.sub(lambda match: str(params.get(match.group(1), "")), template)
+    path = scope["path"]
+    prefix = path[:-len(rendered)] if rendered and path.endswith(rendered) else ""
+    return prefix + template
@@ -0,0 +1,225 @@
+import contextvars
+import glob
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from lib.db import BUSY_TIMEOUT_MS, DEFAULT_DB_NAME, close_pool, current_db, get_pool
+
+# Serve analytics-only routes (the dashboard) from a periodic snapshot
+ENABLE_READ_REPLICA = os.getenv("ENABLE_READ_REPLICA", "false").lower() == "true"
+# Snapshots are written as <path>.<generation>
+REPLICA_PATH = os.getenv("SQLITE_REPLICA_PATH", f"{DEFAULT_DB_NAME}-replica")
+# Seconds between the end of one snapshot and the start of the next
+REPLICA_REFRESH_INTERVAL = float(os.getenv("REPLICA_REFRESH_INTERVAL", "10"))
+# Oldest snapshot analytics may read; past this they fall back to the live database
+REPLICA_MAX_STALENESS = float(os.getenv("REPLICA_MAX_STALENESS", "30"))
+# Connections to the snapshot; kept below the DB executor size so analytics
+# reads can never take every executor thread away from writes
+REPLICA_POOL_SIZE = int(os.getenv("REPLICA_POOL_SIZE", "4"))
+
+_pinned = contextvars.ContextVar("analytics_db", default=None)
+
+
+class Snapshot:
+    __slots__ = ("generation", "path", "db_name", "taken_at")
+
+    def __init__(self, generation, path, db_name, taken_at):
+        self.generation = generation
+        self.path = path
+        self.db_name = db_name
+        self.taken_at = taken_at
+
+
+class SnapshotReplica:
+    """
+    A read-only copy of ``source`` refreshed by a background thread.
+
+    Each refresh copies the live database with the sqlite3 online backup
+    API into a new ``<path>.<generation>`` file, opened ``immutable=1`` so
+    readers take no locks at all, then switches readers over. The copy runs
+    in one read transaction on a connection of its own; in WAL mode that
+    never blocks writers. The previous snapshot is kept for requests still
+    reading it, and older ones are deleted.
+    """
+
+    def __init__(self, source=DEFAULT_DB_NAME, path=REPLICA_PATH,
+                 refresh_interval=REPLICA_REFRESH_INTERVAL,
+                 max_staleness=REPLICA_MAX_STALENESS, pool_size=REPLICA_POOL_SIZE):
+        self.source = source
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self.pool_size = pool_size
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._current = None
+        self._previous = None
+        self._generation = 0
+        self._thread = None
+        self._stop = threading.Event()
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error = None
+        self.last_duration = None
+
+    def refresh(self):
+        """Take a new snapshot and switch readers to it. Returns the snapshot."""
+        with self._refresh_lock:
+            generation = self._generation + 1
+            path = f"{self.path}.{generation}"
+            if os.path.exists(path):
+                os.remove(path)
+
+            # The snapshot holds what was committed when the backup started
+            started = time.monotonic()
+            source = sqlite3.connect(self.source, timeout=BUSY_TIMEOUT_MS / 1000)
+            target = sqlite3.connect(path)
+            try:
+                source.backup(target)
+                # Readers open it immutable, which needs a rollback-journal database
+                target.execute("PRAGMA journal_mode=DELETE")
+            finally:
+                target.close()
+                source.close()
+
+            db_name = f"file:{quote(os.path.abspath(path))}?immutable=1"
+            get_pool(db_name, max_size=self.pool_size)
+            snapshot = Snapshot(generation, path, db_name, started)
+            with self._lock:
+                retired, self._previous, self._current = self._previous, self._current, snapshot
+                self._generation = generation
+                self.refreshes += 1
+                self.last_duration = time.monotonic() - started
+            if retired is not None:
+                self._discard(retired)
+            return snapshot
+
+    @staticmethod
+    def _discard(snapshot):
+        close_pool(snapshot.db_name)
+        if os.path.exists(snapshot.path):
+            os.remove(snapshot.path)
+
+    def start(self):
+        """Start the refresh thread if it is not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            # Snapshots left behind by an earlier process
+            live = {s.path for s in (self._current, self._previous) if s is not None}
+            for path in glob.glob(glob.escape(self.path) + ".*"):
+                if path.rpartition(".")[2].isdigit() and path not in live:
+                    os.remove(path)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sqlite-replica", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        # A snapshot taken before the thread started counts towards the first interval
+        age = self.age()
+        delay = 0 if age is None else max(0, self.refresh_interval - age)
+        while not self._stop.wait(delay):
+            try:
+                self.refresh()
+            except Exception as exc:
+                with self._lock:
+                    self.failures += 1
+                    self.last_error = repr(exc)
+            delay = self.refresh_interval
+
+    def stop(self):
+        """Stop refreshing and delete the snapshot files."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+        with self._refresh_lock, self._lock:
+            snapshots = [s for s in (self._current, self._previous) if s is not None]
+            self._current = self._previous = self._thread = None
+        for snapshot in snapshots:
+            self._discard(snapshot)
+
+    def age(self):
+        """Seconds since the current snapshot was taken, or None before the first one."""
+        with self._lock:
+            current = self._current
+        return None if current is None else time.monotonic() - current.taken_at
+
+    def current(self):
+        """
+        The snapshot's database name while it is within max_staleness, else
+        None. Starts the refresh thread on first use.
+        """
+        self.start()
+        with self._lock:
+            current = self._current
+        if current is None or time.monotonic() - current.taken_at > self.max_staleness:
+            return None
+        return current.db_name
+
+    def stats(self):
+        age = self.age()
+        with self._lock:
+            return {
+                "generation": self._current.generation if self._current else None,
+                "age_seconds": None if age is None else round(age, 3),
+                "max_staleness": self.max_staleness,
+                "refresh_interval": self.refresh_interval,
+                "refreshes": self.refreshes,
+                "failures": self.failures,
+                "last_error": self.last_error,
+                "last_refresh_seconds": None if self.last_duration is None else round(self.last_duration, 3),
+            }
+
+
+replica = SnapshotReplica()
+
+
+def _choose_analytics_db():
+    live = current_db()
+    use_replica = ENABLE_READ_REPLICA and live == DEFAULT_DB_NAME
+    return (replica.current() if use_replica else None) or live
+
+
+def analytics_db():
+    """
+    Database name for analytics-only reads: the replica snapshot while
+    ENABLE_READ_REPLICA is on and the snapshot is fresh enough, else the
+    live database. The replica only copies the default database, so a
+    request routed to a learner's shard reads the shard.
+
+    Inside pinned_analytics_db() this is the choice made when the block
+    was entered; outside it every call chooses again.
+    """
+    return _pinned.get() or _choose_analytics_db()
+
+
+@contextmanager
+def pinned_analytics_db():
+    """Fix analytics_db() for the block, so everything inside reads the same data."""
+    token = _pinned.set(_choose_analytics_db())
+    try:
+        yield _pinned.get()
+    finally:
+        _pinned.reset(token)
+
+
+async def pin_analytics_db():
+    """
+    Router dependency pinning analytics_db() for the rest of the request,
+    so a route's ETag check, its aggregate cache lookup and its queries all
+    read the same snapshot; the pin is released when the request ends.
+    """
+    with pinned_analytics_db():
+        yield
+
+
+def analytics_snapshot():
+    """The snapshot analytics_db picked for this request, or None for the live database."""
+    db_name = analytics_db()
+    return None if db_name == current_db() else db_name
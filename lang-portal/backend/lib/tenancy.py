@@ -0,0 +1,287 @@
+import asyncio
+import contextvars
+import os
+import re
+import threading
+from collections import OrderedDict
+from urllib.parse import quote
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+
+from lib.db import (DEFAULT_DB_NAME, close_pool, get_db_executor, get_pool,
+                    set_pool_defaults, using_database)
+
+# Route requests that name a learner to that learner's own database file
+ENABLE_TENANCY = os.getenv("ENABLE_TENANCY", "false").lower() == "true"
+# Request header naming the learner; requests without it use the default database
+TENANT_HEADER = os.getenv("TENANT_HEADER", "X-Learner-Id")
+# Directory holding one <learner>.db shard per learner
+TENANT_DIR = os.getenv("SQLITE_TENANT_DIR", "learners")
+# Database holding the vocabulary every learner reads; attached read-only to each shard
+SHARED_DB_NAME = os.getenv("SQLITE_SHARED_DB_PATH", DEFAULT_DB_NAME)
+# Shards whose connections stay open; the least recently used one is closed past this
+MAX_OPEN_SHARDS = int(os.getenv("SQLITE_MAX_OPEN_SHARDS", "64"))
+# Connections per open shard; a learner rarely has more than a few requests in flight
+SHARD_POOL_SIZE = int(os.getenv("SQLITE_SHARD_POOL_SIZE", "4"))
+
+# Tables that live only in the shared database, in the order they are dropped from a shard
+SHARED_TABLES = ("words_fts", "word_groups", "groups", "words")
+# Schema name the shared database is attached under
+SHARED_SCHEMA = "shared"
+
+LEARNER_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+_learner = contextvars.ContextVar("learner", default=None)
+
+
+def current_learner():
+    """The learner the current request was routed for, or None."""
+    return _learner.get()
+
+
+def _drop_shared_tables(conn):
+    for table in SHARED_TABLES:
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+    conn.execute(
+        f"DELETE FROM table_versions WHERE table_name IN ({', '.join('?' * len(SHARED_TABLES))})",
+        SHARED_TABLES
+    )
+
+
+class ShardRouter:
+    """
+    Maps learners to per-learner SQLite databases ("shards"), so each
+    learner's writes take only their own file's lock.
+
+    A shard holds the learner's study data and settings. The vocabulary
+    (SHARED_TABLES) is not copied: it is read from ``shared``, attached
+    read-only to every shard connection, and unqualified table names such
+    as ``words`` resolve there because the shard has no table of that name.
+    ``table_versions`` is shadowed per connection by a temporary view that
+    takes the vocabulary tables' versions from the shared database, so
+    ETags and cached totals follow vocabulary changes too. Triggers still
+    write the shard's own table.
+
+    A shard is created on first use from the schema-only template. Pools
+    of the ``max_open`` most recently used shards stay open; opening one
+    more closes the least recently used pool that no request holds. A
+    request holds its shard from acquire() to release(), so its pool is
+    never closed under it; while every open shard is held the router runs
+    over ``max_open`` and closes the extra pools as they are released.
+    """
+
+    def __init__(self, directory=TENANT_DIR, shared=SHARED_DB_NAME,
+                 max_open=MAX_OPEN_SHARDS, pool_size=SHARD_POOL_SIZE):
+        self.directory = os.path.abspath(directory)
+        self.shared = shared
+        self.max_open = max(1, max_open)
+        self.pool_size = pool_size
+        self.prefix = f"file:{quote(self.directory)}/"
+
+        self._lock = threading.Lock()
+        self._create_lock = threading.Lock()
+        self._open = OrderedDict()
+        self._in_use = {}
+        self.hits = 0
+        self.opens = 0
+        self.created = 0
+        self.evictions = 0
+        set_pool_defaults(self.prefix, max_size=pool_size, setup=self._attach_shared)
+
+    def path(self, learner_id):
+        if not LEARNER_ID.fullmatch(learner_id):
+            raise ValueError(f"Invalid learner id: {learner_id!r}")
+        return os.path.join(self.directory, f"{learner_id}.db")
+
+    def _attach_shared(self, conn):
+        shared = self.shared
+        if not shared.startswith("file:"):
+            shared = f"file:{quote(os.path.abspath(shared))}?mode=ro"
+        conn.execute(f"ATTACH DATABASE ? AS {SHARED_SCHEMA}", (shared,))
+        shared_names = ", ".join(f"'{table}'" for table in SHARED_TABLES)
+        conn.execute(f"""
+            CREATE TEMP VIEW table_versions AS
+            SELECT table_name, version FROM main.table_versions
+            WHERE table_name NOT IN ({shared_names})
+            UNION ALL
+            SELECT table_name, version FROM {SHARED_SCHEMA}.table_versions
+            WHERE table_name IN ({shared_names})
+        """)
+
+    def _db_name(self, path):
+        return self.prefix + quote(os.path.basename(path))
+
+    def create(self, learner_id, seeded=False, prepare=None):
+        """
+        (Re)build a learner's shard from the schema-only or seeded template,
+        keeping only the learner tables. ``prepare`` is as for clone_database.
+        Returns the shard's database name.
+        """
+        from template_db import clone_database
+
+        path = self.path(learner_id)
+        db_name = self._db_name(path)
+
+        def learner_tables(template):
+            _drop_shared_tables(template)
+            if prepare is not None:
+                prepare(template)
+
+        if os.path.exists(path):
+            clone_database(db_name, seeded=seeded, prepare=learner_tables)
+            return db_name
+
+        # Built under another name, so a crash never leaves a half-made shard
+        os.makedirs(self.directory, exist_ok=True)
+        building = f"{path}.building"
+        try:
+            clone_database(building, seeded=seeded, prepare=learner_tables)
+        finally:
+            # Closing the last connection checkpoints the WAL into the file
+            close_pool(building)
+        os.replace(building, path)
+        with self._lock:
+            self.created += 1
+        return db_name
+
+    def db_name(self, learner_id):
+        """
+        Database name of a learner's shard, creating the shard on first use
+        and marking it most recently used.
+        """
+        return self._open_shard(learner_id, hold=False)
+
+    def acquire(self, learner_id):
+        """As db_name, and keeps the shard's pool open until release()."""
+        return self._open_shard(learner_id, hold=True)
+
+    def release(self, learner_id):
+        """Drop a hold taken by acquire(), closing the pool if it is now over the limit."""
+        with self._lock:
+            holds = self._in_use.pop(learner_id) - 1
+            if holds:
+                self._in_use[learner_id] = holds
+            evicted = self._evict()
+        for name in evicted:
+            close_pool(name)
+
+    def _open_shard(self, learner_id, hold):
+        path = self.path(learner_id)
+        db_name = self._db_name(path)
+        with self._lock:
+            if learner_id in self._open:
+                self._open.move_to_end(learner_id)
+                self.hits += 1
+                if hold:
+                    self._in_use[learner_id] = self._in_use.get(learner_id, 0) + 1
+                return db_name
+
+        # Serialized, so two first requests for a learner build it once
+        with self._create_lock:
+            if not os.path.exists(path):
+                self.create(learner_id)
+
+        with self._lock:
+            if learner_id in self._open:
+                self._open.move_to_end(learner_id)
+                self.hits += 1
+            else:
+                get_pool(db_name)
+                self._open[learner_id] = db_name
+                self.opens += 1
+            if hold:
+                self._in_use[learner_id] = self._in_use.get(learner_id, 0) + 1
+            evicted = self._evict(keep=learner_id)
+        for name in evicted:
+            close_pool(name)
+        return db_name
+
+    def _evict(self, keep=None):
+        """Forget the least recently used unheld shards past max_open; returns their names to close."""
+        evicted = []
+        for learner_id in list(self._open):
+            if len(self._open) <= self.max_open:
+                break
+            if learner_id != keep and learner_id not in self._in_use:
+                evicted.append(self._open.pop(learner_id))
+                self.evictions += 1
+        return evicted
+
+    def close(self):
+        """Close every open shard pool."""
+        with self._lock:
+            names = list(self._open.values())
+            self._open.clear()
+        for name in names:
+            close_pool(name)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "open": len(self._open),
+                "in_use": len(self._in_use),
+                "max_open": self.max_open,
+                "hits": self.hits,
+                "opens": self.opens,
+                "created": self.created,
+                "evictions": self.evictions,
+            }
+
+
+shards = ShardRouter()
+
+
+def require_shared_database():
+    """
+    Route dependency for writes to the shared vocabulary, which a learner's
+    shard only has read-only: they must be sent without the learner header.
+    """
+    if current_learner() is not None:
+        raise HTTPException(
+            status_code=403,
+            detail=f"The shared vocabulary cannot be changed from a learner request ({TENANT_HEADER})"
+        )
+
+
+class TenancyMiddleware:
+    """
+    ASGI middleware that, while ENABLE_TENANCY is on, routes a request
+    carrying the TENANT_HEADER to that learner's shard: connections
+    borrowed with the default database name go to the shard for the rest
+    of the request. Requests without the header use the default database.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENABLE_TENANCY:
+            await self.app(scope, receive, send)
+            return
+
+        learner_id = Headers(scope=scope).get(TENANT_HEADER)
+        if learner_id is None:
+            await self.app(scope, receive, send)
+            return
+        if not LEARNER_ID.fullmatch(learner_id):
+            response = JSONResponse(
+                {"detail": f"{TENANT_HEADER} must be 1-64 letters, digits, '-' or '_'"},
+                status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        # Opening a shard may create its file; keep that off the event loop
+        loop = asyncio.get_running_loop()
+        router = shards
+        db_name = await loop.run_in_executor(get_db_executor(), router.acquire, learner_id)
+        token = _learner.set(learner_id)
+        try:
+            with using_database(db_name):
+                await self.app(scope, receive, send)
+        finally:
+            _learner.reset(token)
+            # Releasing may close an evicted shard's pool
+            await loop.run_in_executor(get_db_executor(), router.release, learner_id)
@@ -0,0 +1,205 @@
+import asyncio
+import collections
+import concurrent.futures
+import os
+import threading
+import time
+
+from lib.db import current_db, get_async_db_connection, get_db_connection
+
+# Send review writes through one writer thread per database, committed in groups
+ENABLE_GROUP_COMMIT = os.getenv("ENABLE_GROUP_COMMIT", "false").lower() == "true"
+# Most writes committed in one transaction
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "64"))
+# How long the first write of a group waits for others to join it
+GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv("GROUP_COMMIT_MAX_DELAY_MS", "2"))
+# Seconds an idle writer thread waits before exiting; the next write starts a new one
+WRITER_IDLE_TIMEOUT = 5.0
+
+
+class _Intent:
+    __slots__ = ("func", "args", "kwargs", "future", "result", "error")
+
+    def __init__(self, func, args, kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = concurrent.futures.Future()
+        self.result = None
+        self.error = None
+
+
+class GroupCommitWriter:
+    """
+    Applies the writes for one database on a single thread, many per
+    transaction.
+
+    ``submit(func, *args)`` queues ``func(conn, *args)`` and returns a
+    future. The writer takes up to ``max_batch`` queued writes, waiting at
+    most ``max_delay_ms`` after the first for more to arrive, and runs them
+    in one ``BEGIN IMMEDIATE`` transaction, each inside its own savepoint:
+    a write that raises is rolled back alone and its future gets the
+    exception. Futures are completed only after the group has committed,
+    so a caller never reports a write that could still be lost. Writers
+    never wait on each other for the lock, and a group pays for one commit
+    (one WAL sync with ``synchronous=FULL``) instead of one per write.
+    """
+
+    def __init__(self, db_name, max_batch=GROUP_COMMIT_MAX_BATCH,
+                 max_delay_ms=GROUP_COMMIT_MAX_DELAY_MS, idle_timeout=WRITER_IDLE_TIMEOUT):
+        self.db_name = db_name
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay_ms / 1000
+        self.idle_timeout = idle_timeout
+
+        self._cond = threading.Condition()
+        self._queue = collections.deque()
+        self._thread = None
+        self._closed = False
+        self.max_queue_depth = 0
+        self.commits = 0
+        self.writes = 0
+        self.failed = 0
+        self.max_batch_size = 0
+        self.last_batch_size = 0
+
+    def submit(self, func, *args, **kwargs):
+        """Queue ``func(conn, *args, **kwargs)``; returns a concurrent.futures.Future of its result."""
+        intent = _Intent(func, args, kwargs)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Writer for {self.db_name} is closed")
+            self._queue.append(intent)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return intent.future
+
+    async def run(self, func, *args, **kwargs):
+        """Async form of submit: the result of ``func`` once its group has committed."""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._queue:
+                if self._closed or not self._cond.wait(self.idle_timeout) and not self._queue:
+                    self._thread = None
+                    return None
+            deadline = time.monotonic() + self.max_delay
+            while len(self._queue) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._commit(batch)
+
+    def _commit(self, batch):
+        # Writes whose caller gave up before they started are skipped
+        batch = [intent for intent in batch if intent.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            with get_db_connection(self.db_name) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for intent in batch:
+                    conn.execute("SAVEPOINT group_commit_write")
+                    try:
+                        intent.result = intent.func(conn, *intent.args, **intent.kwargs)
+                    except Exception as exc:
+                        intent.error = exc
+                        conn.execute("ROLLBACK TO group_commit_write")
+                    conn.execute("RELEASE group_commit_write")
+        except Exception as exc:
+            # Nothing in the group was committed
+            for intent in batch:
+                intent.future.set_exception(intent.error or exc)
+            with self._cond:
+                self.failed += len(batch)
+            return
+
+        with self._cond:
+            self.commits += 1
+            self.writes += len(batch)
+            self.failed += sum(intent.error is not None for intent in batch)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+            self.last_batch_size = len(batch)
+        for intent in batch:
+            if intent.error is not None:
+                intent.future.set_exception(intent.error)
+            else:
+                intent.future.set_result(intent.result)
+
+    def close(self):
+        """Stop accepting writes and wait for the queued ones to be committed."""
+        with self._cond:
+            self._closed = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "db_name": self.db_name,
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self.max_queue_depth,
+                "commits": self.commits,
+                "writes": self.writes,
+                "failed": self.failed,
+                "avg_batch_size": round(self.writes / self.commits, 2) if self.commits else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "last_batch_size": self.last_batch_size,
+            }
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(db_name=None):
+    """The group-commit writer for ``db_name``, by default current_db()."""
+    db_name = db_name or current_db()
+    with _writers_lock:
+        writer = _writers.get(db_name)
+        if writer is None:
+            writer = GroupCommitWriter(db_name)
+            _writers[db_name] = writer
+        return writer
+
+
+def close_writers():
+    """Commit everything queued and stop every writer."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+def writer_stats():
+    with _writers_lock:
+        writers = list(_writers.values())
+    return [writer.stats() for writer in writers]
+
+
+async def run_write(func, *args, **kwargs):
+    """
+    Run ``func(conn, *args, **kwargs)`` as one write transaction on the
+    current database and return its result once committed: through the
+    group-commit writer while ENABLE_GROUP_COMMIT is on, else on a pooled
+    connection of its own. ``func`` runs on another thread either way.
+    """
+    if ENABLE_GROUP_COMMIT:
+        return await get_writer().run(func, *args, **kwargs)
+    async with get_async_db_connection() as conn:
+        return await conn.run(func, *args, **kwargs)
@@ -1,52 +1,230 @@
+import hashlib
+import importlib.util
 import os
+import time
 from lib.db import get_db_connection
 
-MIGRATIONS_DIR = "sql/migrations"
-ROLLBACK_DIR = "sql/migrations/down"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(BASE_DIR, "sql/migrations")
+ROLLBACK_DIR = os.path.join(BASE_DIR, "sql/migrations/down")
 
-def get_applied_migrations(db_name):
-    with get_db_connection(db_name) as conn:
-        # Ensure the schema_migrations table exists
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS schema_migrations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                migration_name TEXT NOT NULL,
-                applied_at DATETIME DEFAULT (datetime('now'))
-            );
-        """)
-        rows = conn.execute("SELECT migration_name FROM schema_migrations").fetchall()
-    return {row[0] for row in rows}
-
-def apply_migrations(db_name="words.db"):
-    applied = get_applied_migrations(db_name)
-    # Sort by filename to apply in the correct sequence
-    files = sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith(".sql"))
+MIGRATION_SUFFIXES = (".sql", ".py")
+
+# Rows per chunk in MigrationContext.backfill; each chunk is its own short
+# write transaction, so API writes interleave with a long backfill
+BACKFILL_CHUNK_SIZE = int(os.getenv("MIGRATION_CHUNK_SIZE", "5000"))
+# Seconds to sleep between chunks, giving waiting writers a turn at the lock
+BACKFILL_PAUSE = float(os.getenv("MIGRATION_CHUNK_PAUSE", "0.01"))
+
+
+class MigrationContext:
+    """
+    Passed to a Python migration's ``upgrade(ctx)`` and ``downgrade(ctx)``.
+
+    A SQL migration runs as one transaction. Here every call commits on its
+    own, so the write lock is only held briefly and the API stays writable
+    while a large backfill runs. An interrupted migration is not recorded
+    and starts over on the next run, so each step must be safe to repeat
+    (``IF NOT EXISTS``, backfills that skip rows already done).
+    """
+
+    def __init__(self, db_name, name, progress=print,
+                 chunk_size=BACKFILL_CHUNK_SIZE, pause=BACKFILL_PAUSE):
+        self.db_name = db_name
+        self.name = name
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.pause = pause
+
+    def execute(self, sql, params=()):
+        """Run one statement in its own transaction."""
+        with get_db_connection(self.db_name) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(sql, params)
 
+    def executescript(self, script):
+        """Run a SQL script in one transaction, e.g. to create a table and its triggers together."""
+        with get_db_connection(self.db_name) as conn:
+            conn.executescript(f"BEGIN IMMEDIATE;\n{script}")
+
+    def backfill(self, table, sql, chunk_size=None):
+        """
+        Run ``sql`` over ``table`` one rowid range at a time, committing after
+        each chunk and reporting progress. ``sql`` picks its rows with the
+        ``:start`` (inclusive) and ``:end`` (exclusive) parameters, e.g.::
+
+            UPDATE words SET x = ... WHERE rowid >= :start AND rowid < :end AND x IS NULL
+
+        Only rows that exist when the backfill starts are visited, so install
+        whatever keeps new rows correct (trigger, default) before calling it.
+        Returns the number of rows changed.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        with get_db_connection(self.db_name) as conn:
+            low, high = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {table}").fetchone()
+        if low is None:
+            self.progress(f"  {self.name}: {table} is empty, nothing to backfill")
+            return 0
+
+        span = high - low + 1
+        changed = 0
+        started = time.perf_counter()
+        for start in range(low, high + 1, chunk_size):
+            end = min(start + chunk_size, high + 1)
+            with get_db_connection(self.db_name) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                changed += conn.execute(sql, {"start": start, "end": end}).rowcount
+            done = end - low
+            self.progress(f"  {self.name}: {table} {done}/{span} rowids ({done * 100 // span}%), "
+                          f"{changed} rows changed, {time.perf_counter() - started:.1f}s")
+            if self.pause and end <= high:
+                time.sleep(self.pause)
+        return changed
+
+
+def _ensure_migrations_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            migration_name TEXT NOT NULL,
+            applied_at DATETIME DEFAULT (datetime('now')),
+            checksum TEXT,
+            duration_ms REAL
+        );
+    """)
+    # Databases created before checksums were recorded
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(schema_migrations)")}
+    for column, kind in (("checksum", "TEXT"), ("duration_ms", "REAL")):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE schema_migrations ADD COLUMN {column} {kind}")
+
+def get_migration_history(db_name):
+    """``{migration_name: (applied_at, checksum, duration_ms)}`` for every applied migration."""
     with get_db_connection(db_name) as conn:
-        for file_name in files:
-            if file_name not in applied:
-                path = os.path.join(MIGRATIONS_DIR, file_name)
-                with open(path, "r") as sql_file:
-                    script = sql_file.read()
-                conn.executescript(script)
-                conn.execute("INSERT INTO schema_migrations (migration_name) VALUES (?)", (file_name,))
-                print(f"Applied migration: {file_name}")
-
-def rollback_migration(db_name="words.db"):
+        _ensure_migrations_table(conn)
+        rows = conn.execute(
+            "SELECT migration_name, applied_at, checksum, duration_ms FROM schema_migrations"
+        ).fetchall()
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+def get_applied_migrations(db_name):
+    return set(get_migration_history(db_name))
+
+def migration_files(migrations_dir=MIGRATIONS_DIR):
+    """SQL and Python migrations in ``migrations_dir``, in the order they apply."""
+    return sorted(
+        f for f in os.listdir(migrations_dir)
+        if f.endswith(MIGRATION_SUFFIXES) and not f.startswith("_")
+    )
+
+def file_checksum(path):
+    with open(path, "rb") as migration_file:
+        return hashlib.sha256(migration_file.read()).hexdigest()
+
+def _load_module(path):
+    name = "migration_" + os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _record(conn, file_name, checksum, duration_ms):
+    conn.execute(
+        "INSERT INTO schema_migrations (migration_name, checksum, duration_ms) VALUES (?, ?, ?)",
+        (file_name, checksum, duration_ms)
+    )
+
+def apply_migrations(db_name="words.db", migrations_dir=MIGRATIONS_DIR, progress=print):
+    """
+    Apply pending migrations in filename order.
+
+    ``NNN_name.sql`` files run as a single transaction together with their
+    schema_migrations row. ``NNN_name.py`` files define ``upgrade(ctx)``
+    (and optionally ``downgrade(ctx)``) taking a MigrationContext, and are
+    recorded once ``upgrade`` returns. Each row stores the file's SHA-256
+    and how long it took; a file that changed after it was applied is
+    reported.
+    """
+    history = get_migration_history(db_name)
+
+    for file_name in migration_files(migrations_dir):
+        path = os.path.join(migrations_dir, file_name)
+        checksum = file_checksum(path)
+        if file_name in history:
+            recorded = history[file_name][1]
+            if recorded is None:
+                with get_db_connection(db_name) as conn:
+                    conn.execute(
+                        "UPDATE schema_migrations SET checksum = ? WHERE migration_name = ?",
+                        (checksum, file_name)
+                    )
+            elif recorded != checksum:
+                progress(f"Warning: {file_name} has changed since it was applied")
+            continue
+
+        started = time.perf_counter()
+        if file_name.endswith(".py"):
+            progress(f"Applying migration: {file_name}...")
+            _load_module(path).upgrade(MigrationContext(db_name, file_name, progress))
+            duration_ms = (time.perf_counter() - started) * 1000
+            with get_db_connection(db_name) as conn:
+                _record(conn, file_name, checksum, duration_ms)
+        else:
+            with open(path, "r") as sql_file:
+                script = sql_file.read()
+            with get_db_connection(db_name) as conn:
+                conn.executescript(f"BEGIN IMMEDIATE;\n{script}")
+                duration_ms = (time.perf_counter() - started) * 1000
+                _record(conn, file_name, checksum, duration_ms)
+        progress(f"Applied migration: {file_name} ({duration_ms:.0f} ms)")
+
+def rollback_migration(db_name="words.db", migrations_dir=MIGRATIONS_DIR, progress=print):
     applied = get_applied_migrations(db_name)
+    rollback_dir = os.path.join(migrations_dir, "down")
     # Sort by filename to rollback in reverse order
     files = sorted(applied, reverse=True)
 
-    with get_db_connection(db_name) as conn:
-        for file_name in files:
-            down_file = os.path.join(ROLLBACK_DIR, file_name)
-            if os.path.exists(down_file):
-                with open(down_file, "r") as sql_file:
-                    script = sql_file.read()
-                conn.executescript(script)
+    for file_name in files:
+        path = os.path.join(migrations_dir, file_name)
+        if file_name.endswith(".py"):
+            if not os.path.exists(path):
+                continue
+            module = _load_module(path)
+            if not hasattr(module, "downgrade"):
+                continue
+            module.downgrade(MigrationContext(db_name, file_name, progress))
+            with get_db_connection(db_name) as conn:
+                conn.execute("DELETE FROM schema_migrations WHERE migration_name = ?", (file_name,))
+        else:
+            down_file = os.path.join(rollback_dir, file_name)
+            if not os.path.exists(down_file):
+                continue
+            with open(down_file, "r") as sql_file:
+                script = sql_file.read()
+            with get_db_connection(db_name) as conn:
+                conn.executescript(f"BEGIN IMMEDIATE;\n{script}")
                 conn.execute("DELETE FROM schema_migrations WHERE migration_name = ?", (file_name,))
-                print(f"Rolled back migration: {file_name}")
-                break  # Rollback one migration at a time
+        progress(f"Rolled back migration: {file_name}")
+        break  # Rollback one migration at a time
+
+def migration_status(db_name="words.db", migrations_dir=MIGRATIONS_DIR):
+    """One ``(name, state, applied_at, duration_ms)`` per migration; state is applied, changed, pending or missing."""
+    history = get_migration_history(db_name)
+    files = migration_files(migrations_dir)
+    status = []
+    for file_name in sorted(set(files) | set(history)):
+        if file_name not in history:
+            status.append((file_name, "pending", None, None))
+            continue
+        applied_at, checksum, duration_ms = history[file_name]
+        if file_name not in files:
+            state = "missing"
+        elif checksum is not None and checksum != file_checksum(os.path.join(migrations_dir, file_name)):
+            state = "changed"
+        else:
+            state = "applied"
+        status.append((file_name, state, applied_at, duration_ms))
+    return status
 
 if __name__ == "__main__":
     import sys
@@ -54,7 +232,12 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         if sys.argv[1] == "rollback":
             rollback_migration(db_name)
-        else:
-            db_name = sys.argv[1]
+            sys.exit()
+        if sys.argv[1] == "status":
+            for name, state, applied_at, duration_ms in migration_status(db_name):
+                duration = f"{duration_ms:.0f} ms" if duration_ms is not None else ""
+                print(f"{name:<45} {state:<8} {applied_at or '':<20} {duration}")
+            sys.exit()
+        db_name = sys.argv[1]
     apply_migrations(db_name)
-    print("Migration process completed.") 
\ No newline at end of file
+    print("Migration process completed.")
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
+from datetime import datetime
 
 class Word(BaseModel):
     id: int
@@ -9,6 +10,11 @@ class Word(BaseModel):
     correct_count: int
     wrong_count: int
 
+class WordSearchResult(Word):
+    score: float
+    jamaican_patois_highlight: str
+    english_highlight: str
+
 class Group(BaseModel):
     id: int
     name: str
@@ -27,6 +33,10 @@ class PaginatedWords(BaseModel):
     words: List[Word]
     pagination: dict
 
+class PaginatedWordSearch(BaseModel):
+    words: List[WordSearchResult]
+    pagination: dict
+
 class PaginatedGroups(BaseModel):
     groups: List[Group]
     pagination: dict
@@ -75,4 +85,63 @@ class QuickStats(BaseModel):
 
 class PaginatedStudyActivities(BaseModel):
     study_activities: List[StudyActivity]
-    pagination: dict 
\ No newline at end of file
+    pagination: dict
+
+class DailyActivity(BaseModel):
+    day: str
+    sessions: int
+    reviews: int
+    correct: int
+    accuracy_rate: float
+
+class ReviewCreate(BaseModel):
+    word_id: int
+    correct: bool
+    answered_at: Optional[datetime] = None
+
+class ReviewResult(BaseModel):
+    word_id: int
+    status: str  # "created" or "error"
+    review_id: Optional[int] = None
+    created_at: Optional[str] = None
+    detail: Optional[str] = None
+
+class BatchReviewResponse(BaseModel):
+    study_session_id: int
+    created: int
+    failed: int
+    results: List[ReviewResult]
+
+class WordSync(BaseModel):
+    id: Optional[int] = None
+    jamaican_patois: str
+    english: str
+    parts: Optional[dict] = None
+
+class GroupSync(BaseModel):
+    id: Optional[int] = None
+    name: str
+
+class WordGroupSync(BaseModel):
+    word_id: int
+    group_id: int
+
+class SyncResult(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    skipped: int
+
+class ScheduledWord(BaseModel):
+    id: int
+    jamaican_patois: str
+    english: str
+    parts: Optional[dict]
+    due_at: Optional[str]  # None for words never reviewed
+    ease_factor: float
+    interval_hours: float
+    repetitions: int
+
+class NextWords(BaseModel):
+    study_session_id: int
+    words: List[ScheduledWord]
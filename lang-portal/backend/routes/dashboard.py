@@ -1,32 +1,62 @@
-from fastapi import APIRouter, HTTPException
-from lib.db import get_db_connection
-from models import StudySession, StudyProgress, QuickStats
+from fastapi import APIRouter, Depends, HTTPException, Query
+from lib.db import get_async_db_connection
+from lib.http_cache import CachePolicy
+from lib.cache import aggregate_cache, cached_aggregate
+from lib.replica import analytics_db, analytics_snapshot, pin_analytics_db
+from models import StudySession, StudyProgress, QuickStats, DailyActivity
+from typing import List
 from datetime import datetime, timedelta
 
-router = APIRouter()
+# Analytics-only: every route reads from the replica snapshot when it is
+# enabled, chosen once per request
+router = APIRouter(dependencies=[Depends(pin_analytics_db)])
+cache_policy = CachePolicy("dashboard", db=analytics_db)
 
-@router.get("/dashboard/last_study_session", response_model=StudySession, tags=["Dashboard"])
-def get_last_study_session():
+# Fixed study time credited per session until sessions record an end time
+SESSION_MINUTES = 15
+
+def get_streak_days(conn, today):
+    """
+    Count consecutive days with at least one study session, ending today.
+
+    Rows of daily_activity form an unbroken run back from today exactly
+    while each day's distance from today equals its rank, so the streak is
+    read from the small rollup table with no Python-side date walking and
+    no upper limit on its length.
+    """
+    return conn.execute("""
+        SELECT COUNT(*)
+        FROM (
+            SELECT julianday(:today) - julianday(day) AS age,
+                   ROW_NUMBER() OVER (ORDER BY day DESC) - 1 AS position
+            FROM daily_activity
+            WHERE sessions > 0 AND day <= :today
+        )
+        WHERE age = position
+    """, {"today": today.isoformat()}).fetchone()[0]
+
+@router.get("/dashboard/last_study_session", response_model=StudySession, tags=["Dashboard"],
+            dependencies=[cache_policy.depends_on("study_sessions", "study_activities", "groups", "word_review_items")])
+@cached_aggregate("last_study_session", snapshot=analytics_snapshot)
+async def get_last_study_session():
     """
     Retrieve information about the most recent study session.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection(analytics_db()) as conn:
         query = """
         SELECT ss.id,
                sa.name AS activity_name,
                g.name AS group_name,
                ss.created_at AS start_time,
                NULL AS end_time,
-               (SELECT COUNT(*) FROM word_review_items wri 
-                WHERE wri.study_session_id = ss.id) as review_items_count
+               ss.review_items_count
         FROM study_sessions ss
         LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
         LEFT JOIN groups g ON g.id = ss.group_id
         ORDER BY ss.created_at DESC
         LIMIT 1
         """
-        cursor = conn.execute(query)
-        row = cursor.fetchone()
+        row = await conn.fetchone(query)
         
         if not row:
             raise HTTPException(
@@ -46,20 +76,22 @@ def get_last_study_session():
         
         return study_session 
 
-@router.get("/dashboard/study_progress", response_model=StudyProgress, tags=["Dashboard"])
-def get_study_progress():
+@router.get("/dashboard/study_progress", response_model=StudyProgress, tags=["Dashboard"],
+            dependencies=[cache_policy.depends_on("word_stats", "daily_activity", "word_reviews", "study_sessions", "groups")])
+@cached_aggregate("study_progress", snapshot=analytics_snapshot)
+async def get_study_progress():
     """
     Retrieve overall study progress statistics.
     """
-    with get_db_connection() as conn:
-        # Get overall review statistics
-        review_stats = conn.execute("""
+    async with get_async_db_connection(analytics_db()) as conn:
+        # Get overall review statistics from the per-word counters
+        review_stats = await conn.fetchone("""
             SELECT 
-                COUNT(*) as total_reviews,
-                SUM(CASE WHEN correct THEN 1 ELSE 0 END) as correct_reviews,
-                SUM(CASE WHEN NOT correct THEN 1 ELSE 0 END) as incorrect_reviews
-            FROM word_reviews
-        """).fetchone()
+                SUM(correct_count + wrong_count) as total_reviews,
+                SUM(correct_count) as correct_reviews,
+                SUM(wrong_count) as incorrect_reviews
+            FROM word_stats
+        """)
 
         total_reviews = review_stats[0] or 0
         correct_reviews = review_stats[1] or 0
@@ -68,19 +100,17 @@ def get_study_progress():
         # Calculate accuracy rate
         accuracy_rate = (correct_reviews / total_reviews * 100) if total_reviews > 0 else 0
 
-        # Get total study sessions
-        total_sessions = conn.execute(
-            "SELECT COUNT(*) FROM study_sessions"
-        ).fetchone()[0]
+        # Get total study sessions from the daily rollup
+        total_sessions = (await conn.fetchone(
+            "SELECT COALESCE(SUM(sessions), 0) FROM daily_activity"
+        ))[0]
 
         # Calculate total study time (using session durations)
         # For now, we'll use a fixed duration of 15 minutes per session
-        total_minutes = conn.execute("""
-            SELECT COUNT(*) * 15 FROM study_sessions
-        """).fetchone()[0]
+        total_minutes = total_sessions * SESSION_MINUTES
 
         # Get words reviewed by group
-        words_by_group = conn.execute("""
+        words_by_group = await conn.fetchall("""
             SELECT 
                 g.id,
                 g.name,
@@ -92,7 +122,7 @@ def get_study_progress():
             JOIN groups g ON g.id = ss.group_id
             GROUP BY g.id, g.name
             ORDER BY g.name
-        """).fetchall()
+        """)
 
         words_by_group_list = [
             {
@@ -116,32 +146,34 @@ def get_study_progress():
             words_by_group=words_by_group_list
         ).model_dump() 
 
-@router.get("/dashboard/quick-stats", response_model=QuickStats, tags=["Dashboard"])
-def get_quick_stats():
+@router.get("/dashboard/quick-stats", response_model=QuickStats, tags=["Dashboard"],
+            dependencies=[cache_policy.depends_on("words", "word_stats", "daily_activity", "word_reviews", daily=True)])
+@cached_aggregate("quick_stats", snapshot=analytics_snapshot)
+async def get_quick_stats():
     """
     Retrieve quick overview statistics for the dashboard.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection(analytics_db()) as conn:
         # Get total words count
-        total_words = conn.execute(
+        total_words = (await conn.fetchone(
             "SELECT COUNT(*) FROM words"
-        ).fetchone()[0]
+        ))[0]
 
         # Get count of words with at least one correct review
-        words_learned = conn.execute("""
-            SELECT COUNT(DISTINCT w.id)
-            FROM words w
-            JOIN word_reviews wr ON wr.word_id = w.id
-            WHERE wr.correct = TRUE
-        """).fetchone()[0]
+        words_learned = (await conn.fetchone("""
+            SELECT COUNT(*)
+            FROM word_stats ws
+            JOIN words w ON w.id = ws.word_id
+            WHERE ws.correct_count > 0
+        """))[0]
 
         # Calculate total study time (15 minutes per session for now)
-        total_minutes = conn.execute("""
-            SELECT COUNT(*) * 15 FROM study_sessions
-        """).fetchone()[0]
+        total_minutes = (await conn.fetchone(
+            "SELECT COALESCE(SUM(sessions), 0) FROM daily_activity"
+        ))[0] * SESSION_MINUTES
 
         # Get accuracy rate for last 50 reviews
-        recent_stats = conn.execute("""
+        recent_stats = await conn.fetchone("""
             SELECT 
                 COALESCE(
                     AVG(CASE WHEN correct THEN 100.0 ELSE 0.0 END),
@@ -153,35 +185,11 @@ def get_quick_stats():
                 ORDER BY created_at DESC
                 LIMIT 50
             ) recent
-        """).fetchone()
+        """)
         recent_accuracy = recent_stats[0]
 
         # Calculate study streak
-        today = datetime.now().date()
-        streak = 0
-        
-        # Get last 30 days of study sessions
-        study_dates = conn.execute("""
-            SELECT DISTINCT date(created_at) as study_date
-            FROM study_sessions
-            WHERE date(created_at) <= date('now')
-            ORDER BY study_date DESC
-            LIMIT 30
-        """).fetchall()
-        
-        # Convert to list of dates
-        study_dates = [datetime.strptime(row[0], '%Y-%m-%d').date() for row in study_dates]
-        
-        if study_dates:
-            current_date = study_dates[0]
-            if current_date == today:
-                streak = 1
-                for prev_date in study_dates[1:]:
-                    if current_date - prev_date == timedelta(days=1):
-                        streak += 1
-                        current_date = prev_date
-                    else:
-                        break
+        streak = await conn.run(get_streak_days, datetime.now().date())
 
         return QuickStats(
             total_words=total_words,
@@ -189,4 +197,40 @@ def get_quick_stats():
             total_study_time_minutes=total_minutes,
             recent_accuracy=recent_accuracy,
             streak_days=streak
-        ).model_dump() 
\ No newline at end of file
+        ).model_dump()
+
+@router.get("/dashboard/cache-stats", tags=["Dashboard"])
+async def get_cache_stats():
+    """
+    Retrieve hit/miss metrics for the dashboard aggregate cache.
+    """
+    return aggregate_cache.stats()
+
+@router.get("/dashboard/daily_activity", response_model=List[DailyActivity], tags=["Dashboard"],
+            dependencies=[cache_policy.depends_on("daily_activity", daily=True)])
+async def get_daily_activity(days: int = Query(30, ge=1, le=366)):
+    """
+    Retrieve per-day study totals for charting, oldest first.
+
+    - **days**: Number of days to return, ending today (default: 30)
+    """
+    today = datetime.now().date()
+    since = today - timedelta(days=days - 1)
+    async with get_async_db_connection(analytics_db()) as conn:
+        rows = await conn.fetchall("""
+            SELECT day, sessions, reviews, correct
+            FROM daily_activity
+            WHERE day BETWEEN ? AND ?
+            ORDER BY day
+        """, (since.isoformat(), today.isoformat()))
+
+    return [
+        {
+            "day": row[0],
+            "sessions": row[1],
+            "reviews": row[2],
+            "correct": row[3],
+            "accuracy_rate": (row[3] / row[2] * 100) if row[2] > 0 else 0
+        }
+        for row in rows
+    ]
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, HTTPException
+from lib import profiling, replica, tenancy, writer
+from lib.cache import page_totals
+from lib.db import pool_stats
+
+router = APIRouter()
+
+def _require_profiling():
+    if not profiling.ENABLE_SQL_PROFILING:
+        raise HTTPException(
+            status_code=403,
+            detail="SQL profiling is disabled; set ENABLE_SQL_PROFILING=true"
+        )
+
+@router.get("/_debug/metrics", tags=["Debug"])
+async def get_metrics(top: int = 20):
+    """
+    SQL profile aggregated per route since startup (or the last reset).
+    Only available when ENABLE_SQL_PROFILING is set.
+
+    - **top**: How many statements to list in `top_statements`, by total time.
+
+    Each route reports its request count, average and maximum latency,
+    statements and SQL time per request, and its slowest statement. When
+    SQL_PROFILING_EXPLAIN is set, that statement's query plan is included.
+    `page_totals` reports how often list endpoints reused a cached row count.
+    With ENABLE_READ_REPLICA on, `replica` reports the snapshot's age and
+    refresh history. With ENABLE_TENANCY on, `shards` reports how many
+    learner databases are open and how often one was reopened or evicted.
+    With ENABLE_GROUP_COMMIT on, `writers` reports each database's write
+    queue depth and commit group sizes.
+    """
+    _require_profiling()
+    return {
+        **profiling.route_metrics.snapshot(top),
+        "pools": pool_stats(),
+        "page_totals": page_totals.stats(),
+        "replica": replica.replica.stats() if replica.ENABLE_READ_REPLICA else None,
+        "shards": tenancy.shards.stats() if tenancy.ENABLE_TENANCY else None,
+        "writers": writer.writer_stats() if writer.ENABLE_GROUP_COMMIT else None,
+    }
+
+@router.delete("/_debug/metrics", tags=["Debug"])
+async def reset_metrics():
+    """
+    Clear the aggregated SQL profile.
+    """
+    _require_profiling()
+    profiling.route_metrics.clear()
+    return {"message": "Metrics cleared"}
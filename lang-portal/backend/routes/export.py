@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from lib.export import MEDIA_TYPES, parquet_available, stream_export
+
+router = APIRouter()
+
+REVIEW_COLUMNS = [
+    ("id", "int"), ("word_id", "int"), ("jamaican_patois", "str"), ("english", "str"),
+    ("study_session_id", "int"), ("group_id", "int"), ("study_activity_id", "int"),
+    ("correct", "bool"), ("created_at", "str"),
+]
+
+STUDY_SESSION_COLUMNS = [
+    ("id", "int"), ("group_id", "int"), ("group_name", "str"),
+    ("study_activity_id", "int"), ("activity_name", "str"),
+    ("created_at", "str"), ("review_count", "int"),
+]
+
+FORMAT_PATTERN = "^(ndjson|csv|parquet)$"
+
+def _filters(column, group_column, start, end, group_id):
+    """WHERE conditions and parameters for the shared date range and group filters."""
+    if start and end and end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    conditions, params = [], []
+    if start:
+        conditions.append(f"{column} >= ?")
+        params.append(start.isoformat())
+    if end:
+        # end is inclusive; compare against the following midnight
+        conditions.append(f"{column} < ?")
+        params.append((end + timedelta(days=1)).isoformat())
+    if group_id is not None:
+        conditions.append(f"{group_column} = ?")
+        params.append(group_id)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, tuple(params)
+
+def _export_response(name, sql, params, columns, format):
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    return StreamingResponse(
+        stream_export(sql, params, columns, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
+@router.get("/export/reviews", tags=["Export"])
+async def export_reviews(format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+                         start: date = Query(None), end: date = Query(None),
+                         group_id: int = Query(None)):
+    """
+    Stream the full word review history.
+
+    - **format**: `ndjson` (default), `csv`, or `parquet` (requires pyarrow).
+    - **start**, **end**: Inclusive date range on the review time.
+    - **group_id**: Only reviews from study sessions of this group.
+
+    Rows are read in batches from a single snapshot and sent as they are
+    encoded, ordered by review time.
+    """
+    where, params = _filters("wr.created_at", "ss.group_id", start, end, group_id)
+    # LEFT JOIN keeps reviews whose session is gone and keeps word_reviews as
+    # the outer loop, so the ORDER BY is served by idx_word_reviews_created_at
+    query = """
+    SELECT wr.id, wr.word_id, w.jamaican_patois, w.english,
+           wr.study_session_id, ss.group_id, ss.study_activity_id,
+           wr.correct, wr.created_at
+    FROM word_reviews wr
+    LEFT JOIN study_sessions ss ON ss.id = wr.study_session_id
+    LEFT JOIN words w ON w.id = wr.word_id
+    """
+    sql = query + where + " ORDER BY wr.created_at, wr.id"
+    return _export_response("reviews", sql, params, REVIEW_COLUMNS, format)
+
+@router.get("/export/study_sessions", tags=["Export"])
+async def export_study_sessions(format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+                                start: date = Query(None), end: date = Query(None),
+                                group_id: int = Query(None)):
+    """
+    Stream every study session with its review count.
+
+    - **format**: `ndjson` (default), `csv`, or `parquet` (requires pyarrow).
+    - **start**, **end**: Inclusive date range on the session start time.
+    - **group_id**: Only sessions of this group.
+    """
+    where, params = _filters("ss.created_at", "ss.group_id", start, end, group_id)
+    query = """
+    SELECT ss.id, ss.group_id, g.name, ss.study_activity_id, sa.name, ss.created_at,
+           (SELECT COUNT(*) FROM word_reviews wr WHERE wr.study_session_id = ss.id)
+    FROM study_sessions ss
+    LEFT JOIN groups g ON g.id = ss.group_id
+    LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
+    """
+    sql = query + where + " ORDER BY ss.created_at, ss.id"
+    return _export_response("study_sessions", sql, params, STUDY_SESSION_COLUMNS, format)
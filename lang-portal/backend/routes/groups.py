@@ -1,29 +1,39 @@
-from fastapi import APIRouter, HTTPException, Query, Path
-from lib.db import get_db_connection
-from utils import paginate
-from models import PaginatedGroups, Group, PaginatedWords, Word, PaginatedStudySessions, StudySession
-import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
+from lib.db import get_async_db_connection
+from lib.http_cache import CachePolicy
+from lib.json_response import words_page_response
+from lib.bulk import read_sync_items, validate_items, upsert_groups
+from lib.cache import bump_data_version
+from lib.tenancy import require_shared_database
+from utils import paginate, word_filters
+from models import PaginatedGroups, Group, PaginatedWords, PaginatedStudySessions, StudySession, GroupSync, SyncResult
 
 router = APIRouter()
+cache_policy = CachePolicy("groups")
 
-@router.get("/groups", response_model=PaginatedGroups, tags=["Groups"])
-def get_groups(page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100)):
+@router.get("/groups", response_model=PaginatedGroups, tags=["Groups"],
+            dependencies=[cache_policy.depends_on("groups", "word_groups")])
+async def get_groups(page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100),
+               cursor: str = Query(None)):
     """
     Retrieve a paginated list of groups.
 
     - **page**: The page number to retrieve.
     - **page_size**: The number of items per page.
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         # Query to get groups with word count
         query = """
-        SELECT g.id, g.name,
-               (SELECT COUNT(*) FROM word_groups wg WHERE wg.group_id = g.id) as word_count
+        SELECT g.id, g.name, g.word_count
         FROM groups g
+        WHERE {keyset}
         """
-        paginated_query = paginate(query, page, page_size)
-        cursor = conn.execute(paginated_query)
-        rows = cursor.fetchall()
+        rows, pagination = await conn.run(
+            paginate, query, (), ("g.id",), lambda row: (row[0],),
+            page, page_size, cursor,
+            count_sql="SELECT COUNT(*) FROM groups", count_tables=("groups",)
+        )
         if not rows:
             raise HTTPException(status_code=404, detail="No groups found")
         
@@ -37,36 +47,26 @@ def get_groups(page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=1
             ).model_dump() for row in rows
         ]
 
-        # Calculate total items and total pages
-        total_items = conn.execute("SELECT COUNT(*) FROM groups").fetchone()[0]
-        total_pages = (total_items + page_size - 1) // page_size
-        
         return {
             "groups": groups,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-                "items_per_page": page_size
-            }
+            "pagination": pagination
         }
 
-@router.get("/groups/{group_id}", response_model=Group, tags=["Groups"])
-def get_group(group_id: int = Path(..., title="The ID of the group to retrieve")):
+@router.get("/groups/{group_id}", response_model=Group, tags=["Groups"],
+            dependencies=[cache_policy.depends_on("groups", "word_groups")])
+async def get_group(group_id: int = Path(..., title="The ID of the group to retrieve")):
     """
     Retrieve a group by its ID.
 
     - **group_id**: The ID of the group to retrieve.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         query = """
-        SELECT g.id, g.name,
-               (SELECT COUNT(*) FROM word_groups wg WHERE wg.group_id = g.id) as word_count
+        SELECT g.id, g.name, g.word_count
         FROM groups g
         WHERE g.id = ?
         """
-        cursor = conn.execute(query, (group_id,))
-        row = cursor.fetchone()
+        row = await conn.fetchone(query, (group_id,))
         if not row:
             raise HTTPException(status_code=404, detail="Group not found")
         
@@ -80,71 +80,70 @@ def get_group(group_id: int = Path(..., title="The ID of the group to retrieve")
         
         return group
 
-@router.get("/groups/{group_id}/words", response_model=PaginatedWords, tags=["Groups"])
-def get_group_words(group_id: int = Path(..., title="The ID of the group to retrieve words for"),
-                    page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100)):
+@router.get("/groups/{group_id}/words", response_model=PaginatedWords, tags=["Groups"],
+            dependencies=[cache_policy.depends_on("words", "word_groups", "word_stats")])
+async def get_group_words(response: Response, group_id: int = Path(..., title="The ID of the group to retrieve words for"),
+                    page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100),
+                    cursor: str = Query(None), part_type: str = Query(None, alias="type"),
+                    usage: str = Query(None)):
     """
     Retrieve a paginated list of words for a specific group.
 
     - **group_id**: The ID of the group to retrieve words for.
     - **page**: The page number to retrieve.
     - **page_size**: The number of items per page.
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`.
+    - **type**: Only words whose `parts.type` equals this, e.g. `noun`.
+    - **usage**: Only words whose `parts.usage` equals this.
     """
-    with get_db_connection() as conn:
+    filters, filter_params = word_filters(part_type, usage)
+    # Counted over the listing's own join, not groups.word_count: word_groups
+    # allows duplicate links and links to deleted words, which word_count
+    # includes but the listing does not
+    count_sql = """
+    SELECT COUNT(DISTINCT w.id)
+    FROM words w
+    JOIN word_groups wg ON w.id = wg.word_id
+    WHERE wg.group_id = ? AND {filters}
+    """.replace("{filters}", filters)
+
+    async with get_async_db_connection() as conn:
         # Query to get words for a specific group
         query = """
-        SELECT w.id, w.jamaican_patois, w.english, w.parts,
-               COALESCE(SUM(CASE WHEN wr.correct THEN 1 ELSE 0 END), 0) AS correct_count,
-               COALESCE(SUM(CASE WHEN NOT wr.correct THEN 1 ELSE 0 END), 0) AS wrong_count
+        SELECT w.id, w.jamaican_patois, w.english,
+               CASE WHEN json_valid(w.parts) AND json_type(w.parts) = 'object' THEN w.parts END AS parts,
+               COALESCE(ws.correct_count, 0) AS correct_count,
+               COALESCE(ws.wrong_count, 0) AS wrong_count
         FROM words w
         JOIN word_groups wg ON w.id = wg.word_id
-        LEFT JOIN word_reviews wr ON w.id = wr.word_id
-        WHERE wg.group_id = ?
+        LEFT JOIN word_stats ws ON ws.word_id = w.id
+        WHERE wg.group_id = ? AND {filters} AND {keyset}
         GROUP BY w.id
-        """
-        paginated_query = paginate(query, page, page_size)
-        cursor = conn.execute(paginated_query, (group_id,))
-        rows = cursor.fetchall()
+        """.replace("{filters}", filters)
+        rows, pagination = await conn.run(
+            paginate, query, (group_id, *filter_params), ("w.id",), lambda row: (row[0],),
+            page, page_size, cursor, count_sql=count_sql,
+            count_params=(group_id, *filter_params), count_tables=("words", "word_groups")
+        )
         if not rows:
             raise HTTPException(status_code=404, detail="No words found for this group")
-        
-        # Convert rows to list of Word models and then to dictionaries
-        words = [
-            Word(
-                id=row[0],
-                jamaican_patois=row[1],
-                english=row[2],
-                parts=json.loads(row[3]) if row[3] else None,
-                correct_count=row[4],
-                wrong_count=row[5]
-            ).model_dump() for row in rows
-        ]
 
-        # Calculate total items and total pages
-        total_items = conn.execute("SELECT COUNT(*) FROM word_groups WHERE group_id = ?", (group_id,)).fetchone()[0]
-        total_pages = (total_items + page_size - 1) // page_size
-        
-        return {
-            "words": words,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-                "items_per_page": page_size
-            }
-        }
+        return words_page_response(rows, pagination, response.headers)
 
-@router.get("/groups/{group_id}/study_sessions", response_model=PaginatedStudySessions, tags=["Groups"])
-def get_group_study_sessions(group_id: int = Path(..., title="The ID of the group to retrieve study sessions for"),
-                             page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100)):
+@router.get("/groups/{group_id}/study_sessions", response_model=PaginatedStudySessions, tags=["Groups"],
+            dependencies=[cache_policy.depends_on("study_sessions", "study_activities", "groups", "word_review_items")])
+async def get_group_study_sessions(group_id: int = Path(..., title="The ID of the group to retrieve study sessions for"),
+                             page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100),
+                             cursor: str = Query(None)):
     """
     Retrieve a paginated list of study sessions for a specific group.
 
     - **group_id**: The ID of the group to retrieve study sessions for.
     - **page**: The page number to retrieve.
     - **page_size**: The number of items per page.
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         # Query to get study sessions for a specific group
         query = """
         SELECT ss.id,
@@ -152,15 +151,18 @@ def get_group_study_sessions(group_id: int = Path(..., title="The ID of the grou
                g.name AS group_name,
                ss.created_at AS start_time,
                NULL AS end_time,  -- or if you store an end_time, select it
-               (SELECT COUNT(*) FROM word_review_items wri WHERE wri.study_session_id = ss.id) as review_items_count
+               ss.review_items_count
         FROM study_sessions ss
         LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
         LEFT JOIN groups g ON g.id = ss.group_id
-        WHERE ss.group_id = ?
+        WHERE ss.group_id = ? AND {keyset}
         """
-        paginated_query = paginate(query, page, page_size)
-        cursor = conn.execute(paginated_query, (group_id,))
-        rows = cursor.fetchall()
+        rows, pagination = await conn.run(
+            paginate, query, (group_id,), ("ss.id",), lambda row: (row[0],),
+            page, page_size, cursor,
+            count_sql="SELECT COUNT(*) FROM study_sessions WHERE group_id = ?", count_params=(group_id,),
+            count_tables=("study_sessions",)
+        )
         if not rows:
             raise HTTPException(status_code=404, detail="No study sessions found for this group")
         
@@ -176,16 +178,26 @@ def get_group_study_sessions(group_id: int = Path(..., title="The ID of the grou
             ).model_dump() for row in rows
         ]
 
-        # Calculate total items and total pages
-        total_items = conn.execute("SELECT COUNT(*) FROM study_sessions WHERE group_id = ?", (group_id,)).fetchone()[0]
-        total_pages = (total_items + page_size - 1) // page_size
-        
         return {
             "study_sessions": study_sessions,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-                "items_per_page": page_size
-            }
-        } 
\ No newline at end of file
+            "pagination": pagination
+        }
+
+@router.post("/groups/sync", response_model=SyncResult, tags=["Groups"],
+             dependencies=[Depends(require_shared_database)])
+async def sync_groups(request: Request):
+    """
+    Bulk upsert groups in one transaction.
+
+    - **groups**: `{"groups": [{id?, name}]}`, or NDJSON with one group per line,
+      optionally gzip-compressed.
+
+    Groups with an `id` update that row; others match on `name`.
+    """
+    groups = validate_items(GroupSync, await read_sync_items(request, "groups"))
+    async with get_async_db_connection() as conn:
+        result = await conn.run(upsert_groups, groups)
+
+    if result["inserted"] or result["updated"]:
+        bump_data_version()
+    return result
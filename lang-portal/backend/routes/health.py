@@ -0,0 +1,16 @@
+from fastapi import APIRouter, HTTPException
+from lib.db import get_async_db_connection
+
+router = APIRouter()
+
+@router.get("/health", tags=["Health"])
+async def health():
+    """
+    Report whether the API can reach its database.
+    """
+    try:
+        async with get_async_db_connection() as conn:
+            await conn.fetchone("SELECT 1")
+    except Exception:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    return {"status": "ok"}
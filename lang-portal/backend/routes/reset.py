@@ -1,5 +1,10 @@
+import asyncio
+import contextvars
 from fastapi import APIRouter, HTTPException
-from lib.db import get_db_connection
+from lib.db import get_async_db_connection, get_db_connection, get_db_executor
+from lib.cache import bump_data_version
+from lib import tenancy
+from template_db import clone_database
 import os
 
 router = APIRouter()
@@ -7,30 +12,58 @@ router = APIRouter()
 # Only enable these endpoints in development/testing
 ENABLE_RESET = os.getenv("ENABLE_RESET", "false").lower() == "true"
 
+def _restore_template(seeded):
+    """
+    Replace the database with a clone of the schema-only or seeded template.
+
+    User settings are carried over, and every table_versions entry moves
+    past its old value, so ETags issued before the reset never match again.
+    A learner's request rebuilds only that learner's shard.
+    """
+    with get_db_connection() as conn:
+        versions = conn.execute("SELECT table_name, version FROM table_versions").fetchall()
+        cursor = conn.execute("SELECT * FROM user_settings")
+        settings_columns = [column[0] for column in cursor.description]
+        settings = cursor.fetchall()
+
+    def carry_over(template):
+        if settings:
+            placeholders = ", ".join("?" * len(settings_columns))
+            template.executemany(
+                f"INSERT OR REPLACE INTO user_settings ({', '.join(settings_columns)}) VALUES ({placeholders})",
+                settings
+            )
+        template.executemany(
+            "UPDATE table_versions SET version = MAX(version, ?) + 1 WHERE table_name = ?",
+            [(version, table) for table, version in versions]
+        )
+
+    learner_id = tenancy.current_learner()
+    if learner_id is not None:
+        tenancy.shards.create(learner_id, seeded=seeded, prepare=carry_over)
+    else:
+        clone_database(seeded=seeded, prepare=carry_over)
+
 @router.post("/reset/all", tags=["Reset"])
 async def reset_all_data():
     """
     Reset all data in the database. Only available in development/testing.
+
+    The database is restored from the schema-only template, which also
+    resets auto-increment counters; user settings are kept.
     """
     if not ENABLE_RESET:
         raise HTTPException(
             status_code=403,
             detail="Reset endpoints are disabled in production"
         )
-    
-    with get_db_connection() as conn:
-        # Delete data in reverse order of dependencies
-        conn.execute("DELETE FROM word_reviews")
-        conn.execute("DELETE FROM word_review_items")
-        conn.execute("DELETE FROM study_sessions")
-        conn.execute("DELETE FROM study_activities")
-        conn.execute("DELETE FROM words")
-        conn.execute("DELETE FROM groups")
-        
-        # Reset auto-increment counters
-        conn.execute("DELETE FROM sqlite_sequence")
-        
-        return {"message": "All data has been reset"}
+
+    loop = asyncio.get_running_loop()
+    # In the request's context, so it restores the database the request is routed to
+    await loop.run_in_executor(get_db_executor(), contextvars.copy_context().run, _restore_template, False)
+
+    bump_data_version()
+    return {"message": "All data has been reset"}
 
 @router.post("/reset/study-data", tags=["Reset"])
 async def reset_study_data():
@@ -43,15 +76,21 @@ async def reset_study_data():
             detail="Reset endpoints are disabled in production"
         )
     
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         # Delete study-related data
-        conn.execute("DELETE FROM word_reviews")
-        conn.execute("DELETE FROM word_review_items")
-        conn.execute("DELETE FROM study_sessions")
-        conn.execute("DELETE FROM study_activities")
+        await conn.execute("DELETE FROM word_reviews")
+        await conn.execute("DELETE FROM word_review_items")
+        await conn.execute("DELETE FROM study_sessions")
+        await conn.execute("DELETE FROM study_activities")
+
+        # Then the tables their triggers maintain, so nothing the deletes
+        # above wrote back into them is left behind
+        await conn.execute("DELETE FROM word_stats")
+        await conn.execute("DELETE FROM word_schedule")
+        await conn.execute("DELETE FROM daily_activity")
         
         # Reset auto-increment counters for affected tables
-        conn.execute("""
+        await conn.execute("""
             DELETE FROM sqlite_sequence 
             WHERE name IN (
                 'word_reviews', 
@@ -60,70 +99,26 @@ async def reset_study_data():
                 'study_activities'
             )
         """)
-        
-        return {"message": "Study data has been reset"}
+
+    bump_data_version()
+    return {"message": "Study data has been reset"}
 
 @router.post("/reset/seed", tags=["Reset"])
 async def seed_test_data():
     """
-    Seed the database with test data. Only available in development/testing.
+    Replace the database with the seed data. Only available in development/testing.
+
+    The database is restored from the seeded template (the schema plus the
+    `seed/` files); user settings are kept.
     """
     if not ENABLE_RESET:
         raise HTTPException(
             status_code=403,
             detail="Reset endpoints are disabled in production"
         )
-    
-    with get_db_connection() as conn:
-        # Create test groups
-        conn.execute("""
-            INSERT INTO groups (name, description) VALUES 
-            ('Beginner Patois', 'Basic vocabulary and phrases'),
-            ('Intermediate Patois', 'More complex expressions'),
-            ('Advanced Patois', 'Advanced language concepts')
-        """)
-        
-        # Create test words
-        conn.execute("""
-            INSERT INTO words (jamaican_patois, english, parts, group_id) VALUES 
-            ('mi', 'me/my', '{"type":"pronoun","usage":"subject"}', 1),
-            ('yuh', 'you', '{"type":"pronoun","usage":"subject"}', 1),
-            ('dem', 'them/they', '{"type":"pronoun","usage":"subject"}', 1),
-            ('nyam', 'eat', '{"type":"verb","usage":"action"}', 2),
-            ('gwaan', 'go on/continue', '{"type":"verb","usage":"action"}', 2)
-        """)
-        
-        # Create test study activities
-        conn.execute("""
-            INSERT INTO study_activities (name, group_id, created_at) VALUES 
-            ('Vocabulary Review', 1, datetime('now')),
-            ('Grammar Practice', 2, datetime('now'))
-        """)
-        
-        # Create test study sessions
-        conn.execute("""
-            INSERT INTO study_sessions (study_activity_id, group_id, created_at) VALUES 
-            (1, 1, datetime('now')),
-            (2, 2, datetime('now'))
-        """)
-        
-        # Add words to review items
-        conn.execute("""
-            INSERT INTO word_review_items (study_session_id, word_id) 
-            SELECT 1, id FROM words WHERE group_id = 1
-            UNION
-            SELECT 2, id FROM words WHERE group_id = 2
-        """)
-        
-        # Add some word reviews
-        conn.execute("""
-            INSERT INTO word_reviews (word_id, study_session_id, correct, created_at)
-            SELECT 
-                word_id, 
-                study_session_id, 
-                CASE WHEN RANDOM() > 0.3 THEN TRUE ELSE FALSE END,
-                datetime('now', '-' || RANDOM() * 10 || ' minutes')
-            FROM word_review_items
-        """)
-        
-        return {"message": "Test data has been seeded"} 
\ No newline at end of file
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(get_db_executor(), contextvars.copy_context().run, _restore_template, True)
+
+    bump_data_version()
+    return {"message": "Test data has been seeded"}
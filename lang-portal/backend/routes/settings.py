@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException
-from lib.db import get_db_connection
+from lib.db import get_async_db_connection
+from lib.http_cache import CachePolicy
 from pydantic import BaseModel
 
 router = APIRouter()
+cache_policy = CachePolicy("settings")
 
 class LearningPreferences(BaseModel):
     wordsPerSession: int
@@ -11,19 +13,20 @@ class LearningPreferences(BaseModel):
     showUsageExamples: bool
     darkMode: bool
 
-@router.get("/settings", response_model=LearningPreferences, tags=["Settings"])
-def get_settings():
+@router.get("/settings", response_model=LearningPreferences, tags=["Settings"],
+            dependencies=[cache_policy.depends_on("user_settings")])
+async def get_settings():
     """
     Retrieve user's learning preferences.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         # Set row_factory to get dictionary-like results
         conn.row_factory = lambda c, r: dict(zip([col[0] for col in c.description], r))
         
         # Check if settings exist
-        settings = conn.execute(
+        settings = await conn.fetchone(
             "SELECT * FROM user_settings WHERE id = 1"
-        ).fetchone()
+        )
 
         if not settings:
             # Return default settings
@@ -44,12 +47,12 @@ def get_settings():
         }
 
 @router.post("/settings", response_model=LearningPreferences, tags=["Settings"])
-def update_settings(preferences: LearningPreferences):
+async def update_settings(preferences: LearningPreferences):
     """
     Update user's learning preferences.
     """
-    with get_db_connection() as conn:
-        conn.execute("""
+    async with get_async_db_connection() as conn:
+        await conn.execute("""
             INSERT OR REPLACE INTO user_settings (
                 id, words_per_session, review_interval, 
                 show_phonetics, show_usage_examples, dark_mode
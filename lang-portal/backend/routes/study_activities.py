@@ -1,31 +1,34 @@
-from fastapi import APIRouter, HTTPException, Path, Query, Body
-from lib.db import get_db_connection
+from fastapi import APIRouter, HTTPException, Path, Query, Body, Response
+from lib.db import get_async_db_connection
+from lib.http_cache import CachePolicy
+from lib.json_response import words_page_response
+from lib.cache import bump_data_version
 from models import StudyActivity, PaginatedStudySessions, StudyActivityCreate, PaginatedStudyActivities, PaginatedWords
 from utils import paginate
 from datetime import datetime
-import json
 
 router = APIRouter()
+cache_policy = CachePolicy("study_activities")
 
-@router.get("/study_activities/{activity_id}", response_model=StudyActivity, tags=["Study Activities"])
-def get_study_activity(activity_id: int = Path(..., title="The ID of the study activity to retrieve")):
+@router.get("/study_activities/{activity_id}", response_model=StudyActivity, tags=["Study Activities"],
+            dependencies=[cache_policy.depends_on("study_activities", "groups", "word_review_items")])
+async def get_study_activity(activity_id: int = Path(..., title="The ID of the study activity to retrieve")):
     """
     Retrieve a study activity by its ID.
 
     - **activity_id**: The ID of the study activity to retrieve.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         query = """
         SELECT sa.id, sa.name, sa.study_session_id, sa.group_id, sa.created_at,
                g.name as group_name,
-               (SELECT COUNT(*) FROM word_review_items wri 
-                WHERE wri.study_session_id = sa.study_session_id) as review_items_count
+               COALESCE(ss.review_items_count, 0) as review_items_count
         FROM study_activities sa
         LEFT JOIN groups g ON g.id = sa.group_id
+        LEFT JOIN study_sessions ss ON ss.id = sa.study_session_id
         WHERE sa.id = ?
         """
-        cursor = conn.execute(query, (activity_id,))
-        row = cursor.fetchone()
+        row = await conn.fetchone(query, (activity_id,))
         if not row:
             raise HTTPException(status_code=404, detail="Study activity not found")
         
@@ -42,11 +45,13 @@ def get_study_activity(activity_id: int = Path(..., title="The ID of the study a
         
         return study_activity
 
-@router.get("/study_activities/{activity_id}/study_sessions", response_model=PaginatedStudySessions, tags=["Study Activities"])
-def get_activity_study_sessions(
+@router.get("/study_activities/{activity_id}/study_sessions", response_model=PaginatedStudySessions, tags=["Study Activities"],
+            dependencies=[cache_policy.depends_on("study_sessions", "study_activities", "groups", "word_review_items")])
+async def get_activity_study_sessions(
     activity_id: int = Path(..., title="The ID of the study activity to retrieve study sessions for"),
     page: int = Query(1, ge=1), 
-    page_size: int = Query(10, ge=1, le=100)
+    page_size: int = Query(10, ge=1, le=100),
+    cursor: str = Query(None)
 ):
     """
     Retrieve a paginated list of study sessions for a specific study activity.
@@ -54,13 +59,14 @@ def get_activity_study_sessions(
     - **activity_id**: The ID of the study activity to retrieve study sessions for.
     - **page**: The page number to retrieve.
     - **page_size**: The number of items per page.
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         # First check if the activity exists
-        activity_exists = conn.execute(
+        activity_exists = await conn.fetchone(
             "SELECT 1 FROM study_activities WHERE id = ?", 
             (activity_id,)
-        ).fetchone()
+        )
         
         if not activity_exists:
             raise HTTPException(status_code=404, detail="Study activity not found")
@@ -72,16 +78,23 @@ def get_activity_study_sessions(
                g.name AS group_name,
                ss.created_at AS start_time,
                NULL AS end_time,
-               (SELECT COUNT(*) FROM word_review_items wri 
-                WHERE wri.study_session_id = ss.id) as review_items_count
+               ss.review_items_count
         FROM study_sessions ss
         JOIN study_activities sa ON sa.study_session_id = ss.id
         LEFT JOIN groups g ON g.id = ss.group_id
-        WHERE sa.id = ?
+        WHERE sa.id = ? AND {keyset}
         """
-        paginated_query = paginate(query, page, page_size)
-        cursor = conn.execute(paginated_query, (activity_id,))
-        rows = cursor.fetchall()
+        rows, pagination = await conn.run(
+            paginate, query, (activity_id,), ("ss.id",), lambda row: (row[0],),
+            page, page_size, cursor,
+            count_sql="""
+            SELECT COUNT(*)
+            FROM study_sessions ss
+            JOIN study_activities sa ON sa.study_session_id = ss.id
+            WHERE sa.id = ?
+            """,
+            count_params=(activity_id,), count_tables=("study_sessions", "study_activities")
+        )
         
         if not rows:
             raise HTTPException(
@@ -101,43 +114,25 @@ def get_activity_study_sessions(
             } for row in rows
         ]
 
-        # Get total count for pagination
-        total_items = conn.execute(
-            """
-            SELECT COUNT(*) 
-            FROM study_sessions ss
-            JOIN study_activities sa ON sa.study_session_id = ss.id
-            WHERE sa.id = ?
-            """, 
-            (activity_id,)
-        ).fetchone()[0]
-        
-        total_pages = (total_items + page_size - 1) // page_size
-        
         return {
             "study_sessions": study_sessions,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-                "items_per_page": page_size
-            }
+            "pagination": pagination
         }
 
 @router.post("/study_activities", response_model=StudyActivity, tags=["Study Activities"])
-def create_study_activity(activity: StudyActivityCreate = Body(...)):
+async def create_study_activity(activity: StudyActivityCreate = Body(...)):
     """
     Create a new study activity and start a session.
 
     - **name**: The name of the study activity
     - **group_id**: The ID of the group this activity belongs to
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         # First check if the group exists
-        group_exists = conn.execute(
+        group_exists = await conn.fetchone(
             "SELECT 1 FROM groups WHERE id = ?", 
             (activity.group_id,)
-        ).fetchone()
+        )
         
         if not group_exists:
             raise HTTPException(status_code=404, detail="Group not found")
@@ -145,7 +140,7 @@ def create_study_activity(activity: StudyActivityCreate = Body(...)):
         current_time = datetime.now().isoformat()
 
         # First create the study activity
-        cursor = conn.execute(
+        cursor = await conn.execute(
             """
             INSERT INTO study_activities (name, group_id, created_at)
             VALUES (?, ?, ?)
@@ -155,7 +150,7 @@ def create_study_activity(activity: StudyActivityCreate = Body(...)):
         activity_id = cursor.lastrowid
 
         # Then create the study session with the activity_id
-        cursor = conn.execute(
+        cursor = await conn.execute(
             """
             INSERT INTO study_sessions (group_id, study_activity_id, created_at) 
             VALUES (?, ?, ?)
@@ -165,7 +160,7 @@ def create_study_activity(activity: StudyActivityCreate = Body(...)):
         study_session_id = cursor.lastrowid
 
         # Update the study activity with the session ID
-        cursor = conn.execute(
+        cursor = await conn.execute(
             """
             UPDATE study_activities 
             SET study_session_id = ? 
@@ -178,14 +173,13 @@ def create_study_activity(activity: StudyActivityCreate = Body(...)):
         query = """
         SELECT sa.id, sa.name, sa.study_session_id, sa.group_id, sa.created_at,
                g.name as group_name,
-               (SELECT COUNT(*) FROM word_review_items wri 
-                WHERE wri.study_session_id = sa.study_session_id) as review_items_count
+               COALESCE(ss.review_items_count, 0) as review_items_count
         FROM study_activities sa
         LEFT JOIN groups g ON g.id = sa.group_id
+        LEFT JOIN study_sessions ss ON ss.id = sa.study_session_id
         WHERE sa.id = ?
         """
-        cursor = conn.execute(query, (activity_id,))
-        row = cursor.fetchone()
+        row = await conn.fetchone(query, (activity_id,))
         
         # Convert row to StudyActivity model
         study_activity = StudyActivity(
@@ -197,36 +191,44 @@ def create_study_activity(activity: StudyActivityCreate = Body(...)):
             group_name=row[5],
             review_items_count=row[6]
         ).model_dump()
-        
-        return study_activity
 
-@router.get("/study_activities", response_model=PaginatedStudyActivities, tags=["Study Activities"])
-def get_study_activities(
+    # Invalidate cached dashboard aggregates once the new session is committed
+    bump_data_version()
+
+    return study_activity
+
+@router.get("/study_activities", response_model=PaginatedStudyActivities, tags=["Study Activities"],
+            dependencies=[cache_policy.depends_on("study_activities", "groups", "word_review_items")])
+async def get_study_activities(
     page: int = Query(1, ge=1),
-    page_size: int = Query(10, ge=1, le=100)
+    page_size: int = Query(10, ge=1, le=100),
+    cursor: str = Query(None)
 ):
     """
     Retrieve a paginated list of study activities.
 
     - **page**: The page number to retrieve (default: 1)
     - **page_size**: The number of items per page (default: 10)
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         # Base query
         query = """
         SELECT sa.id, sa.name, sa.study_session_id, sa.group_id, sa.created_at,
                g.name as group_name,
-               (SELECT COUNT(*) FROM word_review_items wri 
-                WHERE wri.study_session_id = sa.study_session_id) as review_items_count
+               COALESCE(ss.review_items_count, 0) as review_items_count
         FROM study_activities sa
         LEFT JOIN groups g ON g.id = sa.group_id
-        ORDER BY sa.created_at DESC
+        LEFT JOIN study_sessions ss ON ss.id = sa.study_session_id
+        WHERE {keyset}
         """
         
         # Apply pagination
-        paginated_query = paginate(query, page, page_size)
-        cursor = conn.execute(paginated_query)
-        rows = cursor.fetchall()
+        rows, pagination = await conn.run(
+            paginate, query, (), ("sa.created_at", "sa.id"), lambda row: (row[4], row[0]),
+            page, page_size, cursor, descending=True,
+            count_sql="SELECT COUNT(*) FROM study_activities", count_tables=("study_activities",)
+        )
         
         # Convert rows to list of activities
         activities = [
@@ -242,25 +244,19 @@ def get_study_activities(
             for row in rows
         ]
 
-        # Get total count for pagination
-        total_items = conn.execute("SELECT COUNT(*) FROM study_activities").fetchone()[0]
-        total_pages = (total_items + page_size - 1) // page_size
-        
         return {
             "study_activities": activities,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-                "items_per_page": page_size
-            }
+            "pagination": pagination
         }
 
-@router.get("/study_activities/{activity_id}/words", response_model=PaginatedWords, tags=["Study Activities"])
-def get_activity_words(
+@router.get("/study_activities/{activity_id}/words", response_model=PaginatedWords, tags=["Study Activities"],
+            dependencies=[cache_policy.depends_on("study_activities", "words", "word_groups", "word_stats")])
+async def get_activity_words(
+    response: Response,
     activity_id: int = Path(..., title="The ID of the study activity to retrieve words for"),
     page: int = Query(1, ge=1),
-    page_size: int = Query(10, ge=1, le=100)
+    page_size: int = Query(10, ge=1, le=100),
+    cursor: str = Query(None)
 ):
     """
     Retrieve a paginated list of words for a specific study activity.
@@ -268,13 +264,14 @@ def get_activity_words(
     - **activity_id**: The ID of the study activity to retrieve words for
     - **page**: The page number to retrieve (default: 1)
     - **page_size**: The number of items per page (default: 10)
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         # First check if the activity exists
-        activity = conn.execute(
+        activity = await conn.fetchone(
             "SELECT group_id FROM study_activities WHERE id = ?",
             (activity_id,)
-        ).fetchone()
+        )
 
         if not activity:
             raise HTTPException(status_code=404, detail="Study activity not found")
@@ -283,58 +280,33 @@ def get_activity_words(
 
         # Get words for the group
         query = """
-        SELECT w.id, w.jamaican_patois, w.english, w.parts,
-               COALESCE(SUM(CASE WHEN wr.correct THEN 1 ELSE 0 END), 0) as correct_count,
-               COALESCE(SUM(CASE WHEN NOT wr.correct THEN 1 ELSE 0 END), 0) as wrong_count
+        SELECT w.id, w.jamaican_patois, w.english,
+               CASE WHEN json_valid(w.parts) AND json_type(w.parts) = 'object' THEN w.parts END AS parts,
+               COALESCE(ws.correct_count, 0) AS correct_count,
+               COALESCE(ws.wrong_count, 0) AS wrong_count
         FROM words w
         JOIN word_groups wg ON w.id = wg.word_id
-        LEFT JOIN word_reviews wr ON w.id = wr.word_id
-        WHERE wg.group_id = ?
+        LEFT JOIN word_stats ws ON ws.word_id = w.id
+        WHERE wg.group_id = ? AND {keyset}
         GROUP BY w.id
         """
         
-        paginated_query = paginate(query, page, page_size)
-        cursor = conn.execute(paginated_query, (group_id,))
-        rows = cursor.fetchall()
-
-        if not rows:
-            raise HTTPException(
-                status_code=404,
-                detail="No words found for this activity"
-            )
-
-        # Convert rows to list of Word models
-        words = [
-            {
-                "id": row[0],
-                "jamaican_patois": row[1],
-                "english": row[2],
-                "parts": json.loads(row[3]) if row[3] else None,
-                "correct_count": row[4],
-                "wrong_count": row[5]
-            }
-            for row in rows
-        ]
-
-        # Get total count for pagination
-        total_items = conn.execute(
-            """
+        rows, pagination = await conn.run(
+            paginate, query, (group_id,), ("w.id",), lambda row: (row[0],),
+            page, page_size, cursor,
+            count_sql="""
             SELECT COUNT(DISTINCT w.id)
             FROM words w
             JOIN word_groups wg ON w.id = wg.word_id
             WHERE wg.group_id = ?
             """,
-            (group_id,)
-        ).fetchone()[0]
+            count_params=(group_id,), count_tables=("words", "word_groups")
+        )
 
-        total_pages = (total_items + page_size - 1) // page_size
+        if not rows:
+            raise HTTPException(
+                status_code=404,
+                detail="No words found for this activity"
+            )
 
-        return {
-            "words": words,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-                "items_per_page": page_size
-            }
-        } 
\ No newline at end of file
+        return words_page_response(rows, pagination, response.headers) 
\ No newline at end of file
@@ -1,37 +1,56 @@
-from fastapi import APIRouter, HTTPException, Query, Path, Body
-from lib.db import get_db_connection
-from models import PaginatedStudySessions, StudySession, PaginatedWords, WordReview
+from fastapi import APIRouter, HTTPException, Query, Path, Body, Response
+from lib.db import get_async_db_connection
+from lib.http_cache import CachePolicy
+from lib.json_response import PrebuiltJSONResponse, encode_objects, words_page_response
+from lib.cache import bump_data_version
+from lib.writer import run_write
+from models import PaginatedStudySessions, StudySession, PaginatedWords, WordReview, ReviewCreate, BatchReviewResponse, NextWords
+from typing import List
 from utils import paginate
 from datetime import datetime
 import json
 
 router = APIRouter()
+cache_policy = CachePolicy("study_sessions")
 
-@router.get("/study_sessions", response_model=PaginatedStudySessions, tags=["Study Sessions"])
-def get_study_sessions(page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100)):
+# Upper bound on reviews accepted in one batch request
+MAX_BATCH_REVIEWS = 1000
+
+# ScheduledWord fields, in next_words query column order
+SCHEDULED_WORD_COLUMNS = (
+    "id", "jamaican_patois", "english", "parts",
+    "due_at", "ease_factor", "interval_hours", "repetitions",
+)
+
+@router.get("/study_sessions", response_model=PaginatedStudySessions, tags=["Study Sessions"],
+            dependencies=[cache_policy.depends_on("study_sessions", "study_activities", "groups", "word_review_items")])
+async def get_study_sessions(page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100),
+                       cursor: str = Query(None)):
     """
     Retrieve a paginated list of study sessions.
 
     - **page**: The page number to retrieve.
     - **page_size**: The number of items per page.
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         query = """
         SELECT ss.id,
                sa.name AS activity_name,
                g.name AS group_name,
                ss.created_at AS start_time,
                NULL AS end_time,
-               (SELECT COUNT(*) FROM word_review_items wri 
-                WHERE wri.study_session_id = ss.id) as review_items_count
+               ss.review_items_count
         FROM study_sessions ss
         LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
         LEFT JOIN groups g ON g.id = ss.group_id
-        ORDER BY ss.created_at DESC
+        WHERE {keyset}
         """
-        paginated_query = paginate(query, page, page_size)
-        cursor = conn.execute(paginated_query)
-        rows = cursor.fetchall()
+        rows, pagination = await conn.run(
+            paginate, query, (), ("ss.created_at", "ss.id"), lambda row: (row[3], row[0]),
+            page, page_size, cursor, descending=True,
+            count_sql="SELECT COUNT(*) FROM study_sessions", count_tables=("study_sessions",)
+        )
         
         if not rows:
             raise HTTPException(status_code=404, detail="No study sessions found")
@@ -48,43 +67,33 @@ def get_study_sessions(page: int = Query(1, ge=1), page_size: int = Query(10, ge
             } for row in rows
         ]
 
-        # Calculate total items and total pages
-        total_items = conn.execute("SELECT COUNT(*) FROM study_sessions").fetchone()[0]
-        total_pages = (total_items + page_size - 1) // page_size
-        
         return {
             "study_sessions": study_sessions,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-                "items_per_page": page_size
-            }
+            "pagination": pagination
         }
 
-@router.get("/study_sessions/{session_id}", response_model=StudySession, tags=["Study Sessions"])
-def get_study_session(session_id: int = Path(..., title="The ID of the study session to retrieve")):
+@router.get("/study_sessions/{session_id}", response_model=StudySession, tags=["Study Sessions"],
+            dependencies=[cache_policy.depends_on("study_sessions", "study_activities", "groups", "word_review_items")])
+async def get_study_session(session_id: int = Path(..., title="The ID of the study session to retrieve")):
     """
     Retrieve a specific study session by ID.
 
     - **session_id**: The ID of the study session to retrieve.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         query = """
         SELECT ss.id,
                sa.name AS activity_name,
                g.name AS group_name,
                ss.created_at AS start_time,
                NULL AS end_time,
-               (SELECT COUNT(*) FROM word_review_items wri 
-                WHERE wri.study_session_id = ss.id) as review_items_count
+               ss.review_items_count
         FROM study_sessions ss
         LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
         LEFT JOIN groups g ON g.id = ss.group_id
         WHERE ss.id = ?
         """
-        cursor = conn.execute(query, (session_id,))
-        row = cursor.fetchone()
+        row = await conn.fetchone(query, (session_id,))
         
         if not row:
             raise HTTPException(status_code=404, detail="Study session not found")
@@ -101,11 +110,14 @@ def get_study_session(session_id: int = Path(..., title="The ID of the study ses
         
         return study_session 
 
-@router.get("/study_sessions/{session_id}/words", response_model=PaginatedWords, tags=["Study Sessions"])
-def get_session_words(
+@router.get("/study_sessions/{session_id}/words", response_model=PaginatedWords, tags=["Study Sessions"],
+            dependencies=[cache_policy.depends_on("study_sessions", "words", "word_review_items", "word_stats")])
+async def get_session_words(
+    response: Response,
     session_id: int = Path(..., title="The ID of the study session to retrieve words for"),
     page: int = Query(1, ge=1), 
-    page_size: int = Query(10, ge=1, le=100)
+    page_size: int = Query(10, ge=1, le=100),
+    cursor: str = Query(None)
 ):
     """
     Retrieve a paginated list of words for a specific study session.
@@ -113,75 +125,171 @@ def get_session_words(
     - **session_id**: The ID of the study session to retrieve words for.
     - **page**: The page number to retrieve.
     - **page_size**: The number of items per page.
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         # First check if the session exists
-        session_exists = conn.execute(
+        session_exists = await conn.fetchone(
             "SELECT 1 FROM study_sessions WHERE id = ?", 
             (session_id,)
-        ).fetchone()
+        )
         
         if not session_exists:
             raise HTTPException(status_code=404, detail="Study session not found")
 
         # Query to get words for the session
         query = """
-        SELECT w.id, w.jamaican_patois, w.english, w.parts,
-               COALESCE(SUM(CASE WHEN wr.correct THEN 1 ELSE 0 END), 0) as correct_count,
-               COALESCE(SUM(CASE WHEN NOT wr.correct THEN 1 ELSE 0 END), 0) as wrong_count
+        SELECT w.id, w.jamaican_patois, w.english,
+               CASE WHEN json_valid(w.parts) AND json_type(w.parts) = 'object' THEN w.parts END AS parts,
+               COALESCE(ws.correct_count, 0) AS correct_count,
+               COALESCE(ws.wrong_count, 0) AS wrong_count
         FROM words w
         JOIN word_review_items wri ON wri.word_id = w.id
-        LEFT JOIN word_reviews wr ON wr.word_id = w.id
-        WHERE wri.study_session_id = ?
+        LEFT JOIN word_stats ws ON ws.word_id = w.id
+        WHERE wri.study_session_id = ? AND {keyset}
         GROUP BY w.id
         """
-        paginated_query = paginate(query, page, page_size)
-        cursor = conn.execute(paginated_query, (session_id,))
-        rows = cursor.fetchall()
+        rows, pagination = await conn.run(
+            paginate, query, (session_id,), ("w.id",), lambda row: (row[0],),
+            page, page_size, cursor,
+            count_sql="""
+            SELECT COUNT(DISTINCT w.id)
+            FROM words w
+            JOIN word_review_items wri ON wri.word_id = w.id
+            WHERE wri.study_session_id = ?
+            """,
+            count_params=(session_id,), count_tables=("words", "word_review_items")
+        )
         
         if not rows:
             raise HTTPException(
                 status_code=404, 
                 detail="No words found for this study session"
             )
-        
-        # Convert rows to list of Word models
-        words = [
-            {
-                "id": row[0],
-                "jamaican_patois": row[1],
-                "english": row[2],
-                "parts": json.loads(row[3]) if row[3] else None,
-                "correct_count": row[4],
-                "wrong_count": row[5]
-            } for row in rows
-        ]
 
-        # Get total count for pagination
-        total_items = conn.execute(
-            """
-            SELECT COUNT(DISTINCT w.id)
-            FROM words w
-            JOIN word_review_items wri ON wri.word_id = w.id
-            WHERE wri.study_session_id = ?
-            """, 
+        return words_page_response(rows, pagination, response.headers)
+
+@router.get("/study_sessions/{session_id}/next_words", response_model=NextWords, tags=["Study Sessions"])
+async def get_next_words(
+    session_id: int = Path(..., title="The ID of the study session to pick words for"),
+    limit: int = Query(None, ge=1, le=100)
+):
+    """
+    Pick the next words to study in a session's group.
+
+    - **session_id**: The ID of the study session
+    - **limit**: How many words to return; defaults to the `words_per_session` setting
+
+    Words whose scheduled review is due come first, most overdue first. Any
+    remaining slots are filled with words of the group that have never been reviewed.
+    Schedules follow SM-2 and are updated by a trigger on every review.
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    async with get_async_db_connection() as conn:
+        session = await conn.fetchone(
+            "SELECT group_id FROM study_sessions WHERE id = ?",
             (session_id,)
-        ).fetchone()[0]
-        
-        total_pages = (total_items + page_size - 1) // page_size
-        
-        return {
-            "words": words,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-                "items_per_page": page_size
-            }
-        } 
+        )
+
+        if not session:
+            raise HTTPException(status_code=404, detail="Study session not found")
+
+        group_id = session[0]
+        if limit is None:
+            limit = (await conn.fetchone(
+                "SELECT COALESCE(MAX(words_per_session), 10) FROM user_settings WHERE id = 1"
+            ))[0]
+
+        # Start from the group's words and look up each schedule by word id, so
+        # due words of other groups are never visited; the group's due words
+        # are sorted by due date
+        rows = await conn.fetchall(
+            """
+            SELECT w.id, w.jamaican_patois, w.english,
+                   CASE WHEN json_valid(w.parts) AND json_type(w.parts) = 'object' THEN w.parts END AS parts,
+                   s.due_at, s.ease_factor, s.interval_hours, s.repetitions
+            FROM word_groups wg
+            JOIN word_schedule s ON s.word_id = wg.word_id
+            JOIN words w ON w.id = wg.word_id
+            WHERE wg.group_id = ? AND s.due_at <= ?
+            GROUP BY wg.word_id
+            ORDER BY s.due_at, s.word_id
+            LIMIT ?
+            """,
+            (group_id, now, limit)
+        )
+
+        if len(rows) < limit:
+            rows += await conn.fetchall(
+                """
+                SELECT w.id, w.jamaican_patois, w.english,
+                       CASE WHEN json_valid(w.parts) AND json_type(w.parts) = 'object' THEN w.parts END AS parts,
+                       NULL, 2.5, 0.0, 0
+                FROM word_groups wg
+                JOIN words w ON w.id = wg.word_id
+                WHERE wg.group_id = ?
+                  AND NOT EXISTS (SELECT 1 FROM word_schedule s WHERE s.word_id = wg.word_id)
+                ORDER BY wg.word_id
+                LIMIT ?
+                """,
+                (group_id, limit - len(rows))
+            )
+
+    body = f'{{"study_session_id":{session_id},"words":{encode_objects(SCHEDULED_WORD_COLUMNS, rows)}}}'
+    return PrebuiltJSONResponse(body.encode())
+
+def _record_review(conn, session_id, word_id, correct):
+    """Insert one review and its review item; one write transaction, see run_write."""
+    if not conn.execute("SELECT 1 FROM study_sessions WHERE id = ?", (session_id,)).fetchone():
+        raise HTTPException(status_code=404, detail="Study session not found")
+
+    word = conn.execute(
+        """
+        SELECT jamaican_patois, english
+        FROM words
+        WHERE id = ?
+        """,
+        (word_id,)
+    ).fetchone()
+    if not word:
+        raise HTTPException(status_code=404, detail="Word not found")
+
+    # Create word review item if it doesn't exist; the table has no unique
+    # constraint, so OR IGNORE would insert a duplicate
+    conn.execute(
+        """
+        INSERT INTO word_review_items (study_session_id, word_id)
+        SELECT ?1, ?2
+        WHERE NOT EXISTS (
+            SELECT 1 FROM word_review_items
+            WHERE study_session_id = ?1 AND word_id = ?2
+        )
+        """,
+        (session_id, word_id)
+    )
+
+    # Create the word review
+    current_time = datetime.now().isoformat()
+    review_id = conn.execute(
+        """
+        INSERT INTO word_reviews (word_id, study_session_id, correct, created_at)
+        VALUES (?, ?, ?, ?)
+        """,
+        (word_id, session_id, correct, current_time)
+    ).lastrowid
+
+    return {
+        "id": review_id,
+        "word_id": word_id,
+        "study_session_id": session_id,
+        "correct": correct,
+        "created_at": current_time,
+        "word_jamaican_patois": word[0],
+        "word_english": word[1]
+    }
 
 @router.post("/study_sessions/{session_id}/words/{word_id}/review", response_model=WordReview, tags=["Study Sessions"])
-def create_word_review(
+async def create_word_review(
     session_id: int = Path(..., title="The ID of the study session"),
     word_id: int = Path(..., title="The ID of the word being reviewed"),
     correct: bool = Body(..., embed=True)
@@ -193,55 +301,120 @@ def create_word_review(
     - **word_id**: The ID of the word being reviewed
     - **correct**: Whether the word was reviewed correctly
     """
-    with get_db_connection() as conn:
-        # Check if session exists
-        session_exists = conn.execute(
-            "SELECT 1 FROM study_sessions WHERE id = ?",
-            (session_id,)
-        ).fetchone()
-        
-        if not session_exists:
-            raise HTTPException(status_code=404, detail="Study session not found")
+    review = await run_write(_record_review, session_id, word_id, correct)
 
-        # Check if word exists
-        word = conn.execute(
-            """
-            SELECT jamaican_patois, english 
-            FROM words 
-            WHERE id = ?
-            """,
-            (word_id,)
-        ).fetchone()
-        
-        if not word:
-            raise HTTPException(status_code=404, detail="Word not found")
+    # Invalidate cached dashboard aggregates once the review is committed
+    bump_data_version()
 
-        # Create word review item if it doesn't exist
-        conn.execute(
-            """
-            INSERT OR IGNORE INTO word_review_items (study_session_id, word_id)
-            VALUES (?, ?)
-            """,
-            (session_id, word_id)
+    return review
+
+def _local_time(value):
+    """Naive local ISO timestamp, the format every created_at is stored in"""
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+def _record_reviews(conn, session_id, reviews, current_time):
+    """
+    Insert the reviews whose word exists; one write transaction, see run_write.
+    Returns the known word ids, the inserted rows and their review ids.
+    """
+    if not conn.execute("SELECT 1 FROM study_sessions WHERE id = ?", (session_id,)).fetchone():
+        raise HTTPException(status_code=404, detail="Study session not found")
+
+    # Validate every word id with a single set-based lookup
+    requested_ids = sorted({review.word_id for review in reviews})
+    known_ids = {
+        row[0] for row in conn.execute(
+            "SELECT id FROM words WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(requested_ids),)
         )
+    }
 
-        # Create the word review
-        current_time = datetime.now().isoformat()
-        cursor = conn.execute(
-            """
-            INSERT INTO word_reviews (word_id, study_session_id, correct, created_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (word_id, session_id, correct, current_time)
+    rows = [
+        (
+            review.word_id,
+            session_id,
+            review.correct,
+            _local_time(review.answered_at) if review.answered_at else current_time
         )
-        review_id = cursor.lastrowid
+        for review in reviews if review.word_id in known_ids
+    ]
+    if not rows:
+        return known_ids, rows, []
 
-        return {
-            "id": review_id,
-            "word_id": word_id,
-            "study_session_id": session_id,
-            "correct": correct,
-            "created_at": current_time,
-            "word_jamaican_patois": word[0],
-            "word_english": word[1]
-        } 
\ No newline at end of file
+    conn.executemany(
+        """
+        INSERT INTO word_review_items (study_session_id, word_id)
+        SELECT ?1, ?2
+        WHERE NOT EXISTS (
+            SELECT 1 FROM word_review_items
+            WHERE study_session_id = ?1 AND word_id = ?2
+        )
+        """,
+        [(session_id, word_id) for word_id in sorted({row[0] for row in rows})]
+    )
+    conn.executemany(
+        """
+        INSERT INTO word_reviews (word_id, study_session_id, correct, created_at)
+        VALUES (?, ?, ?, ?)
+        """,
+        rows
+    )
+    # AUTOINCREMENT ids are allocated consecutively while this
+    # transaction holds the write lock
+    last_id = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'word_reviews'").fetchone()[0]
+    return known_ids, rows, list(range(last_id - len(rows) + 1, last_id + 1))
+
+@router.post("/study_sessions/{session_id}/reviews", response_model=BatchReviewResponse, tags=["Study Sessions"])
+async def create_word_reviews(
+    session_id: int = Path(..., title="The ID of the study session"),
+    reviews: List[ReviewCreate] = Body(...)
+):
+    """
+    Record a batch of word reviews for a study session in one transaction.
+
+    - **session_id**: The ID of the study session
+    - **reviews**: Array of `{word_id, correct, answered_at}`; `answered_at` defaults to now
+
+    Items whose word does not exist are reported as errors; the rest are recorded.
+    """
+    if not reviews:
+        raise HTTPException(status_code=400, detail="No reviews provided")
+    if len(reviews) > MAX_BATCH_REVIEWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_REVIEWS} reviews can be recorded per request"
+        )
+
+    current_time = datetime.now().isoformat()
+    known_ids, rows, review_ids = await run_write(_record_reviews, session_id, reviews, current_time)
+
+    if rows:
+        bump_data_version()
+
+    results = []
+    row_iter = iter(rows)
+    review_ids = iter(review_ids)
+    for review in reviews:
+        if review.word_id in known_ids:
+            row = next(row_iter)
+            results.append({
+                "word_id": review.word_id,
+                "status": "created",
+                "review_id": next(review_ids),
+                "created_at": row[3]
+            })
+        else:
+            results.append({
+                "word_id": review.word_id,
+                "status": "error",
+                "detail": "Word not found"
+            })
+
+    return {
+        "study_session_id": session_id,
+        "created": len(rows),
+        "failed": len(reviews) - len(rows),
+        "results": results
+    }
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Request
+from lib.db import get_async_db_connection
+from lib.bulk import read_sync_items, validate_items, insert_word_groups
+from lib.cache import bump_data_version
+from lib.tenancy import require_shared_database
+from models import WordGroupSync, SyncResult
+
+router = APIRouter()
+
+@router.post("/word-groups/sync", response_model=SyncResult, tags=["Groups"],
+             dependencies=[Depends(require_shared_database)])
+async def sync_word_groups(request: Request):
+    """
+    Bulk add word-group associations in one transaction.
+
+    - **word_groups**: `{"word_groups": [{word_id, group_id}]}`, or NDJSON with one
+      association per line, optionally gzip-compressed.
+
+    Existing pairs and pairs naming an unknown word or group are skipped.
+    """
+    word_groups = validate_items(WordGroupSync, await read_sync_items(request, "word_groups"))
+    async with get_async_db_connection() as conn:
+        result = await conn.run(insert_word_groups, word_groups)
+
+    if result["inserted"]:
+        bump_data_version()
+    return result
@@ -1,100 +1,229 @@
-import json
-from fastapi import APIRouter, HTTPException, Query, Path
-from lib.db import get_db_connection
-from utils import paginate
-from models import PaginatedWords, Word, PaginatedGroups
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
+from lib.db import get_async_db_connection
+from lib.http_cache import CachePolicy
+from lib.json_response import PrebuiltJSONResponse, encode_object, encode_objects, page_response, words_page_response
+from lib.bulk import read_sync_items, validate_items, upsert_words
+from lib.cache import bump_data_version
+from lib.tenancy import require_shared_database
+from utils import paginate, word_filters
+from models import PaginatedWords, Word, PaginatedGroups, WordSync, SyncResult, PaginatedWordSearch
 
 router = APIRouter()
+cache_policy = CachePolicy("words")
 
-@router.get("/words", response_model=PaginatedWords, tags=["Words"])
-def get_words(page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100)):
+# The trigram tokenizer only indexes runs of three or more characters
+MIN_TRIGRAM_LENGTH = 3
+HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE = "<mark>", "</mark>"
+# Matches ranked per search; ranking costs about 2 us per match
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "1000"))
+
+# Response fields, in query column order; parts is spliced in as stored JSON
+WORD_COLUMNS = ("id", "jamaican_patois", "english", "parts", "correct_count", "wrong_count")
+SEARCH_RESULT_COLUMNS = WORD_COLUMNS + ("score", "jamaican_patois_highlight", "english_highlight")
+
+def _fts_phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+def _fts_query(q, fuzzy=False):
+    """
+    Build an FTS5 MATCH expression from free text, or None when no term is
+    long enough for the trigram index.
+
+    Every term must occur as a substring (so prefixes match too). In fuzzy
+    mode any trigram of any term may match, and bm25 ranks words sharing the
+    most trigrams first, which tolerates typos and transpositions.
+    """
+    terms = [term for term in q.split() if len(term) >= MIN_TRIGRAM_LENGTH]
+    if not terms:
+        return None
+    if fuzzy:
+        grams = sorted({term[i:i + 3] for term in terms for i in range(len(term) - 2)})
+        return " OR ".join(_fts_phrase(gram) for gram in grams)
+    return " AND ".join(_fts_phrase(term) for term in terms)
+
+def _like_prefix(q):
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+def _mark_prefix(text, q):
+    if text.lower().startswith(q.lower()):
+        return HIGHLIGHT_OPEN + text[:len(q)] + HIGHLIGHT_CLOSE + text[len(q):]
+    return text
+
+@router.get("/words", response_model=PaginatedWords, tags=["Words"],
+            dependencies=[cache_policy.depends_on("words", "word_stats")])
+async def get_words(response: Response, page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100),
+              cursor: str = Query(None), part_type: str = Query(None, alias="type"),
+              usage: str = Query(None)):
     """
     Retrieve a paginated list of words.
 
     - **page**: The page number to retrieve.
     - **page_size**: The number of items per page.
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`.
+    - **type**: Only words whose `parts.type` equals this, e.g. `noun`.
+    - **usage**: Only words whose `parts.usage` equals this.
     """
-    with get_db_connection() as conn:
+    filters, filter_params = word_filters(part_type, usage)
+    async with get_async_db_connection() as conn:
         # Query to get words with correct and wrong counts
         query = """
-        SELECT w.id, w.jamaican_patois, w.english, w.parts,
-               COALESCE(SUM(CASE WHEN wr.correct THEN 1 ELSE 0 END), 0) AS correct_count,
-               COALESCE(SUM(CASE WHEN NOT wr.correct THEN 1 ELSE 0 END), 0) AS wrong_count
+        SELECT w.id, w.jamaican_patois, w.english,
+               CASE WHEN json_valid(w.parts) AND json_type(w.parts) = 'object' THEN w.parts END AS parts,
+               COALESCE(ws.correct_count, 0) AS correct_count,
+               COALESCE(ws.wrong_count, 0) AS wrong_count
         FROM words w
-        LEFT JOIN word_reviews wr ON w.id = wr.word_id
-        GROUP BY w.id
-        """
-        paginated_query = paginate(query, page, page_size)
-        cursor = conn.execute(paginated_query)
-        rows = cursor.fetchall()
+        LEFT JOIN word_stats ws ON ws.word_id = w.id
+        WHERE {filters} AND {keyset}
+        """.replace("{filters}", filters)
+        rows, pagination = await conn.run(
+            paginate, query, filter_params, ("w.id",), lambda row: (row[0],),
+            page, page_size, cursor,
+            count_sql="SELECT COUNT(*) FROM words w WHERE {filters}".replace("{filters}", filters),
+            count_params=filter_params, count_tables=("words",)
+        )
         if not rows:
             raise HTTPException(status_code=404, detail="No words found")
-        
-        # Convert rows to list of Word models and then to dictionaries
-        words = [
-            Word(
-                id=row[0],
-                jamaican_patois=row[1],
-                english=row[2],
-                parts=json.loads(row[3]) if row[3] else None,
-                correct_count=row[4],
-                wrong_count=row[5]
-            ).model_dump() for row in rows
-        ]
 
-        # Calculate total items and total pages
-        total_items = conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
-        total_pages = (total_items + page_size - 1) // page_size
-        
-        return {
-            "words": words,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-                "items_per_page": page_size
-            }
-        }
+        return words_page_response(rows, pagination, response.headers)
+
+@router.get("/words/search", response_model=PaginatedWordSearch, tags=["Words"],
+            dependencies=[cache_policy.depends_on("words", "word_stats")])
+async def search_words(response: Response, q: str = Query(..., min_length=1, max_length=100),
+                       fuzzy: bool = Query(False),
+                       page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100),
+                       cursor: str = Query(None)):
+    """
+    Search words by Jamaican Patois or English text.
+
+    - **q**: Search text; each term of three or more characters may match anywhere in a word.
+    - **fuzzy**: Match on shared trigrams instead of whole terms, tolerating typos.
+    - **page**: The page number to retrieve.
+    - **page_size**: The number of items per page.
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`.
+
+    Words starting with `q` rank first, then by bm25 relevance (Patois weighted
+    above English). Matches are wrapped in `<mark>` tags in the `*_highlight` fields;
+    the text is not HTML-escaped.
+
+    Only the first `SEARCH_MAX_CANDIDATES` matches by word id (default 1000)
+    are ranked and counted, so a term matching much of the vocabulary stays
+    in the low milliseconds (see benchmarks/word_search.py --broad); its
+    total stops at the cap and later matches are not returned.
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Search text is empty")
+    match = _fts_query(q, fuzzy)
+    prefix = _like_prefix(q)
+
+    async with get_async_db_connection() as conn:
+        if match is not None:
+            query = """
+            SELECT id, jamaican_patois, english, parts, correct_count, wrong_count,
+                   prefix_rank, score, patois_highlight, english_highlight
+            FROM (
+                SELECT w.id, w.jamaican_patois, w.english,
+                       CASE WHEN json_valid(w.parts) AND json_type(w.parts) = 'object' THEN w.parts END AS parts,
+                       COALESCE(ws.correct_count, 0) AS correct_count,
+                       COALESCE(ws.wrong_count, 0) AS wrong_count,
+                       CASE WHEN w.jamaican_patois LIKE ? ESCAPE '\\'
+                              OR w.english LIKE ? ESCAPE '\\' THEN 0 ELSE 1 END AS prefix_rank,
+                       f.score, f.patois_highlight, f.english_highlight
+                FROM (
+                    -- Capped before ranking: bm25 and highlight run per match
+                    SELECT rowid,
+                           bm25(words_fts, 2.0, 1.0) AS score,
+                           highlight(words_fts, 0, '<mark>', '</mark>') AS patois_highlight,
+                           highlight(words_fts, 1, '<mark>', '</mark>') AS english_highlight
+                    FROM words_fts
+                    WHERE words_fts MATCH ?
+                    LIMIT ?
+                ) f
+                JOIN words w ON w.id = f.rowid
+                LEFT JOIN word_stats ws ON ws.word_id = w.id
+            )
+            WHERE {keyset}
+            """
+            params = (prefix, prefix, match, SEARCH_MAX_CANDIDATES)
+            count_query = """
+            SELECT COUNT(*) FROM (SELECT 1 FROM words_fts WHERE words_fts MATCH ? LIMIT ?)
+            """
+            count_params = (match, SEARCH_MAX_CANDIDATES)
+        else:
+            # Too short for the trigram index: prefix match over words instead
+            query = """
+            SELECT id, jamaican_patois, english, parts, correct_count, wrong_count,
+                   prefix_rank, score, patois_highlight, english_highlight
+            FROM (
+                SELECT w.id, w.jamaican_patois, w.english,
+                       CASE WHEN json_valid(w.parts) AND json_type(w.parts) = 'object' THEN w.parts END AS parts,
+                       COALESCE(ws.correct_count, 0) AS correct_count,
+                       COALESCE(ws.wrong_count, 0) AS wrong_count,
+                       0 AS prefix_rank, 0.0 AS score,
+                       w.jamaican_patois AS patois_highlight, w.english AS english_highlight
+                FROM words w
+                LEFT JOIN word_stats ws ON ws.word_id = w.id
+                WHERE w.jamaican_patois LIKE ? ESCAPE '\\' OR w.english LIKE ? ESCAPE '\\'
+            )
+            WHERE {keyset}
+            """
+            params = (prefix, prefix)
+            count_query = """
+            SELECT COUNT(*) FROM words w
+            WHERE w.jamaican_patois LIKE ? ESCAPE '\\' OR w.english LIKE ? ESCAPE '\\'
+            """
+            count_params = (prefix, prefix)
+
+        # words_fts follows words, so both counts change only with words
+        rows, pagination = await conn.run(
+            paginate, query, params, ("prefix_rank", "score", "id"),
+            lambda row: (row[6], row[7], row[0]), page, page_size, cursor,
+            count_sql=count_query, count_params=count_params, count_tables=("words",)
+        )
+
+    words = [
+        (
+            *row[:6], row[7],
+            row[8] if match is not None else _mark_prefix(row[8], q),
+            row[9] if match is not None else _mark_prefix(row[9], q),
+        )
+        for row in rows
+    ]
+    return page_response("words", encode_objects(SEARCH_RESULT_COLUMNS, words), pagination, response.headers)
 
-@router.get("/words/{word_id}", response_model=Word, tags=["Words"])
-def get_word(word_id: int = Path(..., title="The ID of the word to retrieve")):
+@router.get("/words/{word_id}", response_model=Word, tags=["Words"],
+            dependencies=[cache_policy.depends_on("words", "word_stats")])
+async def get_word(response: Response, word_id: int = Path(..., title="The ID of the word to retrieve")):
     """
     Retrieve a word by its ID.
 
     - **word_id**: The ID of the word to retrieve.
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         query = """
-        SELECT w.id, w.jamaican_patois, w.english, w.parts,
-               COALESCE(SUM(CASE WHEN wr.correct THEN 1 ELSE 0 END), 0) AS correct_count,
-               COALESCE(SUM(CASE WHEN NOT wr.correct THEN 1 ELSE 0 END), 0) AS wrong_count
+        SELECT w.id, w.jamaican_patois, w.english,
+               CASE WHEN json_valid(w.parts) AND json_type(w.parts) = 'object' THEN w.parts END AS parts,
+               COALESCE(ws.correct_count, 0) AS correct_count,
+               COALESCE(ws.wrong_count, 0) AS wrong_count
         FROM words w
-        LEFT JOIN word_reviews wr ON w.id = wr.word_id
+        LEFT JOIN word_stats ws ON ws.word_id = w.id
         WHERE w.id = ?
-        GROUP BY w.id
         """
-        cursor = conn.execute(query, (word_id,))
-        row = cursor.fetchone()
+        row = await conn.fetchone(query, (word_id,))
         if not row:
             raise HTTPException(status_code=404, detail="Word not found")
-        
-        # Convert row to Word model
-        word = Word(
-            id=row[0],
-            jamaican_patois=row[1],
-            english=row[2],
-            parts=json.loads(row[3]) if row[3] else None,
-            correct_count=row[4],
-            wrong_count=row[5]
-        ).model_dump()
-        
-        return word 
 
-@router.get("/words/{word_id}/groups", response_model=PaginatedGroups, tags=["Words"])
-def get_word_groups(
+        return PrebuiltJSONResponse(encode_object(WORD_COLUMNS, row).encode(), headers=response.headers)
+
+@router.get("/words/{word_id}/groups", response_model=PaginatedGroups, tags=["Words"],
+            dependencies=[cache_policy.depends_on("groups", "word_groups")])
+async def get_word_groups(
     word_id: int = Path(..., title="The ID of the word to retrieve groups for"),
     page: int = Query(1, ge=1),
-    page_size: int = Query(10, ge=1, le=100)
+    page_size: int = Query(10, ge=1, le=100),
+    cursor: str = Query(None)
 ):
     """
     Retrieve a paginated list of groups that contain this word.
@@ -102,29 +231,37 @@ def get_word_groups(
     - **word_id**: The ID of the word to retrieve groups for
     - **page**: The page number to retrieve (default: 1)
     - **page_size**: The number of items per page (default: 10)
+    - **cursor**: Opaque `next_cursor` from a previous page; takes precedence over `page`
     """
-    with get_db_connection() as conn:
+    async with get_async_db_connection() as conn:
         # First check if the word exists
-        word_exists = conn.execute(
+        word_exists = await conn.fetchone(
             "SELECT 1 FROM words WHERE id = ?",
             (word_id,)
-        ).fetchone()
+        )
 
         if not word_exists:
             raise HTTPException(status_code=404, detail="Word not found")
 
         # Get groups for the word
         query = """
-        SELECT g.id, g.name,
-               (SELECT COUNT(*) FROM word_groups wg2 WHERE wg2.group_id = g.id) as word_count
+        SELECT g.id, g.name, g.word_count
         FROM groups g
         JOIN word_groups wg ON g.id = wg.group_id
-        WHERE wg.word_id = ?
+        WHERE wg.word_id = ? AND {keyset}
         """
         
-        paginated_query = paginate(query, page, page_size)
-        cursor = conn.execute(paginated_query, (word_id,))
-        rows = cursor.fetchall()
+        rows, pagination = await conn.run(
+            paginate, query, (word_id,), ("g.id",), lambda row: (row[0],),
+            page, page_size, cursor,
+            count_sql="""
+            SELECT COUNT(DISTINCT g.id)
+            FROM groups g
+            JOIN word_groups wg ON g.id = wg.group_id
+            WHERE wg.word_id = ?
+            """,
+            count_params=(word_id,), count_tables=("groups", "word_groups")
+        )
 
         if not rows:
             raise HTTPException(
@@ -143,25 +280,28 @@ def get_word_groups(
             for row in rows
         ]
 
-        # Get total count for pagination
-        total_items = conn.execute(
-            """
-            SELECT COUNT(DISTINCT g.id)
-            FROM groups g
-            JOIN word_groups wg ON g.id = wg.group_id
-            WHERE wg.word_id = ?
-            """,
-            (word_id,)
-        ).fetchone()[0]
-
-        total_pages = (total_items + page_size - 1) // page_size
-
         return {
             "groups": groups,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-                "items_per_page": page_size
-            }
-        } 
\ No newline at end of file
+            "pagination": pagination
+        }
+
+@router.post("/words/sync", response_model=SyncResult, tags=["Words"],
+             dependencies=[Depends(require_shared_database)])
+async def sync_words(request: Request):
+    """
+    Bulk upsert words in one transaction.
+
+    - **words**: `{"words": [{id?, jamaican_patois, english, parts}]}`, or NDJSON
+      (`Content-Type: application/x-ndjson`) with one word per line.
+      Either form may be sent with `Content-Encoding: gzip`.
+
+    Words with an `id` update that row; others match on `jamaican_patois` and `english`.
+    Returns how many words were inserted, updated and skipped (unchanged or duplicated).
+    """
+    words = validate_items(WordSync, await read_sync_items(request, "words"))
+    async with get_async_db_connection() as conn:
+        result = await conn.run(upsert_words, words)
+
+    if result["inserted"] or result["updated"]:
+        bump_data_version()
+    return result
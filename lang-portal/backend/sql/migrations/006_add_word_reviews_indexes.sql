@@ -0,0 +1,9 @@
+-- word_reviews(word_id) lookups are served by idx_word_reviews_word_id_created_at (migration 005)
+CREATE INDEX IF NOT EXISTS idx_word_reviews_word_id_created_at
+ON word_reviews (word_id, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_word_reviews_session_created_at
+ON word_reviews (study_session_id, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_word_reviews_created_at
+ON word_reviews (created_at);
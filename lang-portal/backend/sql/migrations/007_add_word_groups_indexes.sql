@@ -0,0 +1,5 @@
+CREATE INDEX IF NOT EXISTS idx_word_groups_group_word
+ON word_groups (group_id, word_id);
+
+CREATE INDEX IF NOT EXISTS idx_word_groups_word_group
+ON word_groups (word_id, group_id);
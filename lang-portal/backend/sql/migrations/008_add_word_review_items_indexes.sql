@@ -0,0 +1,2 @@
+CREATE INDEX IF NOT EXISTS idx_word_review_items_session_word
+ON word_review_items (study_session_id, word_id);
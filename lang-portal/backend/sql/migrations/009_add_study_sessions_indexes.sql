@@ -0,0 +1,8 @@
+CREATE INDEX IF NOT EXISTS idx_study_sessions_group_created_at
+ON study_sessions (group_id, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_study_sessions_created_at
+ON study_sessions (created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_study_activities_created_at
+ON study_activities (created_at, id);
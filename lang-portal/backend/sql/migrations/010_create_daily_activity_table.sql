@@ -0,0 +1,56 @@
+CREATE TABLE IF NOT EXISTS daily_activity (
+    day DATE PRIMARY KEY,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    reviews INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0
+);
+
+-- Roll study sessions up into daily_activity
+CREATE TRIGGER IF NOT EXISTS daily_activity_after_session_insert
+AFTER INSERT ON study_sessions
+BEGIN
+    INSERT INTO daily_activity (day, sessions) VALUES (date(NEW.created_at), 1)
+    ON CONFLICT (day) DO UPDATE SET sessions = sessions + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS daily_activity_after_session_delete
+AFTER DELETE ON study_sessions
+BEGIN
+    UPDATE daily_activity SET sessions = sessions - 1 WHERE day = date(OLD.created_at);
+END;
+
+-- Roll word reviews up into daily_activity
+CREATE TRIGGER IF NOT EXISTS daily_activity_after_review_insert
+AFTER INSERT ON word_reviews
+WHEN NEW.created_at IS NOT NULL
+BEGIN
+    INSERT INTO daily_activity (day, reviews, correct)
+    VALUES (date(NEW.created_at), 1, CASE WHEN NEW.correct THEN 1 ELSE 0 END)
+    ON CONFLICT (day) DO UPDATE SET
+        reviews = reviews + 1,
+        correct = correct + excluded.correct;
+END;
+
+CREATE TRIGGER IF NOT EXISTS daily_activity_after_review_delete
+AFTER DELETE ON word_reviews
+WHEN OLD.created_at IS NOT NULL
+BEGIN
+    UPDATE daily_activity SET
+        reviews = reviews - 1,
+        correct = correct - (CASE WHEN OLD.correct THEN 1 ELSE 0 END)
+    WHERE day = date(OLD.created_at);
+END;
+
+-- Backfill from existing sessions and reviews
+DELETE FROM daily_activity;
+INSERT INTO daily_activity (day, sessions, reviews, correct)
+SELECT day, SUM(sessions), SUM(reviews), SUM(correct)
+FROM (
+    SELECT date(created_at) AS day, 1 AS sessions, 0 AS reviews, 0 AS correct
+    FROM study_sessions
+    UNION ALL
+    SELECT date(created_at), 0, 1, CASE WHEN correct THEN 1 ELSE 0 END
+    FROM word_reviews
+)
+WHERE day IS NOT NULL
+GROUP BY day;
@@ -0,0 +1,5 @@
+CREATE INDEX IF NOT EXISTS idx_words_patois_english
+ON words (jamaican_patois, english);
+
+CREATE INDEX IF NOT EXISTS idx_groups_name
+ON groups (name);
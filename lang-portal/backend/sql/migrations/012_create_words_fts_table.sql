@@ -0,0 +1,34 @@
+CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+    jamaican_patois,
+    english,
+    content = 'words',
+    content_rowid = 'id',
+    tokenize = 'trigram'
+);
+
+-- Keep the external-content index in step with words
+CREATE TRIGGER IF NOT EXISTS words_fts_after_insert
+AFTER INSERT ON words
+BEGIN
+    INSERT INTO words_fts (rowid, jamaican_patois, english)
+    VALUES (NEW.id, NEW.jamaican_patois, NEW.english);
+END;
+
+CREATE TRIGGER IF NOT EXISTS words_fts_after_delete
+AFTER DELETE ON words
+BEGIN
+    INSERT INTO words_fts (words_fts, rowid, jamaican_patois, english)
+    VALUES ('delete', OLD.id, OLD.jamaican_patois, OLD.english);
+END;
+
+CREATE TRIGGER IF NOT EXISTS words_fts_after_update
+AFTER UPDATE OF id, jamaican_patois, english ON words
+BEGIN
+    INSERT INTO words_fts (words_fts, rowid, jamaican_patois, english)
+    VALUES ('delete', OLD.id, OLD.jamaican_patois, OLD.english);
+    INSERT INTO words_fts (rowid, jamaican_patois, english)
+    VALUES (NEW.id, NEW.jamaican_patois, NEW.english);
+END;
+
+-- Index the words that existed before the table was created
+INSERT INTO words_fts (words_fts) VALUES ('rebuild');
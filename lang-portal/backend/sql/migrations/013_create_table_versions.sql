@@ -0,0 +1,198 @@
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO table_versions (table_name) VALUES
+    ('words'),
+    ('groups'),
+    ('word_groups'),
+    ('word_stats'),
+    ('word_reviews'),
+    ('word_review_items'),
+    ('study_sessions'),
+    ('study_activities'),
+    ('daily_activity'),
+    ('user_settings');
+
+-- Bump a table's version on every write, so responses built from it can be
+-- revalidated with an ETag without re-running their queries
+CREATE TRIGGER IF NOT EXISTS table_versions_after_words_insert
+AFTER INSERT ON words
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'words';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_words_update
+AFTER UPDATE ON words
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'words';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_words_delete
+AFTER DELETE ON words
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'words';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_groups_insert
+AFTER INSERT ON groups
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'groups';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_groups_update
+AFTER UPDATE ON groups
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'groups';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_groups_delete
+AFTER DELETE ON groups
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'groups';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_groups_insert
+AFTER INSERT ON word_groups
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_groups';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_groups_update
+AFTER UPDATE ON word_groups
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_groups';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_groups_delete
+AFTER DELETE ON word_groups
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_groups';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_stats_insert
+AFTER INSERT ON word_stats
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_stats';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_stats_update
+AFTER UPDATE ON word_stats
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_stats';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_stats_delete
+AFTER DELETE ON word_stats
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_stats';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_reviews_insert
+AFTER INSERT ON word_reviews
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_reviews';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_reviews_update
+AFTER UPDATE ON word_reviews
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_reviews';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_reviews_delete
+AFTER DELETE ON word_reviews
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_reviews';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_review_items_insert
+AFTER INSERT ON word_review_items
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_review_items';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_review_items_update
+AFTER UPDATE ON word_review_items
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_review_items';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_word_review_items_delete
+AFTER DELETE ON word_review_items
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'word_review_items';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_study_sessions_insert
+AFTER INSERT ON study_sessions
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'study_sessions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_study_sessions_update
+AFTER UPDATE ON study_sessions
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'study_sessions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_study_sessions_delete
+AFTER DELETE ON study_sessions
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'study_sessions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_study_activities_insert
+AFTER INSERT ON study_activities
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'study_activities';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_study_activities_update
+AFTER UPDATE ON study_activities
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'study_activities';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_study_activities_delete
+AFTER DELETE ON study_activities
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'study_activities';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_daily_activity_insert
+AFTER INSERT ON daily_activity
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'daily_activity';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_daily_activity_update
+AFTER UPDATE ON daily_activity
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'daily_activity';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_daily_activity_delete
+AFTER DELETE ON daily_activity
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'daily_activity';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_user_settings_insert
+AFTER INSERT ON user_settings
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'user_settings';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_user_settings_update
+AFTER UPDATE ON user_settings
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'user_settings';
+END;
+
+CREATE TRIGGER IF NOT EXISTS table_versions_after_user_settings_delete
+AFTER DELETE ON user_settings
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'user_settings';
+END;
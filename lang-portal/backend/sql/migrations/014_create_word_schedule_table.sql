@@ -0,0 +1,92 @@
+CREATE TABLE IF NOT EXISTS word_schedule (
+    word_id INTEGER PRIMARY KEY,
+    ease_factor REAL NOT NULL DEFAULT 2.5,
+    interval_hours REAL NOT NULL DEFAULT 0,
+    repetitions INTEGER NOT NULL DEFAULT 0,
+    lapses INTEGER NOT NULL DEFAULT 0,
+    last_reviewed_at DATETIME NOT NULL,
+    due_at DATETIME NOT NULL,
+    FOREIGN KEY (word_id) REFERENCES words(id)
+);
+
+-- Walked in due order when picking the next words to study
+CREATE INDEX IF NOT EXISTS idx_word_schedule_due_at
+ON word_schedule (due_at, word_id);
+
+-- SM-2 step on every review. A correct answer counts as quality 5 (ease +0.10,
+-- recovering up to the initial 2.5) and a wrong one as quality 2 (ease -0.32,
+-- never below 1.3). Intervals start
+-- at user_settings.review_interval hours, then six times that, then grow by the
+-- ease factor; a wrong answer starts the word over. Reviews older than the
+-- word's latest scheduled review are ignored.
+CREATE TRIGGER IF NOT EXISTS word_schedule_after_review_insert
+AFTER INSERT ON word_reviews
+WHEN NEW.created_at IS NOT NULL
+BEGIN
+    INSERT OR REPLACE INTO word_schedule (
+        word_id, ease_factor, interval_hours, repetitions, lapses, last_reviewed_at, due_at
+    )
+    SELECT word_id, ease_factor, interval_hours, repetitions, lapses, reviewed_at,
+           datetime(reviewed_at, '+' || interval_hours || ' hours')
+    FROM (
+        SELECT NEW.word_id AS word_id,
+               datetime(NEW.created_at) AS reviewed_at,
+               ease_factor,
+               CASE WHEN NEW.correct THEN repetitions + 1 ELSE 0 END AS repetitions,
+               lapses + (CASE WHEN NEW.correct THEN 0 ELSE 1 END) AS lapses,
+               CASE
+                   WHEN NOT NEW.correct OR repetitions = 0 THEN base_hours
+                   WHEN repetitions = 1 THEN base_hours * 6
+                   ELSE interval_hours * ease_factor
+               END AS interval_hours
+        FROM (
+            SELECT CASE WHEN NEW.correct THEN MIN(2.5, COALESCE(s.ease_factor, 2.5) + 0.1)
+                        ELSE MAX(1.3, COALESCE(s.ease_factor, 2.5) - 0.32) END AS ease_factor,
+                   COALESCE(s.repetitions, 0) AS repetitions,
+                   COALESCE(s.lapses, 0) AS lapses,
+                   COALESCE(s.interval_hours, 0) AS interval_hours,
+                   COALESCE((SELECT review_interval FROM user_settings WHERE id = 1), 24) AS base_hours
+            FROM (SELECT 1)
+            LEFT JOIN word_schedule s ON s.word_id = NEW.word_id
+        )
+    )
+    WHERE NOT EXISTS (
+        SELECT 1 FROM word_schedule
+        WHERE word_id = NEW.word_id AND last_reviewed_at > datetime(NEW.created_at)
+    );
+END;
+
+-- Backfill from existing reviews. Replaying every review in order is not
+-- possible in plain SQL, so each word starts from its totals: the trailing run
+-- of correct answers as repetitions and ease adjusted once per answer.
+INSERT OR IGNORE INTO word_schedule (
+    word_id, ease_factor, interval_hours, repetitions, lapses, last_reviewed_at, due_at
+)
+SELECT word_id, ease_factor, interval_hours, repetitions, lapses, last_reviewed_at,
+       datetime(last_reviewed_at, '+' || interval_hours || ' hours')
+FROM (
+    SELECT word_id, ease_factor, repetitions, lapses, last_reviewed_at,
+           CASE
+               WHEN repetitions <= 1 THEN base_hours
+               WHEN repetitions = 2 THEN base_hours * 6
+               ELSE base_hours * 6 * ease_factor
+           END AS interval_hours
+    FROM (
+        SELECT r.word_id,
+               MAX(1.3, MIN(2.5, 2.5 + 0.1 * SUM(r.correct) - 0.32 * SUM(NOT r.correct))) AS ease_factor,
+               SUM(NOT r.correct) AS lapses,
+               datetime(MAX(r.created_at)) AS last_reviewed_at,
+               (
+                   SELECT COUNT(*) FROM word_reviews later
+                   WHERE later.word_id = r.word_id
+                     AND later.created_at > COALESCE((
+                         SELECT MAX(wrong.created_at) FROM word_reviews wrong
+                         WHERE wrong.word_id = r.word_id AND NOT wrong.correct
+                     ), '')
+               ) AS repetitions,
+               COALESCE((SELECT review_interval FROM user_settings WHERE id = 1), 24) AS base_hours
+        FROM word_reviews r
+        WHERE r.created_at IS NOT NULL
+        GROUP BY r.word_id
+    )
+);
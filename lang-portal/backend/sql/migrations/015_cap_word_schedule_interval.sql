@@ -0,0 +1,47 @@
+-- Intervals grew by the ease factor without bound, so after about fifteen
+-- straight correct answers due_at overflowed to NULL and the review insert failed
+DROP TRIGGER IF EXISTS word_schedule_after_review_insert;
+
+-- SM-2 step on every review. A correct answer counts as quality 5 (ease +0.10,
+-- recovering up to the initial 2.5) and a wrong one as quality 2 (ease -0.32,
+-- never below 1.3). Intervals start
+-- at user_settings.review_interval hours, then six times that, then grow by the
+-- ease factor up to 100 years (876000 hours), which keeps due_at inside SQLite's
+-- date range; a wrong answer starts the word over. Reviews older than the
+-- word's latest scheduled review are ignored.
+CREATE TRIGGER word_schedule_after_review_insert
+AFTER INSERT ON word_reviews
+WHEN NEW.created_at IS NOT NULL
+BEGIN
+    INSERT OR REPLACE INTO word_schedule (
+        word_id, ease_factor, interval_hours, repetitions, lapses, last_reviewed_at, due_at
+    )
+    SELECT word_id, ease_factor, interval_hours, repetitions, lapses, reviewed_at,
+           datetime(reviewed_at, '+' || interval_hours || ' hours')
+    FROM (
+        SELECT NEW.word_id AS word_id,
+               datetime(NEW.created_at) AS reviewed_at,
+               ease_factor,
+               CASE WHEN NEW.correct THEN repetitions + 1 ELSE 0 END AS repetitions,
+               lapses + (CASE WHEN NEW.correct THEN 0 ELSE 1 END) AS lapses,
+               CASE
+                   WHEN NOT NEW.correct OR repetitions = 0 THEN base_hours
+                   WHEN repetitions = 1 THEN base_hours * 6
+                   ELSE MIN(876000, interval_hours * ease_factor)
+               END AS interval_hours
+        FROM (
+            SELECT CASE WHEN NEW.correct THEN MIN(2.5, COALESCE(s.ease_factor, 2.5) + 0.1)
+                        ELSE MAX(1.3, COALESCE(s.ease_factor, 2.5) - 0.32) END AS ease_factor,
+                   COALESCE(s.repetitions, 0) AS repetitions,
+                   COALESCE(s.lapses, 0) AS lapses,
+                   COALESCE(s.interval_hours, 0) AS interval_hours,
+                   COALESCE((SELECT review_interval FROM user_settings WHERE id = 1), 24) AS base_hours
+            FROM (SELECT 1)
+            LEFT JOIN word_schedule s ON s.word_id = NEW.word_id
+        )
+    )
+    WHERE NOT EXISTS (
+        SELECT 1 FROM word_schedule
+        WHERE word_id = NEW.word_id AND last_reviewed_at > datetime(NEW.created_at)
+    );
+END;
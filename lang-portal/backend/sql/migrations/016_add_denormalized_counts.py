@@ -0,0 +1,185 @@
+"""
+Store each group's word count and each study session's review item count
+on the row itself, kept exact by triggers, so list endpoints stop running
+a correlated COUNT(*) for every row they return.
+"""
+from lib.db import get_db_connection
+
+COLUMNS = (
+    ("groups", "word_count"),
+    ("study_sessions", "review_items_count"),
+)
+
+TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS groups_word_count_after_word_group_insert
+AFTER INSERT ON word_groups
+BEGIN
+    UPDATE groups SET word_count = word_count + 1 WHERE id = NEW.group_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS groups_word_count_after_word_group_delete
+AFTER DELETE ON word_groups
+BEGIN
+    UPDATE groups SET word_count = word_count - 1 WHERE id = OLD.group_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS groups_word_count_after_word_group_update
+AFTER UPDATE OF group_id ON word_groups
+WHEN OLD.group_id IS NOT NEW.group_id
+BEGIN
+    UPDATE groups SET word_count = word_count - 1 WHERE id = OLD.group_id;
+    UPDATE groups SET word_count = word_count + 1 WHERE id = NEW.group_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS groups_word_count_after_group_insert
+AFTER INSERT ON groups
+WHEN EXISTS (SELECT 1 FROM word_groups WHERE group_id = NEW.id)
+BEGIN
+    UPDATE groups SET word_count = (SELECT COUNT(*) FROM word_groups WHERE group_id = NEW.id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS study_sessions_review_items_count_after_item_insert
+AFTER INSERT ON word_review_items
+BEGIN
+    UPDATE study_sessions SET review_items_count = review_items_count + 1
+    WHERE id = NEW.study_session_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS study_sessions_review_items_count_after_item_delete
+AFTER DELETE ON word_review_items
+BEGIN
+    UPDATE study_sessions SET review_items_count = review_items_count - 1
+    WHERE id = OLD.study_session_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS study_sessions_review_items_count_after_item_update
+AFTER UPDATE OF study_session_id ON word_review_items
+WHEN OLD.study_session_id IS NOT NEW.study_session_id
+BEGIN
+    UPDATE study_sessions SET review_items_count = review_items_count - 1
+    WHERE id = OLD.study_session_id;
+    UPDATE study_sessions SET review_items_count = review_items_count + 1
+    WHERE id = NEW.study_session_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS study_sessions_review_items_count_after_session_insert
+AFTER INSERT ON study_sessions
+WHEN EXISTS (SELECT 1 FROM word_review_items WHERE study_session_id = NEW.id)
+BEGIN
+    UPDATE study_sessions SET review_items_count = (
+        SELECT COUNT(*) FROM word_review_items WHERE study_session_id = NEW.id
+    )
+    WHERE id = NEW.id;
+END;
+"""
+
+# Counter updates follow a child table that the responses showing them
+# already depend on, so they should not bump the parent's version too
+VERSION_TRIGGERS = """
+DROP TRIGGER IF EXISTS table_versions_after_groups_update;
+CREATE TRIGGER table_versions_after_groups_update
+AFTER UPDATE OF id, name ON groups
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'groups';
+END;
+
+DROP TRIGGER IF EXISTS table_versions_after_study_sessions_update;
+CREATE TRIGGER table_versions_after_study_sessions_update
+AFTER UPDATE OF id, group_id, created_at, study_activity_id ON study_sessions
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'study_sessions';
+END;
+"""
+
+PREVIOUS_VERSION_TRIGGERS = """
+DROP TRIGGER IF EXISTS table_versions_after_groups_update;
+CREATE TRIGGER table_versions_after_groups_update
+AFTER UPDATE ON groups
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'groups';
+END;
+
+DROP TRIGGER IF EXISTS table_versions_after_study_sessions_update;
+CREATE TRIGGER table_versions_after_study_sessions_update
+AFTER UPDATE ON study_sessions
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'study_sessions';
+END;
+"""
+
+TRIGGER_NAMES = [
+    "groups_word_count_after_word_group_insert",
+    "groups_word_count_after_word_group_delete",
+    "groups_word_count_after_word_group_update",
+    "groups_word_count_after_group_insert",
+    "study_sessions_review_items_count_after_item_insert",
+    "study_sessions_review_items_count_after_item_delete",
+    "study_sessions_review_items_count_after_item_update",
+    "study_sessions_review_items_count_after_session_insert",
+]
+
+# Recount one rowid range, writing only the rows that are off
+BACKFILL = {
+    "groups": """
+        UPDATE groups SET word_count = counted.n
+        FROM (
+            SELECT g.id, (SELECT COUNT(*) FROM word_groups wg WHERE wg.group_id = g.id) AS n
+            FROM groups g
+            WHERE g.rowid >= :start AND g.rowid < :end
+        ) counted
+        WHERE groups.id = counted.id AND groups.word_count != counted.n
+    """,
+    "study_sessions": """
+        UPDATE study_sessions SET review_items_count = counted.n
+        FROM (
+            SELECT ss.id,
+                   (SELECT COUNT(*) FROM word_review_items wri WHERE wri.study_session_id = ss.id) AS n
+            FROM study_sessions ss
+            WHERE ss.rowid >= :start AND ss.rowid < :end
+        ) counted
+        WHERE study_sessions.id = counted.id AND study_sessions.review_items_count != counted.n
+    """,
+}
+
+MISMATCHES = {
+    "groups": """
+        SELECT COUNT(*) FROM groups g
+        WHERE g.word_count != (SELECT COUNT(*) FROM word_groups wg WHERE wg.group_id = g.id)
+    """,
+    "study_sessions": """
+        SELECT COUNT(*) FROM study_sessions ss
+        WHERE ss.review_items_count
+              != (SELECT COUNT(*) FROM word_review_items wri WHERE wri.study_session_id = ss.id)
+    """,
+}
+
+
+def _columns(db_name, table):
+    with get_db_connection(db_name) as conn:
+        return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def upgrade(ctx):
+    for table, column in COLUMNS:
+        if column not in _columns(ctx.db_name, table):
+            ctx.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+
+    # Triggers first, so rows written during the backfill stay exact
+    ctx.executescript(TRIGGERS + VERSION_TRIGGERS)
+    for table, sql in BACKFILL.items():
+        ctx.backfill(table, sql)
+
+    with get_db_connection(ctx.db_name) as conn:
+        wrong = {table: conn.execute(sql).fetchone()[0] for table, sql in MISMATCHES.items()}
+    if any(wrong.values()):
+        raise RuntimeError(f"Denormalized counts disagree after the backfill: {wrong}")
+    ctx.progress(f"  {ctx.name}: counts verified")
+
+
+def downgrade(ctx):
+    ctx.executescript(
+        "".join(f"DROP TRIGGER IF EXISTS {name};\n" for name in TRIGGER_NAMES)
+        + PREVIOUS_VERSION_TRIGGERS
+        + "".join(f"ALTER TABLE {table} DROP COLUMN {column};\n" for table, column in COLUMNS)
+    )
@@ -0,0 +1,15 @@
+-- Part of speech and usage from words.parts, so word lists can filter on them
+-- with an index. Virtual: computed on read, stored only in the indexes.
+-- Rows whose parts is not valid JSON get NULL rather than failing the write.
+ALTER TABLE words ADD COLUMN part_type TEXT
+GENERATED ALWAYS AS (CASE WHEN json_valid(parts) THEN json_extract(parts, '$.type') END) VIRTUAL;
+
+ALTER TABLE words ADD COLUMN part_usage TEXT
+GENERATED ALWAYS AS (CASE WHEN json_valid(parts) THEN json_extract(parts, '$.usage') END) VIRTUAL;
+
+-- Filtered lists page in id order within one value
+CREATE INDEX IF NOT EXISTS idx_words_part_type
+ON words (part_type, id);
+
+CREATE INDEX IF NOT EXISTS idx_words_part_usage
+ON words (part_usage, id);
@@ -0,0 +1,90 @@
+-- The session triggers wrote a NULL day for a session without a parsable
+-- created_at, and moving a session or review to another day left it counted
+-- on the old one
+DROP TRIGGER IF EXISTS daily_activity_after_session_insert;
+DROP TRIGGER IF EXISTS daily_activity_after_session_delete;
+DROP TRIGGER IF EXISTS daily_activity_after_session_update;
+DROP TRIGGER IF EXISTS daily_activity_after_review_insert;
+DROP TRIGGER IF EXISTS daily_activity_after_review_delete;
+DROP TRIGGER IF EXISTS daily_activity_after_review_update;
+
+-- Roll study sessions up into daily_activity. A session whose created_at is not
+-- a date has no day and is left out, as in the backfill.
+CREATE TRIGGER daily_activity_after_session_insert
+AFTER INSERT ON study_sessions
+WHEN date(NEW.created_at) IS NOT NULL
+BEGIN
+    INSERT INTO daily_activity (day, sessions) VALUES (date(NEW.created_at), 1)
+    ON CONFLICT (day) DO UPDATE SET sessions = sessions + 1;
+END;
+
+CREATE TRIGGER daily_activity_after_session_delete
+AFTER DELETE ON study_sessions
+WHEN date(OLD.created_at) IS NOT NULL
+BEGIN
+    UPDATE daily_activity SET sessions = sessions - 1 WHERE day = date(OLD.created_at);
+END;
+
+-- A session moved to another day counts on the new day only
+CREATE TRIGGER daily_activity_after_session_update
+AFTER UPDATE OF created_at ON study_sessions
+WHEN date(OLD.created_at) IS NOT date(NEW.created_at)
+BEGIN
+    UPDATE daily_activity SET sessions = sessions - 1 WHERE day = date(OLD.created_at);
+    INSERT INTO daily_activity (day, sessions)
+    SELECT date(NEW.created_at), 1 WHERE date(NEW.created_at) IS NOT NULL
+    ON CONFLICT (day) DO UPDATE SET sessions = sessions + 1;
+END;
+
+-- Roll word reviews up into daily_activity. Reviews whose created_at is
+-- NULL or not a date have no day and are left out, as in the backfill.
+CREATE TRIGGER daily_activity_after_review_insert
+AFTER INSERT ON word_reviews
+WHEN date(NEW.created_at) IS NOT NULL
+BEGIN
+    INSERT INTO daily_activity (day, reviews, correct)
+    VALUES (date(NEW.created_at), 1, CASE WHEN NEW.correct THEN 1 ELSE 0 END)
+    ON CONFLICT (day) DO UPDATE SET
+        reviews = reviews + 1,
+        correct = correct + excluded.correct;
+END;
+
+CREATE TRIGGER daily_activity_after_review_delete
+AFTER DELETE ON word_reviews
+WHEN date(OLD.created_at) IS NOT NULL
+BEGIN
+    UPDATE daily_activity SET
+        reviews = reviews - 1,
+        correct = correct - (CASE WHEN OLD.correct THEN 1 ELSE 0 END)
+    WHERE day = date(OLD.created_at);
+END;
+
+-- An edited review is taken off its old day and counted again on its new one
+CREATE TRIGGER daily_activity_after_review_update
+AFTER UPDATE OF created_at, correct ON word_reviews
+BEGIN
+    UPDATE daily_activity SET
+        reviews = reviews - 1,
+        correct = correct - (CASE WHEN OLD.correct THEN 1 ELSE 0 END)
+    WHERE day = date(OLD.created_at);
+    INSERT INTO daily_activity (day, reviews, correct)
+    SELECT date(NEW.created_at), 1, CASE WHEN NEW.correct THEN 1 ELSE 0 END
+    WHERE date(NEW.created_at) IS NOT NULL
+    ON CONFLICT (day) DO UPDATE SET
+        reviews = reviews + 1,
+        correct = correct + excluded.correct;
+END;
+
+-- Recount, dropping any rows the old triggers left without a day
+DELETE FROM daily_activity;
+INSERT INTO daily_activity (day, sessions, reviews, correct)
+SELECT day, SUM(sessions), SUM(reviews), SUM(correct)
+FROM (
+    SELECT date(created_at) AS day, 1 AS sessions, 0 AS reviews, 0 AS correct
+    FROM study_sessions
+    UNION ALL
+    SELECT date(created_at), 0, 1, CASE WHEN correct THEN 1 ELSE 0 END
+    FROM word_reviews
+)
+WHERE day IS NOT NULL
+GROUP BY day;
@@ -0,0 +1,5 @@
+DROP TRIGGER IF EXISTS word_stats_after_review_insert;
+DROP TRIGGER IF EXISTS word_stats_after_review_delete;
+DROP TRIGGER IF EXISTS word_stats_after_review_update;
+DROP INDEX IF EXISTS idx_word_reviews_word_id_created_at;
+DROP TABLE IF EXISTS word_stats;
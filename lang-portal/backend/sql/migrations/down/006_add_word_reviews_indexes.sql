@@ -0,0 +1,2 @@
+DROP INDEX IF EXISTS idx_word_reviews_session_created_at;
+DROP INDEX IF EXISTS idx_word_reviews_created_at;
@@ -0,0 +1,2 @@
+DROP INDEX IF EXISTS idx_word_groups_group_word;
+DROP INDEX IF EXISTS idx_word_groups_word_group;
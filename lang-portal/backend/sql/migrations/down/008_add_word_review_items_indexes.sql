@@ -0,0 +1 @@
+DROP INDEX IF EXISTS idx_word_review_items_session_word;
@@ -0,0 +1,3 @@
+DROP INDEX IF EXISTS idx_study_sessions_group_created_at;
+DROP INDEX IF EXISTS idx_study_sessions_created_at;
+DROP INDEX IF EXISTS idx_study_activities_created_at;
@@ -0,0 +1,5 @@
+DROP TRIGGER IF EXISTS daily_activity_after_session_insert;
+DROP TRIGGER IF EXISTS daily_activity_after_session_delete;
+DROP TRIGGER IF EXISTS daily_activity_after_review_insert;
+DROP TRIGGER IF EXISTS daily_activity_after_review_delete;
+DROP TABLE IF EXISTS daily_activity;
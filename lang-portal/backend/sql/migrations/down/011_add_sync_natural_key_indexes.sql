@@ -0,0 +1,2 @@
+DROP INDEX IF EXISTS idx_words_patois_english;
+DROP INDEX IF EXISTS idx_groups_name;
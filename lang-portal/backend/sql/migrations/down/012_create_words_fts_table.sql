@@ -0,0 +1,4 @@
+DROP TRIGGER IF EXISTS words_fts_after_insert;
+DROP TRIGGER IF EXISTS words_fts_after_delete;
+DROP TRIGGER IF EXISTS words_fts_after_update;
+DROP TABLE IF EXISTS words_fts;
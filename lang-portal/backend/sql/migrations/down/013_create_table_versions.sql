@@ -0,0 +1,31 @@
+DROP TRIGGER IF EXISTS table_versions_after_words_insert;
+DROP TRIGGER IF EXISTS table_versions_after_words_update;
+DROP TRIGGER IF EXISTS table_versions_after_words_delete;
+DROP TRIGGER IF EXISTS table_versions_after_groups_insert;
+DROP TRIGGER IF EXISTS table_versions_after_groups_update;
+DROP TRIGGER IF EXISTS table_versions_after_groups_delete;
+DROP TRIGGER IF EXISTS table_versions_after_word_groups_insert;
+DROP TRIGGER IF EXISTS table_versions_after_word_groups_update;
+DROP TRIGGER IF EXISTS table_versions_after_word_groups_delete;
+DROP TRIGGER IF EXISTS table_versions_after_word_stats_insert;
+DROP TRIGGER IF EXISTS table_versions_after_word_stats_update;
+DROP TRIGGER IF EXISTS table_versions_after_word_stats_delete;
+DROP TRIGGER IF EXISTS table_versions_after_word_reviews_insert;
+DROP TRIGGER IF EXISTS table_versions_after_word_reviews_update;
+DROP TRIGGER IF EXISTS table_versions_after_word_reviews_delete;
+DROP TRIGGER IF EXISTS table_versions_after_word_review_items_insert;
+DROP TRIGGER IF EXISTS table_versions_after_word_review_items_update;
+DROP TRIGGER IF EXISTS table_versions_after_word_review_items_delete;
+DROP TRIGGER IF EXISTS table_versions_after_study_sessions_insert;
+DROP TRIGGER IF EXISTS table_versions_after_study_sessions_update;
+DROP TRIGGER IF EXISTS table_versions_after_study_sessions_delete;
+DROP TRIGGER IF EXISTS table_versions_after_study_activities_insert;
+DROP TRIGGER IF EXISTS table_versions_after_study_activities_update;
+DROP TRIGGER IF EXISTS table_versions_after_study_activities_delete;
+DROP TRIGGER IF EXISTS table_versions_after_daily_activity_insert;
+DROP TRIGGER IF EXISTS table_versions_after_daily_activity_update;
+DROP TRIGGER IF EXISTS table_versions_after_daily_activity_delete;
+DROP TRIGGER IF EXISTS table_versions_after_user_settings_insert;
+DROP TRIGGER IF EXISTS table_versions_after_user_settings_update;
+DROP TRIGGER IF EXISTS table_versions_after_user_settings_delete;
+DROP TABLE IF EXISTS table_versions;
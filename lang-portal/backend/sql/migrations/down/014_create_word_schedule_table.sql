@@ -0,0 +1,3 @@
+DROP TRIGGER IF EXISTS word_schedule_after_review_insert;
+DROP INDEX IF EXISTS idx_word_schedule_due_at;
+DROP TABLE IF EXISTS word_schedule;
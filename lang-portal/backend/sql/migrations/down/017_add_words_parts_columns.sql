@@ -0,0 +1,4 @@
+DROP INDEX IF EXISTS idx_words_part_type;
+DROP INDEX IF EXISTS idx_words_part_usage;
+ALTER TABLE words DROP COLUMN part_type;
+ALTER TABLE words DROP COLUMN part_usage;
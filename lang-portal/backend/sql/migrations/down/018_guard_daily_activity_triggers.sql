@@ -0,0 +1,43 @@
+DROP TRIGGER IF EXISTS daily_activity_after_session_insert;
+DROP TRIGGER IF EXISTS daily_activity_after_session_delete;
+DROP TRIGGER IF EXISTS daily_activity_after_session_update;
+DROP TRIGGER IF EXISTS daily_activity_after_review_insert;
+DROP TRIGGER IF EXISTS daily_activity_after_review_delete;
+DROP TRIGGER IF EXISTS daily_activity_after_review_update;
+
+-- Roll study sessions up into daily_activity
+CREATE TRIGGER daily_activity_after_session_insert
+AFTER INSERT ON study_sessions
+BEGIN
+    INSERT INTO daily_activity (day, sessions) VALUES (date(NEW.created_at), 1)
+    ON CONFLICT (day) DO UPDATE SET sessions = sessions + 1;
+END;
+
+CREATE TRIGGER daily_activity_after_session_delete
+AFTER DELETE ON study_sessions
+BEGIN
+    UPDATE daily_activity SET sessions = sessions - 1 WHERE day = date(OLD.created_at);
+END;
+
+-- Roll word reviews up into daily_activity
+CREATE TRIGGER daily_activity_after_review_insert
+AFTER INSERT ON word_reviews
+WHEN NEW.created_at IS NOT NULL
+BEGIN
+    INSERT INTO daily_activity (day, reviews, correct)
+    VALUES (date(NEW.created_at), 1, CASE WHEN NEW.correct THEN 1 ELSE 0 END)
+    ON CONFLICT (day) DO UPDATE SET
+        reviews = reviews + 1,
+        correct = correct + excluded.correct;
+END;
+
+CREATE TRIGGER daily_activity_after_review_delete
+AFTER DELETE ON word_reviews
+WHEN OLD.created_at IS NOT NULL
+BEGIN
+    UPDATE daily_activity SET
+        reviews = reviews - 1,
+        correct = correct - (CASE WHEN OLD.correct THEN 1 ELSE 0 END)
+    WHERE day = date(OLD.created_at);
+END;
+
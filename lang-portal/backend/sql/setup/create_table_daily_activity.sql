@@ -0,0 +1,6 @@
+CREATE TABLE IF NOT EXISTS daily_activity (
+    day DATE PRIMARY KEY,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    reviews INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0
+);
@@ -1,4 +1,5 @@
 CREATE TABLE IF NOT EXISTS groups (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT NOT NULL
+    name TEXT NOT NULL,
+    word_count INTEGER NOT NULL DEFAULT 0
 );
\ No newline at end of file
@@ -2,5 +2,6 @@ CREATE TABLE IF NOT EXISTS study_sessions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     group_id INTEGER NOT NULL,
     created_at DATETIME NOT NULL,
-    study_activity_id INTEGER NOT NULL
+    study_activity_id INTEGER NOT NULL,
+    review_items_count INTEGER NOT NULL DEFAULT 0
 );
\ No newline at end of file
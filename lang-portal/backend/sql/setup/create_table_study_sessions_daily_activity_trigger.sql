@@ -0,0 +1,27 @@
+-- Roll study sessions up into daily_activity. A session whose created_at is not
+-- a date has no day and is left out, as in the backfill.
+CREATE TRIGGER IF NOT EXISTS daily_activity_after_session_insert
+AFTER INSERT ON study_sessions
+WHEN date(NEW.created_at) IS NOT NULL
+BEGIN
+    INSERT INTO daily_activity (day, sessions) VALUES (date(NEW.created_at), 1)
+    ON CONFLICT (day) DO UPDATE SET sessions = sessions + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS daily_activity_after_session_delete
+AFTER DELETE ON study_sessions
+WHEN date(OLD.created_at) IS NOT NULL
+BEGIN
+    UPDATE daily_activity SET sessions = sessions - 1 WHERE day = date(OLD.created_at);
+END;
+
+-- A session moved to another day counts on the new day only
+CREATE TRIGGER IF NOT EXISTS daily_activity_after_session_update
+AFTER UPDATE OF created_at ON study_sessions
+WHEN date(OLD.created_at) IS NOT date(NEW.created_at)
+BEGIN
+    UPDATE daily_activity SET sessions = sessions - 1 WHERE day = date(OLD.created_at);
+    INSERT INTO daily_activity (day, sessions)
+    SELECT date(NEW.created_at), 1 WHERE date(NEW.created_at) IS NOT NULL
+    ON CONFLICT (day) DO UPDATE SET sessions = sessions + 1;
+END;
@@ -0,0 +1,16 @@
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO table_versions (table_name) VALUES
+    ('words'),
+    ('groups'),
+    ('word_groups'),
+    ('word_stats'),
+    ('word_reviews'),
+    ('word_review_items'),
+    ('study_sessions'),
+    ('study_activities'),
+    ('daily_activity'),
+    ('user_settings');
@@ -0,0 +1,38 @@
+-- Roll word reviews up into daily_activity. Reviews whose created_at is
+-- NULL or not a date have no day and are left out, as in the backfill.
+CREATE TRIGGER IF NOT EXISTS daily_activity_after_review_insert
+AFTER INSERT ON word_reviews
+WHEN date(NEW.created_at) IS NOT NULL
+BEGIN
+    INSERT INTO daily_activity (day, reviews, correct)
+    VALUES (date(NEW.created_at), 1, CASE WHEN NEW.correct THEN 1 ELSE 0 END)
+    ON CONFLICT (day) DO UPDATE SET
+        reviews = reviews + 1,
+        correct = correct + excluded.correct;
+END;
+
+CREATE TRIGGER IF NOT EXISTS daily_activity_after_review_delete
+AFTER DELETE ON word_reviews
+WHEN date(OLD.created_at) IS NOT NULL
+BEGIN
+    UPDATE daily_activity SET
+        reviews = reviews - 1,
+        correct = correct - (CASE WHEN OLD.correct THEN 1 ELSE 0 END)
+    WHERE day = date(OLD.created_at);
+END;
+
+-- An edited review is taken off its old day and counted again on its new one
+CREATE TRIGGER IF NOT EXISTS daily_activity_after_review_update
+AFTER UPDATE OF created_at, correct ON word_reviews
+BEGIN
+    UPDATE daily_activity SET
+        reviews = reviews - 1,
+        correct = correct - (CASE WHEN OLD.correct THEN 1 ELSE 0 END)
+    WHERE day = date(OLD.created_at);
+    INSERT INTO daily_activity (day, reviews, correct)
+    SELECT date(NEW.created_at), 1, CASE WHEN NEW.correct THEN 1 ELSE 0 END
+    WHERE date(NEW.created_at) IS NOT NULL
+    ON CONFLICT (day) DO UPDATE SET
+        reviews = reviews + 1,
+        correct = correct + excluded.correct;
+END;
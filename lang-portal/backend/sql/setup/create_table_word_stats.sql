@@ -0,0 +1,65 @@
+CREATE TABLE IF NOT EXISTS word_stats (
+    word_id INTEGER PRIMARY KEY,
+    correct_count INTEGER NOT NULL DEFAULT 0,
+    wrong_count INTEGER NOT NULL DEFAULT 0,
+    last_reviewed_at DATETIME,
+    FOREIGN KEY (word_id) REFERENCES words(id)
+);
+
+-- Used by the triggers below to recompute last_reviewed_at
+CREATE INDEX IF NOT EXISTS idx_word_reviews_word_id_created_at
+ON word_reviews (word_id, created_at);
+
+-- Keep word_stats in step with word_reviews
+CREATE TRIGGER IF NOT EXISTS word_stats_after_review_insert
+AFTER INSERT ON word_reviews
+BEGIN
+    INSERT INTO word_stats (word_id, correct_count, wrong_count, last_reviewed_at)
+    VALUES (
+        NEW.word_id,
+        CASE WHEN NEW.correct THEN 1 ELSE 0 END,
+        CASE WHEN NOT NEW.correct THEN 1 ELSE 0 END,
+        NEW.created_at
+    )
+    ON CONFLICT (word_id) DO UPDATE SET
+        correct_count = correct_count + excluded.correct_count,
+        wrong_count = wrong_count + excluded.wrong_count,
+        last_reviewed_at = MAX(
+            COALESCE(last_reviewed_at, excluded.last_reviewed_at),
+            COALESCE(excluded.last_reviewed_at, last_reviewed_at)
+        );
+END;
+
+CREATE TRIGGER IF NOT EXISTS word_stats_after_review_delete
+AFTER DELETE ON word_reviews
+BEGIN
+    UPDATE word_stats SET
+        correct_count = correct_count - (CASE WHEN OLD.correct THEN 1 ELSE 0 END),
+        wrong_count = wrong_count - (CASE WHEN NOT OLD.correct THEN 1 ELSE 0 END),
+        last_reviewed_at = (SELECT MAX(created_at) FROM word_reviews WHERE word_id = OLD.word_id)
+    WHERE word_id = OLD.word_id;
+    DELETE FROM word_stats
+    WHERE word_id = OLD.word_id
+      AND NOT EXISTS (SELECT 1 FROM word_reviews WHERE word_id = OLD.word_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS word_stats_after_review_update
+AFTER UPDATE OF word_id, correct, created_at ON word_reviews
+BEGIN
+    UPDATE word_stats SET
+        correct_count = correct_count - (CASE WHEN OLD.correct THEN 1 ELSE 0 END),
+        wrong_count = wrong_count - (CASE WHEN NOT OLD.correct THEN 1 ELSE 0 END),
+        last_reviewed_at = (SELECT MAX(created_at) FROM word_reviews WHERE word_id = OLD.word_id)
+    WHERE word_id = OLD.word_id;
+    INSERT INTO word_stats (word_id, correct_count, wrong_count, last_reviewed_at)
+    VALUES (
+        NEW.word_id,
+        CASE WHEN NEW.correct THEN 1 ELSE 0 END,
+        CASE WHEN NOT NEW.correct THEN 1 ELSE 0 END,
+        NEW.created_at
+    )
+    ON CONFLICT (word_id) DO UPDATE SET
+        correct_count = correct_count + excluded.correct_count,
+        wrong_count = wrong_count + excluded.wrong_count,
+        last_reviewed_at = (SELECT MAX(created_at) FROM word_reviews WHERE word_id = NEW.word_id);
+END;
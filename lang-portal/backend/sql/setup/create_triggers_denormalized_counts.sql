@@ -0,0 +1,64 @@
+-- Keep groups.word_count equal to the group's rows in word_groups
+CREATE TRIGGER IF NOT EXISTS groups_word_count_after_word_group_insert
+AFTER INSERT ON word_groups
+BEGIN
+    UPDATE groups SET word_count = word_count + 1 WHERE id = NEW.group_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS groups_word_count_after_word_group_delete
+AFTER DELETE ON word_groups
+BEGIN
+    UPDATE groups SET word_count = word_count - 1 WHERE id = OLD.group_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS groups_word_count_after_word_group_update
+AFTER UPDATE OF group_id ON word_groups
+WHEN OLD.group_id IS NOT NEW.group_id
+BEGIN
+    UPDATE groups SET word_count = word_count - 1 WHERE id = OLD.group_id;
+    UPDATE groups SET word_count = word_count + 1 WHERE id = NEW.group_id;
+END;
+
+-- A group created with an id that word_groups rows already point at
+CREATE TRIGGER IF NOT EXISTS groups_word_count_after_group_insert
+AFTER INSERT ON groups
+WHEN EXISTS (SELECT 1 FROM word_groups WHERE group_id = NEW.id)
+BEGIN
+    UPDATE groups SET word_count = (SELECT COUNT(*) FROM word_groups WHERE group_id = NEW.id)
+    WHERE id = NEW.id;
+END;
+
+-- Keep study_sessions.review_items_count equal to the session's rows in word_review_items
+CREATE TRIGGER IF NOT EXISTS study_sessions_review_items_count_after_item_insert
+AFTER INSERT ON word_review_items
+BEGIN
+    UPDATE study_sessions SET review_items_count = review_items_count + 1
+    WHERE id = NEW.study_session_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS study_sessions_review_items_count_after_item_delete
+AFTER DELETE ON word_review_items
+BEGIN
+    UPDATE study_sessions SET review_items_count = review_items_count - 1
+    WHERE id = OLD.study_session_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS study_sessions_review_items_count_after_item_update
+AFTER UPDATE OF study_session_id ON word_review_items
+WHEN OLD.study_session_id IS NOT NEW.study_session_id
+BEGIN
+    UPDATE study_sessions SET review_items_count = review_items_count - 1
+    WHERE id = OLD.study_session_id;
+    UPDATE study_sessions SET review_items_count = review_items_count + 1
+    WHERE id = NEW.study_session_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS study_sessions_review_items_count_after_session_insert
+AFTER INSERT ON study_sessions
+WHEN EXISTS (SELECT 1 FROM word_review_items WHERE study_session_id = NEW.id)
+BEGIN
+    UPDATE study_sessions SET review_items_count = (
+        SELECT COUNT(*) FROM word_review_items WHERE study_session_id = NEW.id
+    )
+    WHERE id = NEW.id;
+END;
@@ -1,19 +1,23 @@
 from invoke import task
-import os
-from init_db import init_db, seed_data
+from init_db import SEED_DIR, bulk_seed_data, init_db, seed_data
+from lib.db import remove_database
+from migrate import apply_migrations
 
 @task
 def initialize_db(c):
     """Initialize the database and create tables."""
-    if os.path.exists("words.db"):
-        os.remove("words.db")
+    remove_database("words.db")
     init_db()
+    apply_migrations("words.db")
     print("Database initialized successfully.")
 
 @task
-def seed_db(c):
-    """Seed the database with initial data."""
-    seed_data()
+def seed_db(c, bulk=False, seed_dir=SEED_DIR):
+    """Seed the database with initial data (--bulk for large seed sets)."""
+    if bulk:
+        bulk_seed_data("words.db", seed_dir)
+    else:
+        seed_data("words.db", seed_dir)
     print("Database seeded successfully.")
 
 @task
@@ -21,4 +25,25 @@ def setup(c):
     """Initialize and seed the database."""
     initialize_db(c)
     seed_db(c)
-    print("Database setup complete.") 
\ No newline at end of file
+    print("Database setup complete.") 
+
+@task
+def check_word_stats(c, rebuild=False):
+    """Verify (or rebuild) the trigger-maintained word_stats table."""
+    args = "rebuild" if rebuild else "check"
+    c.run(f"python word_stats.py {args}")
+
+@task
+def generate_data(c, db="bench.db", scale="medium"):
+    """Build a synthetic database for load testing."""
+    c.run(f"python benchmarks/generate_data.py {db} --scale {scale}")
+
+@task
+def load_test(c, db="bench.db", clients=50, output=None, compare=None):
+    """Run the load harness against a generated database."""
+    args = f"--clients {clients}"
+    if output:
+        args += f" --output {output}"
+    if compare:
+        args += f" --compare {compare}"
+    c.run(f"python benchmarks/load_test.py {db} {args}")
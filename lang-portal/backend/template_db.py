@@ -0,0 +1,152 @@
+"""
+Template databases: build the migrated (and optionally seeded) schema once,
+then clone it wherever a fresh database is needed.
+
+    python template_db.py [--schema-only]       # build the template, print its path
+    python template_db.py clone words.db        # replace words.db with a clone
+
+Templates live in SQLITE_TEMPLATE_DIR (default ``lang-portal-templates`` in
+the system temp directory), named after a hash of sql/setup, the migrations
+and the seed files, so editing any of them builds a new one. Cloning copies
+the template with the sqlite3 backup API, which takes milliseconds at the
+size of the seed data.
+"""
+import contextlib
+import hashlib
+import io
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from glob import glob
+
+from init_db import SEED_DIR, bulk_seed_data
+from lib.db import DEFAULT_DB_NAME, close_pool, get_db_connection, get_pool
+from migrate import MIGRATIONS_DIR, apply_migrations, migration_files
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SETUP_DIR = os.path.join(BASE_DIR, "sql/setup")
+TEMPLATE_DIR = os.getenv(
+    "SQLITE_TEMPLATE_DIR", os.path.join(tempfile.gettempdir(), "lang-portal-templates")
+)
+
+_build_lock = threading.Lock()
+_clone_lock = threading.Lock()
+# Template path -> in-memory copy, loaded once per process
+_loaded = {}
+
+
+def _fingerprint(seed_dir):
+    digest = hashlib.sha256()
+    files = sorted(glob(os.path.join(SETUP_DIR, "*.sql")))
+    files += [os.path.join(MIGRATIONS_DIR, name) for name in migration_files(MIGRATIONS_DIR)]
+    if seed_dir is not None:
+        files += sorted(glob(os.path.join(seed_dir, "*.json")))
+    for path in files:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as template_file:
+            digest.update(hashlib.sha256(template_file.read()).digest())
+    return digest.hexdigest()[:16]
+
+
+def _build(path, seed_dir):
+    with get_db_connection(path) as conn:
+        for f in sorted(glob(os.path.join(SETUP_DIR, "*.sql"))):
+            with open(f, "r") as sql_script:
+                conn.executescript(sql_script.read())
+    with contextlib.redirect_stdout(io.StringIO()):
+        apply_migrations(path, progress=lambda message: None)
+        if seed_dir is not None:
+            bulk_seed_data(path, seed_dir)
+    # One self-contained file, with no -wal to copy alongside it
+    with get_db_connection(path) as conn:
+        conn.execute("PRAGMA journal_mode=DELETE")
+    close_pool(path)
+
+
+def template_path(seeded=True, seed_dir=None):
+    """
+    Path of the schema-only or seeded template, building it first if the
+    schema, migrations or seed files changed since it was last built.
+    """
+    seed_dir = (seed_dir or os.path.join(BASE_DIR, SEED_DIR)) if seeded else None
+    path = os.path.join(TEMPLATE_DIR, f"{'seeded' if seeded else 'schema'}-{_fingerprint(seed_dir)}.db")
+    with _build_lock:
+        if not os.path.exists(path):
+            os.makedirs(TEMPLATE_DIR, exist_ok=True)
+            # Build under a unique name and rename, so concurrent builders
+            # (e.g. pytest-xdist workers) never see a half-built template
+            fd, building = tempfile.mkstemp(suffix=".db", dir=TEMPLATE_DIR)
+            os.close(fd)
+            os.remove(building)
+            try:
+                _build(building, seed_dir)
+                os.replace(building, path)
+            finally:
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(building + suffix):
+                        os.remove(building + suffix)
+    return path
+
+
+def _template(path):
+    with _clone_lock:
+        source = _loaded.get(path)
+        if source is None:
+            source = sqlite3.connect(":memory:", check_same_thread=False)
+            with sqlite3.connect(path) as template_file:
+                template_file.backup(source)
+            _loaded[path] = source
+        return source
+
+
+def clone_database(db_name=DEFAULT_DB_NAME, seeded=True, seed_dir=None, prepare=None):
+    """
+    Replace the contents of ``db_name`` (a file or ``:memory:``) with a
+    copy of the template. The copy goes through a pooled connection, so
+    connections already open on ``db_name`` see the new data.
+
+    ``prepare(conn)``, if given, runs on a private copy of the template
+    before it replaces ``db_name``, so other connections never see the
+    database in between.
+    """
+    source = _template(template_path(seeded, seed_dir))
+    staging = None
+    if prepare is not None:
+        staging = sqlite3.connect(":memory:")
+        with _clone_lock:
+            source.backup(staging)
+        prepare(staging)
+        staging.commit()
+        source = staging
+
+    pool = get_pool(db_name)
+    conn = pool.acquire()
+    try:
+        if staging is None:
+            with _clone_lock:
+                source.backup(conn)
+        else:
+            source.backup(conn)
+    finally:
+        pool.release(conn)
+        if staging is not None:
+            staging.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the template database, or clone it.")
+    parser.add_argument("command", nargs="?", choices=["build", "clone"], default="build")
+    parser.add_argument("db_name", nargs="?", default="words.db", help="database to replace, for clone")
+    parser.add_argument("--schema-only", action="store_true", help="template without seed data")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.command == "clone":
+        clone_database(args.db_name, seeded=not args.schema_only)
+        print(f"Cloned the template into {args.db_name} in {(time.perf_counter() - started) * 1000:.1f} ms")
+    else:
+        path = template_path(seeded=not args.schema_only)
+        print(f"Template ready at {path} ({(time.perf_counter() - started) * 1000:.0f} ms)")
@@ -0,0 +1,41 @@
+"""
+Test sessions run against a clone of the seeded template database
+(template_db.py) rather than words.db. Each process gets its own file,
+so the suite can run in parallel with pytest-xdist: ``pytest -n auto``.
+"""
+import sys
+import os
+import tempfile
+import pytest
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+# Must be set before lib.db is imported
+TEST_DB = os.path.join(
+    tempfile.gettempdir(),
+    f"lang-portal-test-{os.getenv('PYTEST_XDIST_WORKER', 'main')}-{os.getpid()}.db"
+)
+os.environ["SQLITE_DB_PATH"] = TEST_DB
+
+from lib.cache import bump_data_version
+from lib.db import remove_database
+from template_db import clone_database
+
+def pytest_sessionstart(session):
+    remove_database(TEST_DB)
+    clone_database(TEST_DB)
+
+def pytest_sessionfinish(session, exitstatus):
+    remove_database(TEST_DB)
+
+@pytest.fixture
+def fresh_db():
+    """Restore the test database from the seeded template before and after the test."""
+    clone_database(TEST_DB)
+    bump_data_version()
+    yield TEST_DB
+    clone_database(TEST_DB)
+    bump_data_version()
@@ -0,0 +1,127 @@
+import asyncio
+import sys
+import os
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from app import app
+from lib.cache import AggregateCache, aggregate_cache, bump_data_version
+
+client = TestClient(app)
+
+def test_aggregate_cache_hits_until_version_bump():
+    cache = AggregateCache(ttl=60)
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+
+    assert cache.get_or_compute("key", compute) == 1
+    assert cache.get_or_compute("key", compute) == 1
+    bump_data_version()
+    assert cache.get_or_compute("key", compute) == 2
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+def test_aggregate_cache_ttl_expiry():
+    cache = AggregateCache(ttl=0)
+    calls = []
+    cache.get_or_compute("key", lambda: calls.append(1))
+    cache.get_or_compute("key", lambda: calls.append(1))
+    assert len(calls) == 2
+
+def test_aggregate_cache_evicts_oldest_past_max_entries():
+    cache = AggregateCache(ttl=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.get_or_compute(key, lambda: key)
+    assert cache.stats()["entries"] == 2
+    calls = []
+    cache.get_or_compute("a", lambda: calls.append(1))
+    cache.get_or_compute("c", lambda: calls.append(1))
+    assert len(calls) == 1
+
+def test_quick_stats_served_from_cache():
+    client.get("/api/dashboard/quick-stats")
+    before = client.get("/api/dashboard/cache-stats").json()
+    response = client.get("/api/dashboard/quick-stats")
+    assert response.status_code == 200
+    after = client.get("/api/dashboard/cache-stats").json()
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"]
+
+def test_review_invalidates_study_progress():
+    before = client.get("/api/dashboard/study_progress").json()
+    version = aggregate_cache.stats()["data_version"]
+
+    response = client.post("/api/study_sessions/1/words/1/review", json={"correct": True})
+    assert response.status_code == 200
+    assert aggregate_cache.stats()["data_version"] == version + 1
+
+    after = client.get("/api/dashboard/study_progress").json()
+    assert after["total_words_reviewed"] == before["total_words_reviewed"] + 1
+    assert after["total_correct"] == before["total_correct"] + 1
+
+def test_aggregate_cache_async_compute():
+    cache = AggregateCache(ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def read_twice():
+        return [await cache.get_or_compute_async("key", compute) for _ in range(2)]
+
+    assert asyncio.run(read_twice()) == [1, 1]
+    assert cache.stats()["hits"] == 1
+
+def test_aggregate_cache_concurrent_misses_share_one_compute():
+    cache = AggregateCache(ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def read_concurrently():
+        return await asyncio.gather(*(cache.get_or_compute_async("key", compute) for _ in range(5)))
+
+    assert asyncio.run(read_concurrently()) == [1] * 5
+    assert len(calls) == 1
+    assert cache.stats()["joined"] == 4
+
+def test_aggregate_cache_failed_compute_is_retried_by_waiters():
+    cache = AggregateCache(ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise ValueError("first call fails")
+        return len(calls)
+
+    async def read_concurrently():
+        return await asyncio.gather(
+            *(cache.get_or_compute_async("key", compute) for _ in range(2)), return_exceptions=True
+        )
+
+    first, second = asyncio.run(read_concurrently())
+    assert isinstance(first, ValueError)
+    assert second == 2
+
+def test_aggregate_cache_snapshot_ignores_data_version():
+    cache = AggregateCache(ttl=60)
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+
+    assert cache.get_or_compute("key", compute, snapshot="snapshot-1") == 1
+    bump_data_version()
+    assert cache.get_or_compute("key", compute, snapshot="snapshot-1") == 1
+    assert cache.get_or_compute("key", compute, snapshot="snapshot-2") == 2
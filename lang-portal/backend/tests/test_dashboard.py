@@ -89,4 +89,63 @@ def test_get_quick_stats():
     assert stats["streak_days"] >= 0
     
     # Validate logical constraints
-    assert stats["words_learned"] <= stats["total_words"] 
\ No newline at end of file
+    assert stats["words_learned"] <= stats["total_words"] 
+
+def test_get_daily_activity():
+    response = client.get("/api/dashboard/daily_activity?days=7")
+    assert response.status_code == 200
+    days = response.json()
+    assert isinstance(days, list)
+    assert len(days) <= 7
+    for day in days:
+        assert {"day", "sessions", "reviews", "correct", "accuracy_rate"} <= day.keys()
+
+def test_streak_longer_than_thirty_days(tmp_path):
+    from glob import glob
+    from datetime import date, timedelta
+    from lib.db import get_db_connection
+    from routes.dashboard import get_streak_days
+
+    db_name = str(tmp_path / "streak.db")
+    today = date(2025, 3, 1)
+    with get_db_connection(db_name) as conn:
+        for f in sorted(glob(os.path.join(backend_dir, "sql/setup/*.sql"))):
+            with open(f, "r") as sql_script:
+                conn.executescript(sql_script.read())
+        # 45 consecutive study days ending today, then a gap, then older activity
+        days = [today - timedelta(days=n) for n in range(45)] + [today - timedelta(days=50)]
+        conn.executemany(
+            "INSERT INTO study_sessions (group_id, study_activity_id, created_at) VALUES (1, 1, ?)",
+            [(f"{d.isoformat()}T09:00:00",) for d in days]
+        )
+        assert get_streak_days(conn, today) == 45
+        assert get_streak_days(conn, today + timedelta(days=1)) == 0
+
+def test_daily_activity_follows_session_and_review_changes(tmp_path):
+    from glob import glob
+    from lib.db import get_db_connection
+
+    db_name = str(tmp_path / "daily.db")
+    with get_db_connection(db_name) as conn:
+        for f in sorted(glob(os.path.join(backend_dir, "sql/setup/*.sql"))):
+            with open(f, "r") as sql_script:
+                conn.executescript(sql_script.read())
+        daily = lambda: {row[0]: row[1:] for row in conn.execute(
+            "SELECT day, sessions, reviews, correct FROM daily_activity WHERE sessions OR reviews")}
+
+        # Sessions whose created_at is not a date have no day
+        conn.executemany(
+            "INSERT INTO study_sessions (id, group_id, study_activity_id, created_at) VALUES (?, 1, 1, ?)",
+            [(1, "2025-03-01T09:00:00"), (2, ""), (3, "not a date")]
+        )
+        assert daily() == {"2025-03-01": (1, 0, 0)}
+        assert conn.execute("SELECT COUNT(*) FROM daily_activity WHERE day IS NULL").fetchone()[0] == 0
+
+        conn.execute("UPDATE study_sessions SET created_at = '2025-03-02T09:00:00' WHERE id IN (1, 3)")
+        conn.execute("DELETE FROM study_sessions WHERE id = 2")
+        assert daily() == {"2025-03-02": (2, 0, 0)}
+
+        conn.execute("INSERT INTO word_reviews (id, word_id, study_session_id, correct, created_at) "
+                     "VALUES (1, 1, 1, 1, '2025-03-02T09:05:00')")
+        conn.execute("UPDATE word_reviews SET correct = 0, created_at = '2025-03-03T09:05:00' WHERE id = 1")
+        assert daily() == {"2025-03-02": (2, 0, 0), "2025-03-03": (0, 1, 0)}
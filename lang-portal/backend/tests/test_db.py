@@ -1,5 +1,9 @@
+import asyncio
+import os
+import tempfile
+import threading
 import unittest
-from lib.db import get_db_connection
+from lib.db import get_db_connection, get_async_db_connection, close_pool, ConnectionPool, PoolTimeout
 
 class TestDatabaseConnection(unittest.TestCase):
     def test_connection(self):
@@ -10,5 +14,136 @@ class TestDatabaseConnection(unittest.TestCase):
         except Exception as e:
             self.fail(f"Database connection test failed: {e}")
 
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_name = os.path.join(self.tmpdir.name, "pool.db")
+        self.pool = ConnectionPool(self.db_name, max_size=2, timeout=0.2)
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmpdir.cleanup()
+
+    def test_pragmas_applied(self):
+        conn = self.pool.acquire()
+        try:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], self.pool.busy_timeout_ms)
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -self.pool.cache_size_kib)
+        finally:
+            self.pool.release(conn)
+
+    def test_same_thread_reuses_connection(self):
+        first = self.pool.acquire()
+        self.pool.release(first)
+        second = self.pool.acquire()
+        self.pool.release(second)
+        self.assertIs(first, second)
+        stats = self.pool.stats()
+        self.assertEqual(stats["opens"], 1)
+        self.assertEqual(stats["hits"], 1)
+
+    def test_waits_then_times_out_when_exhausted(self):
+        a = self.pool.acquire()
+        b = self.pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            self.pool.acquire()
+        self.assertEqual(self.pool.stats()["waits"], 1)
+
+        # A release from another thread wakes the waiter
+        threading.Timer(0.05, self.pool.release, args=(a,)).start()
+        conn = self.pool.acquire()
+        self.assertIs(conn, a)
+        self.pool.release(conn)
+        self.pool.release(b)
+
+    def test_row_factory_reset_on_release(self):
+        conn = self.pool.acquire()
+        conn.row_factory = lambda c, r: r
+        self.pool.release(conn)
+        self.assertIsNone(self.pool.acquire().row_factory)
+
+    def test_memory_database_is_shared(self):
+        with get_db_connection(":memory:") as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS pool_probe (id INTEGER)")
+        with get_db_connection(":memory:") as conn:
+            row = conn.execute(
+                "SELECT name FROM sqlite_master WHERE name = 'pool_probe'"
+            ).fetchone()
+        self.assertIsNotNone(row)
+
+class TestAsyncConnection(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_name = os.path.join(self.tmpdir.name, "async.db")
+        with get_db_connection(self.db_name) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+
+    def tearDown(self):
+        close_pool(self.db_name)
+        self.tmpdir.cleanup()
+
+    def test_commit_and_read_back(self):
+        async def scenario():
+            async with get_async_db_connection(self.db_name) as conn:
+                cursor = await conn.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+                self.assertEqual(cursor.lastrowid, 1)
+            async with get_async_db_connection(self.db_name) as conn:
+                return await conn.fetchall("SELECT name FROM items")
+
+        self.assertEqual(asyncio.run(scenario()), [("a",)])
+
+    def test_rollback_on_error(self):
+        async def scenario():
+            with self.assertRaises(ValueError):
+                async with get_async_db_connection(self.db_name) as conn:
+                    await conn.execute("INSERT INTO items (name) VALUES ('b')")
+                    raise ValueError("boom")
+            async with get_async_db_connection(self.db_name) as conn:
+                return (await conn.fetchone("SELECT COUNT(*) FROM items"))[0]
+
+        self.assertEqual(asyncio.run(scenario()), 0)
+
+    def test_rollback_runs_off_event_loop(self):
+        rollback_threads = []
+
+        def trace(statement):
+            if statement.upper().startswith("ROLLBACK"):
+                rollback_threads.append(threading.get_ident())
+
+        async def scenario():
+            with self.assertRaises(ValueError):
+                async with get_async_db_connection(self.db_name) as conn:
+                    await conn.run(lambda c: c.set_trace_callback(trace))
+                    await conn.execute("INSERT INTO items (name) VALUES ('b')")
+                    raise ValueError("boom")
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(scenario())
+        self.assertTrue(rollback_threads)
+        self.assertNotIn(loop_thread, rollback_threads)
+
+    def test_concurrency_beyond_pool_size(self):
+        async def borrow():
+            async with get_async_db_connection(self.db_name) as conn:
+                await conn.execute("INSERT INTO items (name) VALUES ('c')")
+
+        async def scenario():
+            await asyncio.gather(*(borrow() for _ in range(100)))
+
+        asyncio.run(scenario())
+        with get_db_connection(self.db_name) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 100)
+
+    def test_iterate_yields_batches(self):
+        with get_db_connection(self.db_name) as conn:
+            conn.executemany("INSERT INTO items (name) VALUES (?)", [(str(i),) for i in range(25)])
+
+        async def scenario():
+            async with get_async_db_connection(self.db_name) as conn:
+                return [len(rows) async for rows in conn.iterate("SELECT * FROM items", batch_size=10)]
+
+        self.assertEqual(asyncio.run(scenario()), [10, 10, 5])
+
 if __name__ == "__main__":
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
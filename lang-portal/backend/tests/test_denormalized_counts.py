@@ -0,0 +1,69 @@
+import sys
+import os
+import pytest
+from glob import glob
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from lib.db import get_db_connection
+
+@pytest.fixture
+def counts_db(tmp_path):
+    db_name = str(tmp_path / "counts.db")
+    with get_db_connection(db_name) as conn:
+        for f in sorted(glob(os.path.join(backend_dir, "sql/setup/*.sql"))):
+            with open(f, "r") as sql_script:
+                conn.executescript(sql_script.read())
+        conn.execute("INSERT INTO groups (id, name) VALUES (1, 'a'), (2, 'b')")
+        conn.execute("INSERT INTO study_sessions (id, group_id, created_at, study_activity_id) "
+                     "VALUES (1, 1, '2025-01-01', 1), (2, 1, '2025-01-02', 1)")
+    yield db_name
+
+def word_counts(db_name):
+    with get_db_connection(db_name) as conn:
+        return dict(conn.execute("SELECT id, word_count FROM groups"))
+
+def review_item_counts(db_name):
+    with get_db_connection(db_name) as conn:
+        return dict(conn.execute("SELECT id, review_items_count FROM study_sessions"))
+
+def test_word_count_follows_word_groups(counts_db):
+    with get_db_connection(counts_db) as conn:
+        conn.executemany("INSERT INTO word_groups (word_id, group_id) VALUES (?, ?)",
+                         [(1, 1), (2, 1), (3, 2)])
+    assert word_counts(counts_db) == {1: 2, 2: 1}
+
+    with get_db_connection(counts_db) as conn:
+        conn.execute("UPDATE word_groups SET group_id = 2 WHERE word_id = 1")
+        conn.execute("DELETE FROM word_groups WHERE word_id = 3")
+    assert word_counts(counts_db) == {1: 1, 2: 1}
+
+def test_group_created_after_its_words_counts_them(counts_db):
+    with get_db_connection(counts_db) as conn:
+        conn.executemany("INSERT INTO word_groups (word_id, group_id) VALUES (?, 3)", [(1,), (2,)])
+        conn.execute("INSERT INTO groups (id, name) VALUES (3, 'c')")
+    assert word_counts(counts_db)[3] == 2
+
+def test_review_items_count_follows_word_review_items(counts_db):
+    with get_db_connection(counts_db) as conn:
+        conn.executemany("INSERT INTO word_review_items (word_id, study_session_id) VALUES (?, ?)",
+                         [(1, 1), (2, 1), (3, 2)])
+    assert review_item_counts(counts_db) == {1: 2, 2: 1}
+
+    with get_db_connection(counts_db) as conn:
+        conn.execute("UPDATE word_review_items SET study_session_id = 2 WHERE word_id = 1")
+        conn.execute("DELETE FROM word_review_items WHERE word_id = 3")
+    assert review_item_counts(counts_db) == {1: 1, 2: 1}
+
+def test_counter_updates_do_not_bump_parent_versions(counts_db):
+    with get_db_connection(counts_db) as conn:
+        before = dict(conn.execute("SELECT table_name, version FROM table_versions"))
+        conn.execute("INSERT INTO word_groups (word_id, group_id) VALUES (1, 1)")
+        conn.execute("INSERT INTO word_review_items (word_id, study_session_id) VALUES (1, 1)")
+        after = dict(conn.execute("SELECT table_name, version FROM table_versions"))
+    assert after["groups"] == before["groups"]
+    assert after["study_sessions"] == before["study_sessions"]
+    assert after["word_groups"] == before["word_groups"] + 1
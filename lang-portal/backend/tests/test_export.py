@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import sys
+import os
+import pytest
+from fastapi.testclient import TestClient
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from app import app
+from lib.db import get_db_connection
+
+client = TestClient(app)
+
+def _review_count(group_id=None):
+    with get_db_connection() as conn:
+        if group_id is None:
+            return conn.execute("SELECT COUNT(*) FROM word_reviews").fetchone()[0]
+        return conn.execute("""
+            SELECT COUNT(*) FROM word_reviews wr
+            JOIN study_sessions ss ON ss.id = wr.study_session_id
+            WHERE ss.group_id = ?
+        """, (group_id,)).fetchone()[0]
+
+def test_export_reviews_ndjson():
+    response = client.get("/api/export/reviews")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="reviews.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == _review_count()
+    if rows:
+        assert set(rows[0]) == {
+            "id", "word_id", "jamaican_patois", "english", "study_session_id",
+            "group_id", "study_activity_id", "correct", "created_at",
+        }
+        assert rows[0]["correct"] in (True, False, None)
+        times = [(row["created_at"], row["id"]) for row in rows]
+        assert times == sorted(times)
+
+def test_export_reviews_without_session(fresh_db):
+    with get_db_connection() as conn:
+        review_id = conn.execute(
+            "INSERT INTO word_reviews (word_id, study_session_id, correct, created_at) VALUES (1, 99999, 1, '2025-01-01T10:00:00')"
+        ).lastrowid
+    response = client.get("/api/export/reviews")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    orphan = next(row for row in rows if row["id"] == review_id)
+    assert orphan["study_session_id"] == 99999
+    assert orphan["group_id"] is None
+
+def test_export_reviews_csv():
+    response = client.get("/api/export/reviews", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0][:2] == ["id", "word_id"]
+    assert len(rows) - 1 == _review_count()
+
+def test_export_reviews_filters():
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT group_id FROM study_sessions LIMIT 1").fetchone()
+    if row is None:
+        pytest.skip("No study sessions to export")
+    response = client.get("/api/export/reviews", params={"group_id": row[0]})
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == _review_count(row[0])
+    assert all(r["group_id"] == row[0] for r in rows)
+
+    response = client.get("/api/export/reviews", params={"start": "2100-01-01"})
+    assert response.status_code == 200
+    assert response.text == ""
+
+def test_export_reviews_invalid_range():
+    response = client.get("/api/export/reviews", params={"start": "2024-02-02", "end": "2024-02-01"})
+    assert response.status_code == 400
+
+def test_export_invalid_format():
+    response = client.get("/api/export/reviews", params={"format": "xml"})
+    assert response.status_code == 422
+
+def test_export_study_sessions_ndjson():
+    response = client.get("/api/export/study_sessions")
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    with get_db_connection() as conn:
+        assert len(rows) == conn.execute("SELECT COUNT(*) FROM study_sessions").fetchone()[0]
+    if rows:
+        assert "review_count" in rows[0]
+
+def test_export_study_sessions_parquet():
+    pq = pytest.importorskip("pyarrow.parquet")
+    response = client.get("/api/export/study_sessions", params={"format": "parquet"})
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column_names[0] == "id"
+    with get_db_connection() as conn:
+        assert table.num_rows == conn.execute("SELECT COUNT(*) FROM study_sessions").fetchone()[0]
@@ -9,6 +9,7 @@ backend_dir = os.path.join(current_dir, '..')
 sys.path.append(backend_dir)
 
 from app import app
+from lib.db import get_db_connection
 
 client = TestClient(app)
 
@@ -70,4 +71,27 @@ def test_get_group_study_sessions():
 def test_get_group_study_sessions_not_found():
     response = client.get("/api/groups/9999/study_sessions")
     assert response.status_code == 404
-    assert response.json()["detail"] == "No study sessions found for this group" 
\ No newline at end of file
+    assert response.json()["detail"] == "No study sessions found for this group" 
+
+def test_get_group_words_filtered_by_type():
+    words = client.get("/api/groups/1/words?page_size=100").json()["words"]
+    part_type = words[0]["parts"]["type"]
+    expected = [word["id"] for word in words if word["parts"]["type"] == part_type]
+
+    data = client.get(f"/api/groups/1/words?type={part_type}&page_size=100").json()
+    assert [word["id"] for word in data["words"]] == expected
+    assert data["pagination"]["total_items"] == len(expected)
+
+def test_get_group_words_total_matches_listing(fresh_db):
+    with get_db_connection() as conn:
+        # Links to three words, one of them already in the group, and to a missing word
+        conn.execute("INSERT INTO word_groups (word_id, group_id) "
+                     "SELECT word_id, 1 FROM word_groups WHERE group_id = 1")
+        conn.execute("INSERT INTO word_groups (word_id, group_id) "
+                     "SELECT id, 1 FROM words ORDER BY id LIMIT 3")
+        conn.execute("INSERT INTO word_groups (word_id, group_id) VALUES (999999, 1)")
+    ids = [word["id"] for word in client.get("/api/groups/1/words?page_size=100").json()["words"]]
+    assert len(ids) == len(set(ids)) > 1
+
+    data = client.get("/api/groups/1/words?page_size=1").json()
+    assert data["pagination"]["total_items"] == len(ids)
@@ -0,0 +1,60 @@
+import sys
+import os
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from app import app
+from lib.http_cache import _etag_matches
+
+client = TestClient(app)
+
+def test_etag_matching():
+    assert _etag_matches('"abc"', '"abc"')
+    assert _etag_matches('W/"abc", "def"', '"abc"')
+    assert _etag_matches("*", '"abc"')
+    assert not _etag_matches('"abd"', '"abc"')
+
+@pytest.mark.parametrize("path", [
+    "/api/words?page=1&page_size=5",
+    "/api/words/1",
+    "/api/groups",
+    "/api/dashboard/quick-stats",
+    "/api/dashboard/study_progress",
+])
+def test_conditional_get_returns_304(path):
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    second = client.get(path, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+def test_etag_varies_with_query():
+    first = client.get("/api/words?page=1&page_size=5").headers["ETag"]
+    second = client.get("/api/words?page=2&page_size=5").headers["ETag"]
+    assert first != second
+
+def test_etag_changes_after_write():
+    etag = client.get("/api/words?page_size=5").headers["ETag"]
+    client.post("/api/words/sync", json={"words": [
+        {"jamaican_patois": f"etag-{uuid.uuid4().hex[:8]}", "english": "etag"}
+    ]})
+    response = client.get("/api/words?page_size=5", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_unrelated_write_keeps_etag():
+    etag = client.get("/api/groups").headers["ETag"]
+    client.post("/api/words/sync", json={"words": [
+        {"jamaican_patois": f"etag-{uuid.uuid4().hex[:8]}", "english": "etag"}
+    ]})
+    assert client.get("/api/groups", headers={"If-None-Match": etag}).status_code == 304
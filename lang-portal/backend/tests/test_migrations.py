@@ -1,5 +1,7 @@
 import sys
 import os
+import sqlite3
+import textwrap
 import pytest
 
 # Add the backend directory to the Python path
@@ -7,14 +9,24 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 backend_dir = os.path.join(current_dir, '..')
 sys.path.append(backend_dir)
 
-from migrate import apply_migrations, rollback_migration
-from lib.db import get_db_connection
+from glob import glob
+from migrate import (
+    apply_migrations, rollback_migration, get_applied_migrations, get_migration_history,
+    migration_files, migration_status, MIGRATIONS_DIR,
+)
+from lib.db import get_db_connection, close_pool
 
 @pytest.fixture
 def in_memory_db():
-    # Use an in-memory database for testing
+    # Use an in-memory database for testing; the pool shares one connection,
+    # so the base schema created here is visible to the migration runner
     db_name = ":memory:"
+    with get_db_connection(db_name) as conn:
+        for f in sorted(glob(os.path.join(backend_dir, "sql/setup/*.sql"))):
+            with open(f, "r") as sql_script:
+                conn.executescript(sql_script.read())
     yield db_name
+    close_pool(db_name)
 
 def test_apply_migrations(in_memory_db):
     # Test applying all migrations to an in-memory DB
@@ -29,8 +41,155 @@ def test_rollback_migration(in_memory_db):
     apply_migrations(in_memory_db)
     # Rollback the last migration
     rollback_migration(in_memory_db)
+    # Check if the last migration was rolled back
+    last_migration = migration_files(MIGRATIONS_DIR)[-1]
+    assert last_migration not in get_applied_migrations(in_memory_db), "Last migration should be rolled back."
+
+def test_index_migrations_create_indexes(in_memory_db):
+    apply_migrations(in_memory_db)
     with get_db_connection(in_memory_db) as conn:
-        # Check if the last migration was rolled back
-        cursor = conn.execute("SELECT migration_name FROM schema_migrations ORDER BY id DESC LIMIT 1")
-        last_migration = cursor.fetchone()
-        assert last_migration is None, "Last migration should be rolled back." 
\ No newline at end of file
+        indexes = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+    assert {
+        "idx_word_reviews_word_id_created_at",
+        "idx_word_reviews_session_created_at",
+        "idx_word_groups_group_word",
+        "idx_word_review_items_session_word",
+        "idx_study_sessions_group_created_at",
+    } <= indexes
+
+def test_migrations_record_checksum_and_duration(in_memory_db):
+    apply_migrations(in_memory_db)
+    history = get_migration_history(in_memory_db)
+    assert set(history) == set(migration_files(MIGRATIONS_DIR))
+    for applied_at, checksum, duration_ms in history.values():
+        assert len(checksum) == 64
+        assert duration_ms >= 0
+
+@pytest.fixture
+def migration_env(tmp_path):
+    """A file database with a ``numbers`` table and an empty migrations directory."""
+    db_name = str(tmp_path / "migrate.db")
+    migrations_dir = tmp_path / "migrations"
+    (migrations_dir / "down").mkdir(parents=True)
+    with get_db_connection(db_name) as conn:
+        conn.execute("CREATE TABLE numbers (id INTEGER PRIMARY KEY, value INTEGER)")
+        conn.execute("CREATE TABLE audit (note TEXT)")
+        conn.executemany("INSERT INTO numbers (value) VALUES (?)", [(i,) for i in range(1, 101)])
+    yield db_name, migrations_dir
+    close_pool(db_name)
+
+BACKFILL_MIGRATION = """
+    def upgrade(ctx):
+        ctx.execute("ALTER TABLE numbers ADD COLUMN doubled INTEGER")
+        ctx.backfill("numbers", \"""
+            UPDATE numbers SET doubled = value * 2
+            WHERE rowid >= :start AND rowid < :end AND doubled IS NULL
+        \""", chunk_size=10)
+
+    def downgrade(ctx):
+        ctx.execute("ALTER TABLE numbers DROP COLUMN doubled")
+"""
+
+def test_python_migration_backfills_in_chunks(migration_env):
+    db_name, migrations_dir = migration_env
+    (migrations_dir / "001_add_doubled.py").write_text(textwrap.dedent(BACKFILL_MIGRATION))
+
+    messages = []
+    def progress(message):
+        messages.append(message)
+        if "rowids" in message:
+            # Another writer gets the lock straight away between chunks
+            other = sqlite3.connect(db_name, timeout=0)
+            try:
+                with other:
+                    other.execute("INSERT INTO audit (note) VALUES (?)", (message,))
+            finally:
+                other.close()
+
+    apply_migrations(db_name, str(migrations_dir), progress=progress)
+
+    with get_db_connection(db_name) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM numbers WHERE doubled = value * 2").fetchone()[0] == 100
+        assert conn.execute("SELECT COUNT(*) FROM audit").fetchone()[0] == 10
+    assert any("100/100 rowids (100%), 100 rows changed" in message for message in messages)
+    assert "001_add_doubled.py" in get_applied_migrations(db_name)
+
+    rollback_migration(db_name, str(migrations_dir), progress=messages.append)
+    assert get_applied_migrations(db_name) == set()
+    with get_db_connection(db_name) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(numbers)")}
+    assert "doubled" not in columns
+
+def test_failed_sql_migration_is_rolled_back(migration_env):
+    db_name, migrations_dir = migration_env
+    (migrations_dir / "001_broken.sql").write_text(
+        "UPDATE numbers SET value = 0;\nINSERT INTO missing_table VALUES (1);\n"
+    )
+    with pytest.raises(sqlite3.OperationalError):
+        apply_migrations(db_name, str(migrations_dir), progress=lambda message: None)
+
+    assert get_applied_migrations(db_name) == set()
+    with get_db_connection(db_name) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM numbers WHERE value = 0").fetchone()[0] == 0
+
+def test_changed_migration_is_reported(migration_env):
+    db_name, migrations_dir = migration_env
+    migration = migrations_dir / "001_add_note.sql"
+    migration.write_text("ALTER TABLE audit ADD COLUMN extra TEXT;\n")
+    apply_migrations(db_name, str(migrations_dir), progress=lambda message: None)
+    assert migration_status(db_name, str(migrations_dir))[0][:2] == ("001_add_note.sql", "applied")
+
+    migration.write_text("ALTER TABLE audit ADD COLUMN other TEXT;\n")
+    messages = []
+    apply_migrations(db_name, str(migrations_dir), progress=messages.append)
+    assert messages == ["Warning: 001_add_note.sql has changed since it was applied"]
+    assert migration_status(db_name, str(migrations_dir))[0][:2] == ("001_add_note.sql", "changed")
+
+def test_legacy_migrations_table_is_upgraded(migration_env):
+    db_name, migrations_dir = migration_env
+    (migrations_dir / "001_add_note.sql").write_text("ALTER TABLE audit ADD COLUMN extra TEXT;\n")
+    with get_db_connection(db_name) as conn:
+        conn.execute("""
+            CREATE TABLE schema_migrations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                migration_name TEXT NOT NULL,
+                applied_at DATETIME DEFAULT (datetime('now'))
+            )
+        """)
+        conn.execute("INSERT INTO schema_migrations (migration_name) VALUES ('001_add_note.sql')")
+
+    apply_migrations(db_name, str(migrations_dir), progress=lambda message: None)
+    applied_at, checksum, duration_ms = get_migration_history(db_name)["001_add_note.sql"]
+    assert len(checksum) == 64
+    assert duration_ms is None
+
+def test_denormalized_counts_are_backfilled(tmp_path):
+    db_name = str(tmp_path / "counts.db")
+    with get_db_connection(db_name) as conn:
+        for f in sorted(glob(os.path.join(backend_dir, "sql/setup/*.sql"))):
+            with open(f, "r") as sql_script:
+                conn.executescript(sql_script.read())
+    apply_migrations(db_name, progress=lambda message: None)
+    # Back to a schema without the counters, then add rows they must cover
+    while "016_add_denormalized_counts.py" in get_applied_migrations(db_name):
+        rollback_migration(db_name, progress=lambda message: None)
+    with get_db_connection(db_name) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(groups)")}
+        assert "word_count" not in columns
+        conn.execute("INSERT INTO groups (id, name) VALUES (1, 'a'), (2, 'b')")
+        conn.executemany("INSERT INTO word_groups (word_id, group_id) VALUES (?, ?)",
+                         [(1, 1), (2, 1), (3, 2)])
+        conn.execute("INSERT INTO study_sessions (id, group_id, created_at, study_activity_id) "
+                     "VALUES (1, 1, '2025-01-01', 1), (2, 1, '2025-01-02', 1)")
+        conn.executemany("INSERT INTO word_review_items (word_id, study_session_id) VALUES (?, ?)",
+                         [(1, 1), (2, 1), (1, 1)])
+
+    apply_migrations(db_name, progress=lambda message: None)
+    with get_db_connection(db_name) as conn:
+        assert conn.execute("SELECT id, word_count FROM groups ORDER BY id").fetchall() == [(1, 2), (2, 1)]
+        assert conn.execute(
+            "SELECT id, review_items_count FROM study_sessions ORDER BY id"
+        ).fetchall() == [(1, 3), (2, 0)]
+    close_pool(db_name)
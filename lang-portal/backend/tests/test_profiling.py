@@ -0,0 +1,64 @@
+import sys
+import os
+import sqlite3
+import pytest
+from fastapi.testclient import TestClient
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from app import app
+from lib import profiling
+
+client = TestClient(app)
+
+@pytest.fixture
+def profiling_enabled(monkeypatch):
+    monkeypatch.setattr(profiling, "ENABLE_SQL_PROFILING", True)
+    profiling.route_metrics.clear()
+    yield
+    profiling.route_metrics.clear()
+
+def test_profiling_disabled_by_default():
+    response = client.get("/api/words")
+    assert "server-timing" not in response.headers
+    assert client.get("/api/_debug/metrics").status_code == 403
+
+def test_server_timing_header(profiling_enabled):
+    response = client.get("/api/words")
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("sql;dur=")
+    assert "sql-slowest;dur=" in timing
+
+def test_metrics_aggregate_per_route(profiling_enabled):
+    client.get("/api/words/1")
+    client.get("/api/words/2")
+    response = client.get("/api/_debug/metrics")
+    assert response.status_code == 200
+    route = response.json()["routes"]["GET /api/words/{word_id}"]
+    assert route["requests"] == 2
+    assert route["avg_statements"] >= 1
+    assert route["slowest_statement"]["sql"].startswith("SELECT")
+    assert response.json()["top_statements"]
+
+    assert client.delete("/api/_debug/metrics").status_code == 200
+    assert "GET /api/words/{word_id}" not in client.get("/api/_debug/metrics").json()["routes"]
+
+def test_explain_slowest_statement(profiling_enabled, monkeypatch):
+    monkeypatch.setattr(profiling, "SQL_PROFILING_EXPLAIN", True)
+    client.get("/api/words/1")
+    route = client.get("/api/_debug/metrics").json()["routes"]["GET /api/words/{word_id}"]
+    assert route["slowest_statement"]["plan"]
+
+def test_profiled_connection_counts_rows():
+    profile = profiling.RequestProfile()
+    conn = profiling.ProfiledConnection(sqlite3.connect(":memory:"), profile, ":memory:")
+    conn.execute("CREATE TABLE t (x)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(5)])
+    assert conn.execute("SELECT x FROM t").fetchmany(3) == [(0,), (1,), (2,)]
+    assert len(list(conn.execute("SELECT x FROM t WHERE x > ?", (1,)))) == 3
+    summary = profile.summary()
+    assert summary["statements"] == 4
+    assert summary["rows"] == 6
@@ -0,0 +1,157 @@
+import ast
+import os
+import re
+import sys
+from glob import glob
+
+import pytest
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from lib.db import get_db_connection
+from migrate import apply_migrations
+from utils import build_page_query, encode_cursor, word_filters
+
+# Tables expected to grow without bound; a full scan of any of these is a regression
+LARGE_TABLES = {
+    "words", "word_groups", "word_reviews", "word_review_items",
+    "word_stats", "word_schedule", "study_sessions", "study_activities",
+}
+
+# Full scans that are inherent to the statement, keyed by (function, table)
+ALLOWED_SCANS = {
+    ("get_words", "words"): "COUNT(*) for total_items",
+    ("search_words", "words"): "queries shorter than a trigram cannot use words_fts",
+    ("get_study_progress", "word_stats"): "whole-vocabulary review totals",
+    ("get_study_progress", "word_reviews"): "per-group review breakdown over all history",
+    ("get_quick_stats", "words"): "COUNT(*) of all words",
+    ("get_quick_stats", "word_stats"): "count of learned words",
+    ("export_reviews", "word_reviews"): "exports stream the whole history",
+    ("export_study_sessions", "study_sessions"): "exports stream the whole history",
+}
+
+# Development-only endpoints that touch whole tables by design
+SKIPPED_FUNCTIONS = {"reset_all_data", "reset_study_data", "seed_test_data", "_restore_template", "carry_over"}
+
+PAGE_HELPERS = {"fetch_page", "paginate"}
+
+# A "{filters}" placeholder is planned with each combination of word list filters
+FILTER_VARIANTS = {
+    "unfiltered": word_filters(),
+    "type": word_filters("noun"),
+    "usage": word_filters(usage="formal"),
+    "type+usage": word_filters("noun", "formal"),
+}
+
+def _expand_filters(sql):
+    if "{filters}" not in sql:
+        return [("", sql)]
+    return [(f"[{name}]", sql.replace("{filters}", filters))
+            for name, (filters, _) in FILTER_VARIANTS.items()]
+
+SQL_START = re.compile(r"\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\s")
+TABLE_REF = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+NUMBERED_PARAM = re.compile(r"\?(\d+)")
+NAMED_PARAM = re.compile(r"(?<![\w:]):([A-Za-z_]\w*)")
+SQL_KEYWORDS = {"where", "on", "left", "inner", "join", "group", "order", "limit", "set", "values", "select"}
+
+def _page_calls(func):
+    """
+    Return (order_by, descending) for each fetch_page or paginate call in a
+    route function, whether called directly or handed to ``conn.run(...)``.
+    """
+    calls = []
+    for node in ast.walk(func):
+        if not isinstance(node, ast.Call):
+            continue
+        direct = getattr(node.func, "id", None) in PAGE_HELPERS
+        via_run = (getattr(node.func, "attr", None) == "run" and node.args
+                   and getattr(node.args[0], "id", None) in PAGE_HELPERS)
+        if not (direct or via_run):
+            continue
+        # Both forms pass (conn|helper, query, params, order_by, ...)
+        order_by = tuple(elt.value for elt in node.args[3].elts)
+        descending = any(
+            kw.arg == "descending" and kw.value.value for kw in node.keywords
+        )
+        calls.append((order_by, descending))
+    return calls
+
+def collect_statements():
+    statements = []
+    for path in sorted(glob(os.path.join(backend_dir, "routes", "*.py"))):
+        module = os.path.basename(path)
+        with open(path, "r") as source:
+            tree = ast.parse(source.read())
+        for func in ast.walk(tree):
+            if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            if func.name in SKIPPED_FUNCTIONS:
+                continue
+            for node in ast.walk(func):
+                if not (isinstance(node, ast.Constant) and isinstance(node.value, str)):
+                    continue
+                if not SQL_START.match(node.value):
+                    continue
+                for variant, value in _expand_filters(node.value):
+                    name = f"{module}::{func.name}:{node.lineno}{variant}"
+                    if "{keyset}" not in value:
+                        statements.append(pytest.param(func.name, value, (), id=name))
+                        continue
+                    for order_by, descending in _page_calls(func):
+                        cursor = encode_cursor([1] * len(order_by))
+                        for mode, page_cursor in (("offset", None), ("cursor", cursor)):
+                            sql, extra = build_page_query(
+                                value, order_by, page=3, cursor=page_cursor, descending=descending
+                            )
+                            statements.append(pytest.param(func.name, sql, extra, id=f"{name}[{mode}]"))
+    return statements
+
+@pytest.fixture(scope="module")
+def plan_db(tmp_path_factory):
+    db_name = str(tmp_path_factory.mktemp("plans") / "plans.db")
+    with get_db_connection(db_name) as conn:
+        for f in sorted(glob(os.path.join(backend_dir, "sql/setup/*.sql"))):
+            with open(f, "r") as sql_script:
+                conn.executescript(sql_script.read())
+    apply_migrations(db_name)
+    return db_name
+
+def full_table_scans(sql, plan):
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    temp_sort = any("USE TEMP B-TREE" in detail for detail in plan)
+    bounded = " LIMIT " in sql and not temp_sort
+    scans = []
+    for detail in plan:
+        match = re.fullmatch(r"SCAN (\w+)", detail)
+        if not match:
+            continue
+        table = aliases.get(match.group(1), match.group(1))
+        # A LIMITed walk in index order stops after one page
+        if table in LARGE_TABLES and not bounded:
+            scans.append(table)
+    return scans
+
+@pytest.mark.parametrize("func_name, sql, extra_params", collect_statements())
+def test_no_full_table_scans(plan_db, func_name, sql, extra_params):
+    named = set(NAMED_PARAM.findall(sql))
+    if named:
+        params = {name: 1 for name in named}
+    else:
+        numbered = [int(n) for n in NUMBERED_PARAM.findall(sql)]
+        count = max(numbered) if numbered else sql.count("?")
+        params = (1,) * (count - len(extra_params)) + tuple(extra_params)
+    with get_db_connection(plan_db) as conn:
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    offending = [
+        table for table in full_table_scans(sql, plan)
+        if (func_name, table) not in ALLOWED_SCANS
+    ]
+    assert not offending, f"Full table scan of {offending} in {func_name}:\n" + "\n".join(plan)
@@ -0,0 +1,130 @@
+import sys
+import os
+import contextvars
+import sqlite3
+import time
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from app import app
+from lib import replica as replica_module
+from lib.cache import aggregate_cache, bump_data_version
+from lib.db import DEFAULT_DB_NAME, get_db_connection, close_pool
+from lib.replica import SnapshotReplica, analytics_db, pinned_analytics_db
+
+client = TestClient(app)
+
+@pytest.fixture
+def source(tmp_path):
+    db_name = str(tmp_path / "source.db")
+    with get_db_connection(db_name) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.execute("INSERT INTO items (name) VALUES ('first')")
+    yield db_name
+    close_pool(db_name)
+
+@pytest.fixture
+def snapshots(source, tmp_path):
+    replica = SnapshotReplica(source, str(tmp_path / "replica"), refresh_interval=3600, max_staleness=60)
+    yield replica
+    replica.stop()
+
+def _count(db_name):
+    with get_db_connection(db_name) as conn:
+        return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+def test_refresh_takes_read_only_snapshot(source, snapshots):
+    first = snapshots.refresh()
+    with get_db_connection(source) as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('second')")
+
+    assert _count(first.db_name) == 1
+    with pytest.raises(sqlite3.OperationalError):
+        with get_db_connection(first.db_name) as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('third')")
+
+    second = snapshots.refresh()
+    assert _count(second.db_name) == 2
+    # The previous snapshot stays readable; the one before it is deleted
+    assert os.path.exists(first.path)
+    third = snapshots.refresh()
+    assert not os.path.exists(first.path)
+    assert os.path.exists(second.path) and os.path.exists(third.path)
+    assert snapshots.stats()["generation"] == 3
+
+def test_refresh_does_not_block_writers(source, snapshots):
+    # Another connection holds a write transaction open during the backup
+    writer = sqlite3.connect(source, timeout=0)
+    try:
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+        snapshot = snapshots.refresh()
+        writer.execute("INSERT INTO items (name) VALUES ('after backup')")
+        writer.commit()
+    finally:
+        writer.close()
+    assert _count(snapshot.db_name) == 1
+    assert _count(source) == 3
+
+def test_current_respects_staleness_bound(snapshots):
+    snapshots.start()
+    deadline = time.monotonic() + 5
+    while snapshots.age() is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert snapshots.current() is not None
+
+    snapshots.max_staleness = 0
+    assert snapshots.current() is None
+
+    snapshots.stop()
+    assert not any(name.startswith("replica.") for name in os.listdir(os.path.dirname(snapshots.path)))
+
+def test_analytics_db_is_pinned_until_released(monkeypatch, snapshots):
+    monkeypatch.setattr(replica_module, "ENABLE_READ_REPLICA", True)
+    monkeypatch.setattr(replica_module, "replica", snapshots)
+    snapshots.max_staleness = 0
+
+    def choose():
+        with pinned_analytics_db() as pinned:
+            before = analytics_db()
+            snapshots.refresh()
+            snapshots.max_staleness = 60
+            assert analytics_db() == pinned
+        return before, analytics_db()
+
+    before, after = contextvars.copy_context().run(choose)
+    assert before == DEFAULT_DB_NAME
+    # Released on exit, so the next choice sees the fresh snapshot
+    assert after == snapshots._current.db_name
+    assert analytics_db() == snapshots._current.db_name
+
+def test_dashboard_reads_from_replica(monkeypatch, tmp_path):
+    snapshots = SnapshotReplica(DEFAULT_DB_NAME, str(tmp_path / "replica"), refresh_interval=3600, max_staleness=60)
+    monkeypatch.setattr(replica_module, "ENABLE_READ_REPLICA", True)
+    monkeypatch.setattr(replica_module, "replica", snapshots)
+    snapshots.refresh()
+    try:
+        before = client.get("/api/dashboard/quick-stats").json()["total_words"]
+        with get_db_connection() as conn:
+            word_id = conn.execute(
+                "INSERT INTO words (jamaican_patois, english, parts) VALUES ('replica', 'replica', '{}')"
+            ).lastrowid
+        bump_data_version()
+        try:
+            # Still the snapshot, whose aggregates stay cached until the next refresh
+            hits = aggregate_cache.stats()["hits"]
+            assert client.get("/api/dashboard/quick-stats").json()["total_words"] == before
+            assert aggregate_cache.stats()["hits"] == hits + 1
+            snapshots.refresh()
+            assert client.get("/api/dashboard/quick-stats").json()["total_words"] == before + 1
+        finally:
+            with get_db_connection() as conn:
+                conn.execute("DELETE FROM words WHERE id = ?", (word_id,))
+            bump_data_version()
+    finally:
+        snapshots.stop()
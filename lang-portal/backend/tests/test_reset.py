@@ -9,20 +9,28 @@ backend_dir = os.path.join(current_dir, '..')
 sys.path.append(backend_dir)
 
 from app import app
+from routes import reset
+from lib.db import get_db_connection
 
 client = TestClient(app)
 
 # Set environment variable for testing
 os.environ["ENABLE_RESET"] = "true"
 
+@pytest.fixture(autouse=True)
+def reset_enabled(monkeypatch, fresh_db):
+    # The flag is read at import; the database is restored after each test
+    monkeypatch.setattr(reset, "ENABLE_RESET", True)
+
 def test_reset_all_data():
     response = client.post("/api/reset/all")
     assert response.status_code == 200
     assert response.json()["message"] == "All data has been reset"
     
-    # Verify data is reset
+    # Verify data is reset; the schema-only template has no groups
     groups = client.get("/api/groups")
-    assert groups.json()["groups"] == []
+    assert groups.status_code == 404
+    assert groups.json()["detail"] == "No groups found"
 
 def test_reset_study_data():
     # First seed some data
@@ -35,11 +43,17 @@ def test_reset_study_data():
     
     # Verify study data is reset but words/groups remain
     study_sessions = client.get("/api/study_sessions")
-    assert study_sessions.json()["study_sessions"] == []
+    assert study_sessions.status_code == 404
+    assert study_sessions.json()["detail"] == "No study sessions found"
     
     groups = client.get("/api/groups")
     assert len(groups.json()["groups"]) > 0
 
+    # Nothing derived from the deleted rows is left behind
+    with get_db_connection() as conn:
+        for table in ("word_stats", "word_schedule", "daily_activity"):
+            assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0, table
+
 def test_seed_test_data():
     # First reset all data
     client.post("/api/reset/all")
@@ -54,4 +68,19 @@ def test_seed_test_data():
     assert len(groups.json()["groups"]) > 0
     
     study_sessions = client.get("/api/study_sessions")
-    assert len(study_sessions.json()["study_sessions"]) > 0 
\ No newline at end of file
+    assert len(study_sessions.json()["study_sessions"]) > 0 
+
+def test_reset_keeps_settings_and_moves_versions_forward():
+    with get_db_connection() as conn:
+        conn.execute("UPDATE user_settings SET words_per_session = 25 WHERE id = 1")
+        before = dict(conn.execute("SELECT table_name, version FROM table_versions").fetchall())
+
+    assert client.post("/api/reset/all").status_code == 200
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT words_per_session FROM user_settings WHERE id = 1").fetchone()[0] == 25
+        after = dict(conn.execute("SELECT table_name, version FROM table_versions").fetchall())
+    assert all(after[table] > version for table, version in before.items())
+
+def test_reset_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(reset, "ENABLE_RESET", False)
+    assert client.post("/api/reset/all").status_code == 403
@@ -0,0 +1,107 @@
+import sys
+import os
+import json
+import pytest
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from glob import glob
+from init_db import SEED_TABLES, bulk_seed_data, iter_json_array, seed_data
+from lib.db import get_db_connection, close_pool
+from migrate import apply_migrations
+
+SEED_DIR = os.path.join(backend_dir, "seed")
+
+def _create_db(path):
+    db_name = str(path)
+    with get_db_connection(db_name) as conn:
+        for f in sorted(glob(os.path.join(backend_dir, "sql/setup/*.sql"))):
+            with open(f, "r") as sql_script:
+                conn.executescript(sql_script.read())
+    apply_migrations(db_name)
+    return db_name
+
+def _snapshot(db_name):
+    with get_db_connection(db_name) as conn:
+        return {
+            "counts": {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in SEED_TABLES
+            },
+            "fts": conn.execute(
+                "SELECT rowid FROM words_fts WHERE words_fts MATCH 'a*' ORDER BY rowid"
+            ).fetchall(),
+            "daily_activity": conn.execute(
+                "SELECT day, sessions FROM daily_activity ORDER BY day"
+            ).fetchall(),
+            "indexes": conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name"
+            ).fetchall(),
+            "triggers": conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' ORDER BY name"
+            ).fetchall(),
+            "journal_mode": conn.execute("PRAGMA journal_mode").fetchone()[0],
+        }
+
+@pytest.fixture
+def databases(tmp_path):
+    row_db = _create_db(tmp_path / "row.db")
+    bulk_db = _create_db(tmp_path / "bulk.db")
+    yield row_db, bulk_db
+    close_pool(row_db)
+    close_pool(bulk_db)
+
+def test_iter_json_array_across_chunks(tmp_path):
+    items = [{"id": i, "text": "x" * (i % 7), "nested": {"list": [i, " ]"]}} for i in range(50)]
+    path = tmp_path / "items.json"
+    path.write_text(json.dumps(items, indent=2))
+    assert list(iter_json_array(str(path), chunk_size=16)) == items
+
+def test_iter_json_array_empty_and_invalid(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text(" [ ] ")
+    assert list(iter_json_array(str(path))) == []
+
+    path.write_text('{"id": 1}')
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path)))
+
+    path.write_text('[{"id": 1} {"id": 2}]')
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path)))
+
+def test_bulk_seed_matches_row_by_row(databases):
+    row_db, bulk_db = databases
+    seed_data(row_db, SEED_DIR)
+    counts = bulk_seed_data(bulk_db, SEED_DIR, batch_size=3)
+
+    row, bulk = _snapshot(row_db), _snapshot(bulk_db)
+    assert counts == row["counts"]
+    assert bulk == row
+    assert bulk["journal_mode"] == "wal"
+
+def test_bulk_seed_bumps_table_versions(databases):
+    _, bulk_db = databases
+    with get_db_connection(bulk_db) as conn:
+        before = dict(conn.execute("SELECT table_name, version FROM table_versions").fetchall())
+    bulk_seed_data(bulk_db, SEED_DIR)
+    with get_db_connection(bulk_db) as conn:
+        after = dict(conn.execute("SELECT table_name, version FROM table_versions").fetchall())
+    for table in SEED_TABLES:
+        assert after[table] > before[table]
+
+def test_bulk_seed_failure_rolls_back(databases, tmp_path):
+    _, bulk_db = databases
+    seed_dir = tmp_path / "seed"
+    seed_dir.mkdir()
+    for table in SEED_TABLES:
+        (seed_dir / f"{table}.json").write_text("[]")
+    (seed_dir / "groups.json").write_text('[{"id": 1, "name": "A"}, {"id": 1, "name": "B"}]')
+
+    before = _snapshot(bulk_db)
+    with pytest.raises(Exception):
+        bulk_seed_data(bulk_db, str(seed_dir))
+    assert _snapshot(bulk_db) == before
@@ -1,6 +1,7 @@
 import sys
 import os
 import pytest
+from datetime import datetime, timezone
 from fastapi.testclient import TestClient
 
 # Add the backend directory to the Python path
@@ -113,4 +114,101 @@ def test_create_word_review_word_not_in_session():
         json={"correct": True}
     )
     assert response.status_code == 400
-    assert response.json()["detail"] == "Word is not part of this study session" 
\ No newline at end of file
+    assert response.json()["detail"] == "Word is not part of this study session" 
+
+def test_get_study_sessions_cursor_walk():
+    offset_ids = []
+    page = 1
+    while True:
+        data = client.get(f"/api/study_sessions?page={page}&page_size=3").json()
+        offset_ids += [s["id"] for s in data["study_sessions"]]
+        if page >= data["pagination"]["total_pages"]:
+            break
+        page += 1
+
+    cursor_ids = []
+    next_cursor = None
+    while True:
+        url = "/api/study_sessions?page_size=3"
+        if next_cursor:
+            url += f"&cursor={next_cursor}"
+        data = client.get(url).json()
+        cursor_ids += [s["id"] for s in data["study_sessions"]]
+        next_cursor = data["pagination"]["next_cursor"]
+        if not next_cursor:
+            break
+
+    assert cursor_ids == offset_ids
+
+def test_create_word_reviews_batch():
+    response = client.post(
+        "/api/study_sessions/1/reviews",
+        json=[
+            {"word_id": 1, "correct": True},
+            {"word_id": 9999, "correct": True},
+            {"word_id": 2, "correct": False, "answered_at": "2025-02-01T10:00:00"}
+        ]
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["study_session_id"] == 1
+    assert data["created"] == 2
+    assert data["failed"] == 1
+
+    created, missing, dated = data["results"]
+    assert created["status"] == "created"
+    assert missing == {
+        "word_id": 9999, "status": "error", "review_id": None,
+        "created_at": None, "detail": "Word not found"
+    }
+    assert dated["created_at"] == "2025-02-01T10:00:00"
+    assert dated["review_id"] == created["review_id"] + 1
+
+def test_create_word_reviews_batch_stores_local_time():
+    response = client.post(
+        "/api/study_sessions/1/reviews",
+        json=[{"word_id": 1, "correct": True, "answered_at": "2025-02-01T10:00:00+00:00"}]
+    )
+    assert response.status_code == 200
+    expected = datetime(2025, 2, 1, 10, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    assert response.json()["results"][0]["created_at"] == expected.isoformat()
+
+def test_create_word_reviews_batch_session_not_found():
+    response = client.post(
+        "/api/study_sessions/9999/reviews",
+        json=[{"word_id": 1, "correct": True}]
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Study session not found"
+
+def test_create_word_reviews_batch_empty():
+    response = client.post("/api/study_sessions/1/reviews", json=[])
+    assert response.status_code == 400
+
+def test_get_next_words():
+    response = client.get("/api/study_sessions/1/next_words?limit=5")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["study_session_id"] == 1
+    assert len(data["words"]) <= 5
+    due = [word["due_at"] for word in data["words"] if word["due_at"] is not None]
+    assert due == sorted(due)
+    # Scheduled (due) words come before never-reviewed ones
+    seen_new = False
+    for word in data["words"]:
+        if word["due_at"] is None:
+            seen_new = True
+        else:
+            assert not seen_new
+
+def test_get_next_words_session_not_found():
+    response = client.get("/api/study_sessions/999999/next_words")
+    assert response.status_code == 404
+
+def test_create_word_review_twice_adds_one_review_item(fresh_db):
+    response = client.post("/api/study_activities", json={"name": "Flashcards", "group_id": 1})
+    session_id = response.json()["study_session_id"]
+    for correct in (True, False):
+        response = client.post(f"/api/study_sessions/{session_id}/words/1/review", json={"correct": correct})
+        assert response.status_code == 200
+    assert client.get(f"/api/study_sessions/{session_id}").json()["review_items_count"] == 1
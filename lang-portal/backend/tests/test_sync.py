@@ -0,0 +1,110 @@
+import gzip
+import json
+import sys
+import os
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from app import app
+from lib.bulk import upsert_words
+from lib.db import get_db_connection
+from models import WordSync
+
+client = TestClient(app)
+
+def _unique(label):
+    return f"{label}-{uuid.uuid4().hex[:12]}"
+
+def test_health():
+    response = client.get("/api/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+def test_sync_words_inserts_updates_and_skips():
+    patois = _unique("sync")
+    words = [
+        {"jamaican_patois": patois, "english": "one", "parts": {"type": "noun"}},
+        {"jamaican_patois": patois, "english": "two", "parts": {"type": "noun"}},
+    ]
+    response = client.post("/api/words/sync", json={"words": words})
+    assert response.status_code == 200
+    assert response.json() == {"received": 2, "inserted": 2, "updated": 0, "skipped": 0}
+
+    words[1]["parts"] = {"type": "verb"}
+    response = client.post("/api/words/sync", json={"words": words})
+    assert response.json() == {"received": 2, "inserted": 0, "updated": 1, "skipped": 1}
+
+def test_sync_words_last_duplicate_wins():
+    patois = _unique("dup")
+    words = [
+        {"jamaican_patois": patois, "english": "same", "parts": {"type": "noun"}},
+        {"jamaican_patois": patois, "english": "same", "parts": {"type": "verb"}},
+    ]
+    response = client.post("/api/words/sync", json={"words": words})
+    assert response.json() == {"received": 2, "inserted": 1, "updated": 0, "skipped": 1}
+
+def test_sync_words_gzip_ndjson():
+    patois = _unique("ndjson")
+    lines = "\n".join(
+        json.dumps({"jamaican_patois": patois, "english": str(i), "parts": None})
+        for i in range(500)
+    )
+    response = client.post(
+        "/api/words/sync",
+        content=gzip.compress(lines.encode()),
+        headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 500
+
+def test_sync_words_validation_error():
+    response = client.post("/api/words/sync", json={"words": [{"english": "missing patois"}]})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["index"] == 0
+
+def test_sync_words_malformed_body():
+    response = client.post(
+        "/api/words/sync", content=b"{not json", headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 400
+
+def test_sync_groups_and_word_groups():
+    name = _unique("group")
+    response = client.post("/api/groups/sync", json={"groups": [{"name": name}, {"name": name}]})
+    assert response.json() == {"received": 2, "inserted": 1, "updated": 0, "skipped": 1}
+
+    group_id = None
+    cursor = None
+    while group_id is None:
+        page = client.get("/api/groups", params={"page_size": 100, "cursor": cursor}).json()
+        group_id = next((g["id"] for g in page["groups"] if g["name"] == name), None)
+        cursor = page["pagination"]["next_cursor"]
+        if cursor is None:
+            break
+    assert group_id is not None
+
+    response = client.post("/api/groups/sync", json={"groups": [{"id": group_id, "name": name + "-renamed"}]})
+    assert response.json() == {"received": 1, "inserted": 0, "updated": 1, "skipped": 0}
+
+    links = [{"word_id": 1, "group_id": group_id}, {"word_id": 1, "group_id": group_id},
+             {"word_id": 999999999, "group_id": group_id}]
+    response = client.post("/api/word-groups/sync", json={"word_groups": links})
+    assert response.json() == {"received": 3, "inserted": 1, "updated": 0, "skipped": 2}
+
+    response = client.get(f"/api/groups/{group_id}/words")
+    assert [word["id"] for word in response.json()["words"]] == [1]
+
+def test_sync_takes_the_write_lock_before_staging():
+    statements = []
+    with get_db_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        upsert_words(conn, [WordSync(jamaican_patois=_unique("word"), english="lock")])
+        conn.set_trace_callback(None)
+    # A deferred transaction would start with the staging reads and could not
+    # upgrade to a writer once another connection had committed
+    assert statements[0] == "BEGIN IMMEDIATE"
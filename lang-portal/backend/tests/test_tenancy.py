@@ -0,0 +1,131 @@
+import sys
+import os
+import sqlite3
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from app import app
+from lib import tenancy
+from lib.db import DEFAULT_DB_NAME, get_db_connection, pool_stats
+from lib.tenancy import ShardRouter
+from routes import reset
+
+client = TestClient(app)
+
+@pytest.fixture
+def shards(monkeypatch, tmp_path):
+    router = ShardRouter(str(tmp_path / "learners"), DEFAULT_DB_NAME, max_open=2)
+    monkeypatch.setattr(tenancy, "ENABLE_TENANCY", True)
+    monkeypatch.setattr(tenancy, "shards", router)
+    yield router
+    router.close()
+
+def _learner(learner_id):
+    return {tenancy.TENANT_HEADER: learner_id}
+
+def _count(db_name, table):
+    with get_db_connection(db_name) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+def test_shard_reads_shared_vocabulary_read_only(shards):
+    db_name = shards.db_name("alice")
+
+    assert os.path.exists(shards.path("alice"))
+    with get_db_connection(db_name) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")}
+    assert "words" not in tables and "study_sessions" in tables
+    assert _count(db_name, "words") == _count(DEFAULT_DB_NAME, "words") > 0
+    assert _count(db_name, "study_sessions") == 0
+
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        with get_db_connection(db_name) as conn:
+            conn.execute("INSERT INTO words (jamaican_patois, english, parts) VALUES ('x', 'x', '{}')")
+
+def test_learners_write_to_their_own_shards(shards):
+    sessions = _count(DEFAULT_DB_NAME, "study_sessions")
+    response = client.post("/api/study_activities", json={"name": "Flashcards", "group_id": 1},
+                           headers=_learner("alice"))
+    assert response.status_code == 200
+    assert response.json()["group_name"]
+
+    alice = client.get("/api/study_sessions", headers=_learner("alice"))
+    assert alice.json()["pagination"]["total_items"] == 1
+    assert client.get("/api/study_sessions", headers=_learner("bob")).status_code == 404
+    assert _count(DEFAULT_DB_NAME, "study_sessions") == sessions
+
+    # Same versions in both shards, but the ETags must not be interchangeable
+    client.post("/api/study_activities", json={"name": "Flashcards", "group_id": 1}, headers=_learner("bob"))
+    etag = client.get("/api/study_sessions", headers=_learner("alice")).headers["etag"]
+    response = client.get("/api/study_sessions", headers={**_learner("bob"), "If-None-Match": etag})
+    assert response.status_code == 200
+
+def test_settings_are_per_learner(shards):
+    settings = client.get("/api/settings", headers=_learner("alice")).json()
+    response = client.post("/api/settings", json={**settings, "wordsPerSession": 42},
+                           headers=_learner("alice"))
+    assert response.status_code == 200
+
+    assert client.get("/api/settings", headers=_learner("alice")).json()["wordsPerSession"] == 42
+    assert client.get("/api/settings", headers=_learner("bob")).json()["wordsPerSession"] != 42
+
+def test_least_recently_used_shard_is_closed(shards):
+    alice = shards.db_name("alice")
+    bob = shards.db_name("bob")
+    shards.db_name("alice")
+    carol = shards.db_name("carol")
+
+    open_pools = {pool["db_name"] for pool in pool_stats()}
+    assert alice in open_pools and carol in open_pools
+    assert bob not in open_pools
+    assert shards.stats()["evictions"] == 1
+    assert shards.stats()["open"] == 2
+    # An evicted shard reopens with the shared vocabulary attached again
+    assert _count(shards.db_name("bob"), "words") > 0
+
+def test_shard_in_use_is_not_closed(shards):
+    # alice has a request in flight while two other learners are opened
+    alice = shards.acquire("alice")
+    with get_db_connection(alice) as conn:
+        bob = shards.db_name("bob")
+        carol = shards.db_name("carol")
+        assert conn.execute("SELECT COUNT(*) FROM study_sessions").fetchone()[0] == 0
+
+    open_pools = {pool["db_name"] for pool in pool_stats()}
+    assert alice in open_pools and carol in open_pools
+    assert bob not in open_pools
+    assert shards.stats()["open"] == 2
+
+    # With every open shard held the limit is exceeded until they are released
+    shards.acquire("carol")
+    shards.acquire("bob")
+    assert shards.stats()["open"] == 3 and shards.stats()["in_use"] == 3
+    shards.release("alice")
+    assert alice not in {pool["db_name"] for pool in pool_stats()}
+    shards.release("carol")
+    shards.release("bob")
+    assert shards.stats()["open"] == 2 and shards.stats()["in_use"] == 0
+
+def test_request_releases_its_shard(shards):
+    assert client.get("/api/settings", headers=_learner("alice")).status_code == 200
+    assert shards.stats()["in_use"] == 0
+
+def test_invalid_learner_and_shared_writes_are_rejected(shards):
+    assert client.get("/api/settings", headers=_learner("../alice")).status_code == 400
+    response = client.post("/api/groups/sync", json={"groups": [{"name": "Shard group"}]},
+                           headers=_learner("alice"))
+    assert response.status_code == 403
+
+def test_reset_rebuilds_only_the_learners_shard(monkeypatch, shards):
+    monkeypatch.setattr(reset, "ENABLE_RESET", True)
+    sessions = _count(DEFAULT_DB_NAME, "study_sessions")
+
+    assert client.post("/api/reset/seed", headers=_learner("alice")).status_code == 200
+    assert client.get("/api/study_sessions", headers=_learner("alice")).json()["pagination"]["total_items"] > 0
+    assert client.post("/api/reset/all", headers=_learner("alice")).status_code == 200
+    assert client.get("/api/study_sessions", headers=_learner("alice")).status_code == 404
+    assert _count(DEFAULT_DB_NAME, "study_sessions") == sessions
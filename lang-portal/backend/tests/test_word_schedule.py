@@ -0,0 +1,97 @@
+import sys
+import os
+import pytest
+import time
+from glob import glob
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from lib.db import get_db_connection
+
+@pytest.fixture
+def schedule_db(tmp_path):
+    db_name = str(tmp_path / "schedule.db")
+    with get_db_connection(db_name) as conn:
+        for f in sorted(glob(os.path.join(backend_dir, "sql/setup/*.sql"))):
+            with open(f, "r") as sql_script:
+                conn.executescript(sql_script.read())
+        conn.execute("INSERT INTO words (jamaican_patois, english) VALUES ('mi', 'me'), ('yuh', 'you')")
+    yield db_name
+
+def get_schedule(db_name, word_id):
+    with get_db_connection(db_name) as conn:
+        return conn.execute(
+            """
+            SELECT ease_factor, interval_hours, repetitions, lapses, last_reviewed_at, due_at
+            FROM word_schedule WHERE word_id = ?
+            """,
+            (word_id,)
+        ).fetchone()
+
+def add_review(db_name, word_id, correct, created_at):
+    with get_db_connection(db_name) as conn:
+        conn.execute(
+            "INSERT INTO word_reviews (word_id, study_session_id, correct, created_at) VALUES (?, 1, ?, ?)",
+            (word_id, correct, created_at)
+        )
+
+def test_correct_answers_grow_interval(schedule_db):
+    add_review(schedule_db, 1, True, "2025-01-01T10:00:00")
+    assert get_schedule(schedule_db, 1) == (2.5, 24, 1, 0, "2025-01-01 10:00:00", "2025-01-02 10:00:00")
+    add_review(schedule_db, 1, True, "2025-01-02T10:00:00")
+    assert get_schedule(schedule_db, 1)[1:3] == (144, 2)
+    add_review(schedule_db, 1, True, "2025-01-08T10:00:00")
+    ease, interval, repetitions, _, _, due_at = get_schedule(schedule_db, 1)
+    assert (ease, interval, repetitions) == (2.5, 360, 3)
+    assert due_at == "2025-01-23 10:00:00"
+    assert get_schedule(schedule_db, 2) is None
+
+def test_wrong_answer_resets_and_lowers_ease(schedule_db):
+    add_review(schedule_db, 1, True, "2025-01-01T10:00:00")
+    add_review(schedule_db, 1, True, "2025-01-02T10:00:00")
+    add_review(schedule_db, 1, False, "2025-01-08T10:00:00")
+    ease, interval, repetitions, lapses, _, _ = get_schedule(schedule_db, 1)
+    assert ease == pytest.approx(2.18)
+    assert (interval, repetitions, lapses) == (24, 0, 1)
+
+    add_review(schedule_db, 1, True, "2025-01-09T10:00:00")
+    assert get_schedule(schedule_db, 1)[0] == pytest.approx(2.28)
+
+def test_ease_never_below_minimum(schedule_db):
+    for day in range(1, 8):
+        add_review(schedule_db, 1, False, f"2025-01-0{day}T10:00:00")
+    assert get_schedule(schedule_db, 1)[0] == pytest.approx(1.3)
+
+def test_older_review_is_ignored(schedule_db):
+    add_review(schedule_db, 1, True, "2025-01-02T10:00:00")
+    before = get_schedule(schedule_db, 1)
+    add_review(schedule_db, 1, False, "2025-01-01T10:00:00")
+    assert get_schedule(schedule_db, 1) == before
+
+def test_honours_review_interval_setting(schedule_db):
+    with get_db_connection(schedule_db) as conn:
+        conn.execute("UPDATE user_settings SET review_interval = 12 WHERE id = 1")
+    add_review(schedule_db, 1, True, "2025-01-01T10:00:00")
+    assert get_schedule(schedule_db, 1)[1] == 12
+    assert get_schedule(schedule_db, 1)[5] == "2025-01-01 22:00:00"
+
+def test_interval_is_capped(schedule_db):
+    # Uncapped, the interval passes SQLite's date range after ~15 correct answers
+    for minute in range(30):
+        add_review(schedule_db, 1, True, f"2025-01-01T10:{minute:02d}:00")
+    _, interval, repetitions, _, _, due_at = get_schedule(schedule_db, 1)
+    assert (interval, repetitions) == (876000, 30)
+    assert due_at == "2124-12-08 10:29:00"
+
+def test_offset_timestamps_are_scheduled_in_local_time(schedule_db, monkeypatch):
+    monkeypatch.setenv("TZ", "America/Jamaica")
+    time.tzset()
+    try:
+        add_review(schedule_db, 1, True, "2025-03-01T15:00:00+00:00")
+        assert get_schedule(schedule_db, 1)[4:] == ("2025-03-01 10:00:00", "2025-03-02 10:00:00")
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,66 @@
+import sys
+import os
+import pytest
+from glob import glob
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from lib.db import get_db_connection
+from word_stats import check_word_stats, rebuild_word_stats
+
+@pytest.fixture
+def stats_db(tmp_path):
+    db_name = str(tmp_path / "stats.db")
+    with get_db_connection(db_name) as conn:
+        for f in sorted(glob(os.path.join(backend_dir, "sql/setup/*.sql"))):
+            with open(f, "r") as sql_script:
+                conn.executescript(sql_script.read())
+        conn.execute("INSERT INTO words (jamaican_patois, english) VALUES ('mi', 'me'), ('yuh', 'you')")
+    yield db_name
+
+def get_stats(db_name, word_id):
+    with get_db_connection(db_name) as conn:
+        return conn.execute(
+            "SELECT correct_count, wrong_count, last_reviewed_at FROM word_stats WHERE word_id = ?",
+            (word_id,)
+        ).fetchone()
+
+def add_review(db_name, word_id, correct, created_at):
+    with get_db_connection(db_name) as conn:
+        return conn.execute(
+            "INSERT INTO word_reviews (word_id, study_session_id, correct, created_at) VALUES (?, 1, ?, ?)",
+            (word_id, correct, created_at)
+        ).lastrowid
+
+def test_insert_trigger_counts_reviews(stats_db):
+    add_review(stats_db, 1, True, "2025-01-01T10:00:00")
+    add_review(stats_db, 1, False, "2025-01-02T10:00:00")
+    add_review(stats_db, 1, True, "2025-01-01T12:00:00")
+    assert get_stats(stats_db, 1) == (2, 1, "2025-01-02T10:00:00")
+    assert get_stats(stats_db, 2) is None
+    assert check_word_stats(stats_db) == []
+
+def test_update_and_delete_triggers(stats_db):
+    first = add_review(stats_db, 1, True, "2025-01-01T10:00:00")
+    second = add_review(stats_db, 1, False, "2025-01-02T10:00:00")
+    with get_db_connection(stats_db) as conn:
+        conn.execute("UPDATE word_reviews SET word_id = 2, correct = 1 WHERE id = ?", (second,))
+    assert get_stats(stats_db, 1) == (1, 0, "2025-01-01T10:00:00")
+    assert get_stats(stats_db, 2) == (1, 0, "2025-01-02T10:00:00")
+
+    with get_db_connection(stats_db) as conn:
+        conn.execute("DELETE FROM word_reviews WHERE id = ?", (first,))
+    assert get_stats(stats_db, 1) is None
+    assert check_word_stats(stats_db) == []
+
+def test_check_detects_and_rebuild_repairs_drift(stats_db):
+    add_review(stats_db, 1, True, "2025-01-01T10:00:00")
+    with get_db_connection(stats_db) as conn:
+        conn.execute("UPDATE word_stats SET correct_count = 5 WHERE word_id = 1")
+    assert [row[0] for row in check_word_stats(stats_db)] == [1]
+
+    rebuild_word_stats(stats_db)
+    assert check_word_stats(stats_db) == []
@@ -1,5 +1,6 @@
 import sys
 import os
+import uuid
 import pytest
 from fastapi.testclient import TestClient
 # Add the backend directory to the Python path
@@ -8,6 +9,8 @@ backend_dir = os.path.join(current_dir, '..')
 sys.path.append(backend_dir)
 
 from app import app
+from utils import encode_cursor
+from lib.cache import page_totals
 
 client = TestClient(app)
 
@@ -60,4 +63,172 @@ def test_get_word_groups():
 def test_get_word_groups_not_found():
     response = client.get("/api/words/9999/groups")
     assert response.status_code == 404
-    assert response.json()["detail"] == "Word not found" 
\ No newline at end of file
+    assert response.json()["detail"] == "Word not found" 
+
+def test_get_words_with_cursor():
+    first = client.get("/api/words?page_size=5").json()
+    next_cursor = first["pagination"]["next_cursor"]
+    assert next_cursor is not None
+
+    response = client.get(f"/api/words?page_size=5&cursor={next_cursor}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pagination"]["current_page"] is None
+
+    # Cursor paging walks the same rows as offset paging
+    second = client.get("/api/words?page=2&page_size=5").json()
+    assert [w["id"] for w in data["words"]] == [w["id"] for w in second["words"]]
+
+def test_get_words_invalid_cursor():
+    response = client.get("/api/words?cursor=not-a-cursor")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_search_words():
+    word = client.get("/api/words/1").json()
+    term = word["jamaican_patois"][:3]
+    response = client.get("/api/words/search", params={"q": term})
+    assert response.status_code == 200
+    results = response.json()["words"]
+    assert word["id"] in [result["id"] for result in results]
+    assert all("<mark>" in r["jamaican_patois_highlight"] + r["english_highlight"] for r in results)
+    assert response.json()["pagination"]["total_items"] >= 1
+
+def test_search_words_fuzzy_tolerates_typo():
+    word = client.get("/api/words/1").json()
+    english = word["english"]
+    if len(english) < 5:
+        pytest.skip("seed word too short to misspell")
+    typo = english[:-2] + english[-1] + english[-2]
+    response = client.get("/api/words/search", params={"q": typo, "fuzzy": "true", "page_size": 100})
+    assert response.status_code == 200
+    assert word["id"] in [result["id"] for result in response.json()["words"]]
+
+def test_search_words_short_query_prefix():
+    word = client.get("/api/words/1").json()
+    term = word["jamaican_patois"][:2]
+    response = client.get("/api/words/search", params={"q": term, "page_size": 100})
+    assert response.status_code == 200
+    results = response.json()["words"]
+    assert word["id"] in [result["id"] for result in results]
+
+def test_search_words_cursor_walk():
+    token = "zq" + uuid.uuid4().hex[:8]
+    words = [{"jamaican_patois": f"{token} {i}", "english": "search walk"} for i in range(5)]
+    client.post("/api/words/sync", json={"words": words})
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": token, "page_size": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/words/search", params=params).json()
+        seen.extend(word["id"] for word in page["words"])
+        cursor = page["pagination"]["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 5
+
+def test_search_words_candidates_capped(fresh_db, monkeypatch):
+    monkeypatch.setattr("routes.words.SEARCH_MAX_CANDIDATES", 3)
+    token = "zq" + uuid.uuid4().hex[:8]
+    words = [{"jamaican_patois": f"{token} {i}", "english": "search cap"} for i in range(5)]
+    client.post("/api/words/sync", json={"words": words})
+
+    page = client.get("/api/words/search", params={"q": token, "page_size": 100}).json()
+    assert page["pagination"]["total_items"] == 3
+    assert sorted(word["jamaican_patois"] for word in page["words"]) == [f"{token} {i}" for i in range(3)]
+
+def test_get_words_matches_response_model():
+    from models import PaginatedWords
+    response = client.get("/api/words?page_size=100")
+    assert response.headers["content-type"] == "application/json"
+    page = PaginatedWords.model_validate(response.json())
+    assert len(page.words) == len(response.json()["words"])
+
+def test_get_words_invalid_parts_serialized_as_null():
+    from lib.db import get_db_connection
+    with get_db_connection() as conn:
+        word_id = conn.execute(
+            "INSERT INTO words (jamaican_patois, english, parts) VALUES ('broken', 'parts', '{not json')"
+        ).lastrowid
+    try:
+        cursor = encode_cursor([word_id - 1])
+        response = client.get(f"/api/words?page_size=1&cursor={cursor}")
+        assert response.json()["words"][0] == {
+            "id": word_id, "jamaican_patois": "broken", "english": "parts",
+            "parts": None, "correct_count": 0, "wrong_count": 0,
+        }
+    finally:
+        with get_db_connection() as conn:
+            conn.execute("DELETE FROM words WHERE id = ?", (word_id,))
+
+def test_get_words_non_object_parts_serialized_as_null(fresh_db):
+    from lib.db import get_db_connection
+    with get_db_connection() as conn:
+        word_ids = [
+            conn.execute("INSERT INTO words (jamaican_patois, english, parts) VALUES ('scalar', 'parts', ?)",
+                         (parts,)).lastrowid
+            for parts in ('["noun"]', '"noun"', '3')
+        ]
+    cursor = encode_cursor([word_ids[0] - 1])
+    words = client.get(f"/api/words?page_size=3&cursor={cursor}").json()["words"]
+    assert [(word["id"], word["parts"]) for word in words] == [(word_id, None) for word_id in word_ids]
+    for word_id in word_ids:
+        response = client.get(f"/api/words/{word_id}")
+        assert response.status_code == 200
+        assert response.json()["parts"] is None
+
+def test_words_total_is_cached_until_words_change():
+    first = client.get("/api/words?page_size=1").json()["pagination"]
+    hits = page_totals.stats()["hits"]
+    again = client.get(f"/api/words?page_size=1&cursor={first['next_cursor']}").json()["pagination"]
+    assert again["total_items"] == first["total_items"]
+    assert page_totals.stats()["hits"] == hits + 1
+
+    words = [{"jamaican_patois": f"total-{uuid.uuid4().hex}", "english": "total", "parts": None}]
+    assert client.post("/api/words/sync", json={"words": words}).status_code == 200
+    after = client.get("/api/words?page_size=1").json()["pagination"]
+    assert after["total_items"] == first["total_items"] + 1
+    assert after["total_pages"] == after["total_items"]
+
+def test_last_offset_page_reports_total_without_counting():
+    total = client.get("/api/words?page_size=1").json()["pagination"]["total_items"]
+    misses = page_totals.stats()["misses"]
+    data = client.get(f"/api/words?page={total}&page_size=1").json()
+    assert data["pagination"]["total_items"] == total
+    assert data["pagination"]["next_cursor"] is None
+    assert page_totals.stats()["misses"] == misses
+
+def test_get_words_filtered_by_type():
+    data = client.get("/api/words?type=noun&page_size=100").json()
+    assert data["words"]
+    assert all(word["parts"]["type"] == "noun" for word in data["words"])
+    assert data["pagination"]["total_items"] == len(data["words"])
+    # Counted rather than taken from a final page
+    first = client.get("/api/words?type=noun&page_size=1").json()["pagination"]
+    assert first["total_items"] == len(data["words"])
+
+    response = client.get("/api/words?type=no-such-type")
+    assert response.status_code == 404
+
+def test_get_words_filtered_by_usage():
+    usage = f"usage-{uuid.uuid4().hex}"
+    words = [
+        {"jamaican_patois": f"u-{uuid.uuid4().hex}", "english": "a", "parts": {"type": "noun", "usage": usage}},
+        {"jamaican_patois": f"u-{uuid.uuid4().hex}", "english": "b", "parts": {"type": "verb", "usage": usage}},
+    ]
+    assert client.post("/api/words/sync", json={"words": words}).status_code == 200
+
+    data = client.get(f"/api/words?usage={usage}").json()
+    assert sorted(word["english"] for word in data["words"]) == ["a", "b"]
+    assert data["pagination"]["total_items"] == 2
+
+    data = client.get(f"/api/words?usage={usage}&type=verb").json()
+    assert [word["english"] for word in data["words"]] == ["b"]
+
+def test_get_word_returns_stored_parts():
+    response = client.get("/api/words/1")
+    assert response.status_code == 200
+    assert response.json()["parts"] == {"type": "phrase"}
@@ -0,0 +1,91 @@
+import sys
+import os
+import sqlite3
+import threading
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the backend directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.join(current_dir, '..')
+sys.path.append(backend_dir)
+
+from app import app
+from lib import writer as writer_module
+from lib.db import close_pool, get_db_connection
+from lib.writer import GroupCommitWriter, close_writers, writer_stats
+
+client = TestClient(app)
+
+@pytest.fixture
+def items_db(tmp_path):
+    db_name = str(tmp_path / "items.db")
+    with get_db_connection(db_name) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    yield db_name
+    close_pool(db_name)
+
+def _insert(conn, name):
+    return conn.execute("INSERT INTO items (name) VALUES (?)", (name,)).lastrowid
+
+def _names(db_name):
+    with get_db_connection(db_name) as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM items")}
+
+def test_concurrent_writes_share_one_commit(items_db):
+    writer = GroupCommitWriter(items_db, max_batch=8, max_delay_ms=1000)
+    start = threading.Barrier(8)
+    futures = []
+
+    def submit(n):
+        start.wait()
+        futures.append(writer.submit(_insert, f"item-{n}"))
+
+    threads = [threading.Thread(target=submit, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(future.result(timeout=5) for future in futures) == list(range(1, 9))
+    stats = writer.stats()
+    assert stats["commits"] == 1 and stats["max_batch_size"] == 8
+    assert stats["max_queue_depth"] == 8 and stats["queue_depth"] == 0
+    writer.close()
+
+def test_failed_write_is_rolled_back_alone(items_db):
+    writer = GroupCommitWriter(items_db, max_batch=3, max_delay_ms=1000)
+
+    def insert_twice(conn, name):
+        _insert(conn, f"{name}-first")
+        _insert(conn, name)
+
+    first = writer.submit(_insert, "duplicate")
+    failing = writer.submit(insert_twice, "duplicate")
+    last = writer.submit(_insert, "last")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        failing.result(timeout=5)
+    assert first.result(timeout=5) and last.result(timeout=5)
+    assert _names(items_db) == {"duplicate", "last"}
+    assert writer.stats()["commits"] == 1 and writer.stats()["failed"] == 1
+    writer.close()
+
+def test_review_routes_use_group_commit(monkeypatch, fresh_db):
+    monkeypatch.setattr(writer_module, "ENABLE_GROUP_COMMIT", True)
+    try:
+        response = client.post("/api/study_sessions/1/words/1/review", json={"correct": True})
+        assert response.status_code == 200
+        assert response.json()["word_english"]
+
+        response = client.post("/api/study_sessions/9999/words/1/review", json={"correct": True})
+        assert response.status_code == 404
+
+        response = client.post("/api/study_sessions/1/reviews",
+                               json=[{"word_id": 1, "correct": True}, {"word_id": 999999, "correct": False}])
+        assert response.json()["created"] == 1
+
+        stats = {entry["db_name"]: entry for entry in writer_stats()}[fresh_db]
+        assert stats["writes"] == 3 and stats["failed"] == 1
+    finally:
+        close_writers()
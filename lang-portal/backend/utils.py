@@ -1,6 +1,139 @@
-from fastapi import Query
+import base64
+import json
+from fastapi import HTTPException
+from lib.cache import page_totals
+from lib.db import current_db
 
-def paginate(query, page: int = Query(1, ge=1), page_size: int = Query(10, ge=1, le=100)):
-    offset = (page - 1) * page_size
-    paginated_query = f"{query} LIMIT {page_size} OFFSET {offset}"
-    return paginated_query 
\ No newline at end of file
+def encode_cursor(values):
+    """Encode the (sort_key, id) values of the last row of a page as an opaque cursor."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor, size):
+    """Decode a cursor produced by encode_cursor, raising a 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def build_page_query(query, order_by, page=1, page_size=10, cursor=None, descending=False):
+    """
+    Compose the SQL for one page of ``query`` in either offset or keyset (cursor) mode.
+
+    ``query`` must contain a ``{keyset}`` placeholder inside its WHERE clause
+    (before any GROUP BY) and no ORDER BY. ``order_by`` lists the sort columns,
+    ending with the unique id column. In cursor mode the placeholder becomes a
+    row-value comparison so SQLite seeks straight to the next page instead of
+    scanning and discarding OFFSET rows. One extra row is requested so the
+    caller can tell whether another page follows. LIMIT and OFFSET are bound
+    parameters, so each query's SQL text is the same on every page and the
+    connection's statement cache can reuse it.
+
+    Returns ``(sql, extra_params)``.
+    """
+    direction = "DESC" if descending else "ASC"
+    order_clause = ", ".join(f"{column} {direction}" for column in order_by)
+
+    if cursor:
+        values = decode_cursor(cursor, len(order_by))
+        operator = "<" if descending else ">"
+        columns = ", ".join(order_by)
+        placeholders = ", ".join("?" * len(order_by))
+        keyset = f"({columns}) {operator} ({placeholders})"
+        sql = f"{query.format(keyset=keyset)} ORDER BY {order_clause} LIMIT ?"
+        return sql, (*values, page_size + 1)
+
+    sql = f"{query.format(keyset='1')} ORDER BY {order_clause} LIMIT ? OFFSET ?"
+    return sql, (page_size + 1, (page - 1) * page_size)
+
+def fetch_page(conn, query, params, order_by, key, page=1, page_size=10, cursor=None, descending=False):
+    """
+    Fetch one page of ``query``; see build_page_query for the query contract.
+
+    ``key`` extracts the ``order_by`` values from a result row.
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    sql, extra_params = build_page_query(query, order_by, page, page_size, cursor, descending)
+    rows = conn.execute(sql, (*params, *extra_params)).fetchall()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(key(rows[-1]))
+    return rows, next_cursor
+
+def count_rows(conn, count_sql, count_params=(), count_tables=()):
+    """
+    Run ``count_sql`` (a single-value COUNT), or return its cached result.
+
+    The result is cached against the ``table_versions`` of ``count_tables``,
+    which triggers bump on every write, so it stays exact; with no tables it
+    is counted every time. Each database (e.g. learner shard) has its own
+    entries.
+    """
+    def count():
+        row = conn.execute(count_sql, count_params).fetchone()
+        return row[0] if row and row[0] is not None else 0
+
+    if not count_tables:
+        return count()
+    placeholders = ", ".join("?" * len(count_tables))
+    versions = tuple(conn.execute(
+        f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})",
+        count_tables
+    ).fetchall())
+    return page_totals.get_or_compute(
+        (current_db(), count_sql, tuple(count_params)), count, frozenset(versions)
+    )
+
+def paginate(conn, query, params, order_by, key, page=1, page_size=10, cursor=None, descending=False,
+             count_sql=None, count_params=(), count_tables=()):
+    """
+    Fetch one page of ``query`` together with its total, in one read
+    transaction and one call on the DB executor (``conn.run(paginate, ...)``).
+
+    ``query``, ``params``, ``order_by`` and ``key`` are as for fetch_page.
+    ``count_sql`` counts all rows of the listing; see count_rows for how
+    ``count_tables`` lets the count be reused. An offset page that ends the
+    listing already knows the total and skips the count.
+
+    Returns ``(rows, pagination)``, ``pagination`` being the response's
+    ``pagination`` object.
+    """
+    owns_transaction = not conn.in_transaction
+    if owns_transaction:
+        conn.execute("BEGIN")
+    try:
+        rows, next_cursor = fetch_page(conn, query, params, order_by, key, page, page_size, cursor, descending)
+        if not cursor and next_cursor is None and (rows or page == 1):
+            total_items = (page - 1) * page_size + len(rows)
+        else:
+            total_items = count_rows(conn, count_sql, count_params, count_tables)
+    finally:
+        if owns_transaction:
+            conn.commit()
+    return rows, {
+        "current_page": None if cursor else page,
+        "total_pages": (total_items + page_size - 1) // page_size,
+        "total_items": total_items,
+        "items_per_page": page_size,
+        "next_cursor": next_cursor,
+    }
+
+def word_filters(part_type=None, usage=None):
+    """
+    Conditions on ``words w`` for the ``type`` and ``usage`` word list
+    filters, as ``(sql, params)``. Both compare the indexed generated columns
+    over ``words.parts``; with neither filter ``sql`` is ``1``.
+    """
+    conditions, params = [], []
+    if part_type is not None:
+        conditions.append("w.part_type = ?")
+        params.append(part_type)
+    if usage is not None:
+        conditions.append("w.part_usage = ?")
+        params.append(usage)
+    return " AND ".join(conditions) or "1", tuple(params)
@@ -0,0 +1,65 @@
+from lib.db import get_db_connection
+
+# Rows where the trigger-maintained counters disagree with word_reviews
+MISMATCH_QUERY = """
+SELECT expected.word_id,
+       expected.correct_count, COALESCE(ws.correct_count, 0),
+       expected.wrong_count, COALESCE(ws.wrong_count, 0)
+FROM (
+    SELECT word_id,
+           SUM(CASE WHEN correct THEN 1 ELSE 0 END) AS correct_count,
+           SUM(CASE WHEN NOT correct THEN 1 ELSE 0 END) AS wrong_count,
+           MAX(created_at) AS last_reviewed_at
+    FROM word_reviews
+    GROUP BY word_id
+) expected
+LEFT JOIN word_stats ws ON ws.word_id = expected.word_id
+WHERE ws.word_id IS NULL
+   OR ws.correct_count != expected.correct_count
+   OR ws.wrong_count != expected.wrong_count
+   OR ws.last_reviewed_at IS NOT expected.last_reviewed_at
+UNION ALL
+SELECT ws.word_id, 0, ws.correct_count, 0, ws.wrong_count
+FROM word_stats ws
+WHERE NOT EXISTS (SELECT 1 FROM word_reviews wr WHERE wr.word_id = ws.word_id)
+"""
+
+def check_word_stats(db_name="words.db"):
+    """
+    Compare word_stats with a full aggregation of word_reviews.
+
+    Returns a list of (word_id, expected_correct, actual_correct,
+    expected_wrong, actual_wrong) tuples; an empty list means consistent.
+    """
+    with get_db_connection(db_name) as conn:
+        return conn.execute(MISMATCH_QUERY).fetchall()
+
+def rebuild_word_stats(db_name="words.db"):
+    """Recompute word_stats from word_reviews in a single transaction."""
+    with get_db_connection(db_name) as conn:
+        conn.execute("DELETE FROM word_stats")
+        conn.execute("""
+            INSERT INTO word_stats (word_id, correct_count, wrong_count, last_reviewed_at)
+            SELECT word_id,
+                   SUM(CASE WHEN correct THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN NOT correct THEN 1 ELSE 0 END),
+                   MAX(created_at)
+            FROM word_reviews
+            GROUP BY word_id
+        """)
+
+if __name__ == "__main__":
+    import sys
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+    db_name = sys.argv[2] if len(sys.argv) > 2 else "words.db"
+    if command == "rebuild":
+        rebuild_word_stats(db_name)
+        print("word_stats rebuilt from word_reviews.")
+    mismatches = check_word_stats(db_name)
+    if mismatches:
+        print(f"word_stats is inconsistent for {len(mismatches)} word(s):")
+        for word_id, exp_correct, correct, exp_wrong, wrong in mismatches:
+            print(f"  word {word_id}: correct {correct} (expected {exp_correct}), "
+                  f"wrong {wrong} (expected {exp_wrong})")
+        sys.exit(1)
+    print("word_stats is consistent with word_reviews.")